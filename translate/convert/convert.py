@@ -20,15 +20,23 @@
 :mod:`translate.convert` tools).
 """
 
+import hashlib
+import json
+import logging
 import os.path
 from io import BytesIO
 
+from translate import __version__
 from translate.misc import optrecurse
 
 
 # Don't import optparse ourselves, get the version from optrecurse.
 optparse = optrecurse.optparse
 
+#: The name of the file in the output directory where ``--skip-unchanged``
+#: records what the output files were converted from.
+MANIFEST_NAME = ".translate-manifest.json"
+
 
 class ConvertOptionParser(optrecurse.RecursiveOptionParser):
     """A specialized Option Parser for convertor tools..."""
@@ -49,7 +57,11 @@ class ConvertOptionParser(optrecurse.RecursiveOptionParser):
             description=description,
         )
         self.usepots = usepots
+        #: The passthrough options naming files that are read while converting,
+        #: whose contents are part of the ``--skip-unchanged`` fingerprint.
+        self.passthroughfiles = []
         self.settimestampoption()
+        self.setincrementaloptions()
         self.setpotoption()
         self.set_usage()
 
@@ -209,6 +221,133 @@ class ConvertOptionParser(optrecurse.RecursiveOptionParser):
         )
         self.define_option(timestampopt)
 
+    def setincrementaloptions(self):
+        """Sets ``--skip-unchanged`` and ``--force`` options."""
+        incrementalopt = optparse.Option(
+            None,
+            "--skip-unchanged",
+            action="store_true",
+            dest="incremental",
+            default=False,
+            help="skip conversion if the input, template, output and options "
+            "are unchanged since they were last converted",
+        )
+        self.define_option(incrementalopt)
+        forceopt = optparse.Option(
+            None,
+            "--force",
+            action="store_true",
+            dest="force",
+            default=False,
+            help="convert unchanged files as well, and record them for skipping",
+        )
+        self.define_option(forceopt)
+
+    def isincremental(self, options):
+        """Checks if unchanged files are skipped, which needs an output file
+        or directory for the manifest.
+        """
+        return getattr(options, "incremental", False) and bool(options.output)
+
+    def getmanifestpath(self, options):
+        """Gets the path to the manifest of ``--skip-unchanged`` conversions."""
+        if options.recursiveoutput:
+            return os.path.join(options.output, MANIFEST_NAME)
+        return os.path.join(os.path.dirname(options.output), MANIFEST_NAME)
+
+    def getfingerprint(self, options, task):
+        """Returns what the output file of a task from
+        :meth:`~translate.misc.optrecurse.RecursiveOptionParser.getprocesstasks`
+        is converted from, or *None* if the input isn't a file.
+        """
+        inputpath, fileprocessor, fullinputpath, fulloutputpath, fulltemplatepath = task
+        inputhash = _hash_file(fullinputpath)
+        if inputhash is None or fulloutputpath is None:
+            return None
+        conversion = (
+            __version__.sver,
+            getattr(fileprocessor, "__module__", None),
+            getattr(fileprocessor, "__qualname__", None),
+            sorted(self.getpassthroughoptions(options).items()),
+        )
+        return {
+            "input": inputhash,
+            "template": _hash_file(fulltemplatepath),
+            "options": hashlib.sha256(repr(conversion).encode("utf-8")).hexdigest(),
+            "files": {
+                optionname: _hash_tree(getattr(options, optionname, None))
+                for optionname in self.passthroughfiles
+            },
+        }
+
+    def recursiveprocess(self, options):
+        """Recurse through directories and process files, and log a summary
+        of the files skipped with ``--skip-unchanged``. (override)
+        """
+        self.tasksummary = None
+        super().recursiveprocess(options)
+        # the progress bar is finished by now
+        if self.tasksummary is not None:
+            logging.getLogger(self.get_prog_name()).getChild("progress").info(
+                "%(converted)d files converted, %(failed)d failed, "
+                "%(skipped)d unchanged files skipped",
+                self.tasksummary,
+            )
+
+    def processtasks(self, options, tasks):
+        """Processes the files of the tasks, skipping those that haven't
+        changed since they were last converted with ``--skip-unchanged``.
+        The results are yielded in the order of the tasks, and counted in
+        :attr:`tasksummary`. (override)
+        """
+        if not self.isincremental(options):
+            yield from super().processtasks(options, tasks)
+            return
+        manifestpath = self.getmanifestpath(options)
+        manifestdir = os.path.dirname(manifestpath)
+        manifest = _read_manifest(manifestpath)
+        tasks = list(tasks)
+        changed = []
+        # the manifest keys and fingerprints of the changed tasks, by index
+        fingerprints = {}
+        unchanged = set()
+        for index, task in enumerate(tasks):
+            fulloutputpath = task[3]
+            fingerprint = self.getfingerprint(options, task)
+            if fingerprint is not None:
+                key = os.path.relpath(fulloutputpath, manifestdir)
+                entry = manifest.pop(key, {})
+                outputhash = entry.pop("output", None)
+                if (
+                    not options.force
+                    and entry == fingerprint
+                    and outputhash == _hash_file(fulloutputpath)
+                ):
+                    manifest[key] = dict(fingerprint, output=outputhash)
+                    unchanged.add(index)
+                    continue
+                fingerprints[index] = key, fingerprint
+            changed.append(task)
+        self.tasksummary = {"converted": 0, "failed": 0, "skipped": len(unchanged)}
+        results = super().processtasks(options, changed)
+        try:
+            for index, task in enumerate(tasks):
+                if index in unchanged:
+                    yield task[0], True
+                    continue
+                inputpath, success = next(results)
+                if success:
+                    self.tasksummary["converted"] += 1
+                    if index in fingerprints:
+                        key, fingerprint = fingerprints[index]
+                        outputhash = _hash_file(task[3])
+                        manifest[key] = dict(fingerprint, output=outputhash)
+                else:
+                    self.tasksummary["failed"] += 1
+                yield inputpath, success
+        finally:
+            _write_manifest(manifestpath, manifest)
+
     def verifyoptions(self, options):
         """Verifies that the options are valid (required options are present,
         etc).
@@ -355,6 +494,31 @@ class ArchiveConvertOptionParser(ConvertOptionParser):
                 return archiveclass
         return None
 
+    def usesarchives(self, options):
+        """Returns whether any of the input, output or template is an
+        archive.
+        """
+        return any(
+            self.isarchive(fileoption, filepurpose)
+            for fileoption, filepurpose in (
+                (options.input, "input"),
+                (options.output, "output"),
+                (getattr(options, "template", None), "template"),
+            )
+        )
+
+    def isparallel(self, options):
+        """Checks if files are processed in separate processes, which can't
+        share archives.
+        """
+        return super().isparallel(options) and not self.usesarchives(options)
+
+    def isincremental(self, options):
+        """Checks if unchanged files are skipped, which needs files that
+        aren't in archives.
+        """
+        return super().isincremental(options) and not self.usesarchives(options)
+
     def openarchive(self, archivefilename, filepurpose, **kwargs):
         """Creates an archive object for the given file."""
         archiveext = self.splitext(archivefilename)[1]
@@ -514,6 +678,54 @@ class ArchiveConvertOptionParser(ConvertOptionParser):
             )
 
 
+def _hash_file(path):
+    """Returns the SHA-256 hash of the file at path, or *None* if there is no
+    such file.
+    """
+    if path is None or not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as hashed_file:
+        for block in iter(lambda: hashed_file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_tree(path):
+    """Returns the SHA-256 hash of the file at path, or of the names and
+    contents of the files below the directory at path, or *None* if there is
+    neither.
+    """
+    if path is None or not os.path.isdir(path):
+        return _hash_file(path)
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            filepath = os.path.join(dirpath, filename)
+            digest.update(os.path.relpath(filepath, path).encode("utf-8"))
+            digest.update((_hash_file(filepath) or "").encode("ascii"))
+    return digest.hexdigest()
+
+
+def _read_manifest(path):
+    """Reads the manifest of ``--skip-unchanged`` conversions, see
+    :meth:`ConvertOptionParser.processtasks`.
+    """
+    try:
+        with open(path, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(path, manifest):
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+        manifest_file.write("\n")
+
+
 def _output_is_newer(input_path, output_path):
     """Check if input_path was not modified since output_path was generated,
     used to avoid needless regeneration of output.
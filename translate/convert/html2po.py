@@ -138,6 +138,22 @@ class Html2POOptionParser(convert.ConvertOptionParser):
             return True
         return super().isrecursive(fileoption, filepurpose=filepurpose)
 
+    def isparallel(self, options):
+        """Check if files are processed in separate processes, which isn't
+        possible in single-output-file mode. (override)
+        """
+        if hasattr(self, "outputstore"):
+            return False
+        return super().isparallel(options)
+
+    def isincremental(self, options):
+        """Check if unchanged files are skipped, which isn't possible in
+        single-output-file mode. (override)
+        """
+        if hasattr(self, "outputstore"):
+            return False
+        return super().isincremental(options)
+
     def checkoutputsubdir(self, options, subdir):
         """Check if subdir under options.output needs to be created,
         creates if neccessary. Do nothing if in single-output-file mode. (override)
@@ -23,7 +23,6 @@ for examples and usage instructions.
 """
 
 import os
-import sys
 
 from translate.convert import convert
 from translate.misc.optrecurse import ProgressBar
@@ -102,30 +101,30 @@ class PO2HtmlOptionParser(convert.ConvertOptionParser):
         self.inputstore = po.pofile(inputfile)
         templatefiles = self.recurse_template_files(options)
         self.ensurerecursiveoutputdirexists(options)
+        options.recursiveoutput = True
         progress_bar = ProgressBar(options.progress, templatefiles)
+        tasks = self.gettemplatetasks(options, templatefiles)
+        for templatepath, success in self.processtasks(options, tasks):
+            progress_bar.report_progress(templatepath, success)
+        del progress_bar
+
+    def gettemplatetasks(self, options, templatefiles):
+        """Yields the tasks converting the input file with each of the
+        template files, like
+        :meth:`~translate.misc.optrecurse.RecursiveOptionParser.getprocesstasks`.
+        """
         for templatepath in templatefiles:
             fulltemplatepath = os.path.join(options.template, templatepath)
             outputpath = templatepath
             fulloutputpath = os.path.join(options.output, outputpath)
             self.checkoutputsubdir(options, os.path.dirname(outputpath))
-            try:
-                success = self.processfile(
-                    self.processfile_with_fixed_inputstore,
-                    options,
-                    None,
-                    fulloutputpath,
-                    fulltemplatepath,
-                )
-            except Exception:
-                self.warning(
-                    "Error processing: input %s, output %s, template %s"
-                    % (options.input, fulloutputpath, fulltemplatepath),
-                    options,
-                    sys.exc_info(),
-                )
-                success = False
-            progress_bar.report_progress(templatepath, success)
-        del progress_bar
+            yield (
+                templatepath,
+                self.processfile_with_fixed_inputstore,
+                options.input,
+                fulloutputpath,
+                fulltemplatepath,
+            )
 
     def processfile_with_fixed_inputstore(
         self,
@@ -26,7 +26,7 @@ for examples and usage instructions.
 
 from translate.misc.multistring import multistring
 from translate.search import match
-from translate.storage import catkeys, factory, poheader
+from translate.storage import catkeys, factory, poheader, pypo
 from translate.tools import pretranslate
 
 
@@ -76,6 +76,8 @@ def convert_stores(
     tm=None,
     min_similarity=75,
     fuzzymatching=True,
+    fuzzyworkers=1,
+    tmcachedir=None,
     **kwargs
 ):
     """Actual conversion function, works on stores not files, returns
@@ -98,12 +100,17 @@ def convert_stores(
                 min_similarity=min_similarity,
                 max_length=3000,
                 usefuzzy=True,
+                use_ngram_index=True,
             )
             matcher.addpercentage = False
             matchers.append(matcher)
         if tm:
             matcher = pretranslate.memory(
-                tm, max_candidates=1, min_similarity=min_similarity, max_length=1000
+                tm,
+                max_candidates=1,
+                min_similarity=min_similarity,
+                max_length=1000,
+                tmcachedir=tmcachedir,
             )
             matcher.addpercentage = False
             matchers.append(matcher)
@@ -111,6 +118,22 @@ def convert_stores(
     # initialize store
     _store_pre_merge(input_store, temp_store, template_store)
 
+    # Do the fuzzy matching of all units at once if we can spread it
+    fuzzy_matches = None
+    if matchers and fuzzyworkers > 1:
+        fuzzy_matches = pretranslate.match_fuzzy_many(
+            (
+                input_unit
+                for input_unit in temp_store.units
+                if input_unit.istranslatable()
+                and pretranslate.needs_fuzzy_match(
+                    input_unit, template_store, merge_on=input_store.merge_on
+                )
+            ),
+            matchers,
+            workers=fuzzyworkers,
+        )
+
     # Do matching
     for input_unit in temp_store.units:
         if input_unit.istranslatable():
@@ -120,6 +143,7 @@ def convert_stores(
                 matchers,
                 mark_reused=True,
                 merge_on=input_store.merge_on,
+                fuzzy_matches=fuzzy_matches,
             )
             _unit_post_merge(input_unit, input_store, temp_store, template_store)
 
@@ -336,6 +360,18 @@ def main(argv=None):
         help="The file to use as translation memory when fuzzy matching",
     )
     parser.passthrough.append("tm")
+    parser.passthroughfiles.append("tm")
+
+    parser.add_option(
+        "",
+        "--tmcache",
+        dest="tmcachedir",
+        default=None,
+        metavar="DIR",
+        help="Keep compiled translation memory files in DIR, to avoid parsing "
+        "unchanged TM files again",
+    )
+    parser.passthrough.append("tmcachedir")
 
     defaultsimilarity = 75
     parser.add_option(
@@ -357,7 +393,22 @@ def main(argv=None):
     )
     parser.passthrough.append("fuzzymatching")
 
-    parser.run(argv)
+    parser.add_option(
+        "--fuzzyworkers",
+        dest="fuzzyworkers",
+        default=1,
+        type="int",
+        metavar="N",
+        help="Use N processes for fuzzy matching (default: 1)",
+    )
+    parser.passthrough.append("fuzzyworkers")
+
+    # most units are written back unchanged, so keep their parsed text
+    try:
+        with pypo.keep_raw_units():
+            parser.run(argv)
+    finally:
+        pretranslate.closememory()
 
 
 if __name__ == "__main__":
@@ -118,8 +118,11 @@ class TestConvertCommand:
         options = self.help_check(options, "-h, --help")
         options = self.help_check(options, "--manpage")
         options = self.help_check(options, "--errorlevel=ERRORLEVEL")
+        options = self.help_check(options, "--jobs=JOBS")
         options = self.help_check(options, "-i INPUT, --input=INPUT")
         options = self.help_check(options, "-x EXCLUDE, --exclude=EXCLUDE")
         options = self.help_check(options, "-o OUTPUT, --output=OUTPUT")
         options = self.help_check(options, "-S, --timestamp")
+        options = self.help_check(options, "--skip-unchanged")
+        options = self.help_check(options, "--force")
         return options
@@ -1,3 +1,5 @@
+import logging
+import os
 from io import BytesIO
 
 from translate.convert import csv2po, po2csv, test_convert
@@ -141,3 +143,38 @@ class TestPO2CSVCommand(test_convert.TestConvertCommand, TestPO2CSV):
         """tests getting help"""
         options = test_convert.TestConvertCommand.test_help(self, capsys)
         options = self.help_check(options, "--columnorder=COLUMNORDER", last=True)
+
+    def test_skip_unchanged(self):
+        """tests that only changed files are converted with --skip-unchanged"""
+        self.create_testfile("input/a.po", 'msgid "A"\nmsgstr "a"\n')
+        self.create_testfile("input/b.po", 'msgid "B"\nmsgstr "b"\n')
+        self.run_command("input", "output", **{"skip-unchanged": True})
+        assert os.path.isfile(self.get_testfilename("output/.translate-manifest.json"))
+        outputs = [self.get_testfilename("output/%s.csv" % name) for name in "ab"]
+        for output in outputs:
+            os.utime(output, (0, 0))
+        self.create_testfile("input/a.po", 'msgid "A"\nmsgstr "changed"\n')
+        self.run_command("input", "output", **{"skip-unchanged": True})
+        assert b"changed" in self.read_testfile("output/a.csv")
+        assert [os.path.getmtime(output) == 0 for output in outputs] == [False, True]
+        self.run_command("input", "output", force=True, **{"skip-unchanged": True})
+        assert os.path.getmtime(outputs[1]) != 0
+
+    def test_skip_unchanged_summary(self, capsys, caplog):
+        """tests that skipped files are reported in order and summarized"""
+        self.create_testfile("input/a.po", 'msgid "A"\nmsgstr "a"\n')
+        self.create_testfile("input/b.po", 'msgid "B"\nmsgstr "b"\n')
+        self.run_command("input", "output", **{"skip-unchanged": True})
+        capsys.readouterr()
+        self.create_testfile("input/a.po", 'msgid "A"\nmsgstr "changed"\n')
+        self.create_testfile("input/c.po", 'msgid "C"\nmsgstr "c"\n')
+        # the output can't be written, so converting c.po fails
+        os.mkdir(self.get_testfilename("output/c.csv"))
+        caplog.set_level(logging.INFO)
+        self.run_command(
+            "input", "output", progress="names", **{"skip-unchanged": True}
+        )
+        assert capsys.readouterr().err.split() == ["a.po", "b.po", "c.po"]
+        assert caplog.records[-1].getMessage() == (
+            "1 files converted, 1 failed, 1 unchanged files skipped"
+        )
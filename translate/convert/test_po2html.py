@@ -254,6 +254,28 @@ class TestPO2HtmlCommand(test_convert.TestConvertCommand, TestPO2Html):
         self.then_html_file_is_translated("html/file1.html")
         self.then_html_file_is_translated("html/subdir/file2.html")
 
+    def test_recursive_templates_with_single_po_file_in_parallel(self):
+        """Test that the template files can be processed with --jobs and
+        skipped with --skip-unchanged.
+        """
+        self.given_html_test_file("template/file1.html")
+        self.given_html_test_file("template/subdir/file2.html")
+        self.given_po_test_file("translation/file1.po")
+
+        options = {"jobs": 2, "skip-unchanged": True}
+        self.run_command(
+            "translation/file1.po", "translated", template="template", **options
+        )
+
+        self.then_html_file_is_translated("translated/file1.html")
+        self.then_html_file_is_translated("translated/subdir/file2.html")
+        output = self.get_testfilename("translated/file1.html")
+        os.utime(output, (0, 0))
+        self.run_command(
+            "translation/file1.po", "translated", template="template", **options
+        )
+        assert os.path.getmtime(output) == 0
+
     def test_help(self, capsys):
         """Test getting help."""
         options = test_convert.TestConvertCommand.test_help(self, capsys)
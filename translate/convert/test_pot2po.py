@@ -14,7 +14,7 @@ class TestPOT2PO:
     def teardown_method(self, method):
         warnings.resetwarnings()
 
-    def convertpot(self, potsource, posource=None):
+    def convertpot(self, potsource, posource=None, **kwargs):
         """helper that converts pot source to po source without requiring files"""
         potfile = BytesIO(potsource.encode())
         if posource:
@@ -22,7 +22,7 @@ class TestPOT2PO:
         else:
             pofile = None
         pooutfile = BytesIO()
-        pot2po.convertpot(potfile, pooutfile, pofile)
+        pot2po.convertpot(potfile, pooutfile, pofile, **kwargs)
         pooutfile.seek(0)
         return po.pofile(pooutfile.read())
 
@@ -116,6 +116,34 @@ msgstr[1] "%d handleidings."
         newpo = self.convertpot(potsource, posource)
         assert str(self.singleunit(newpo)) == poexpected
 
+    def test_merging_with_fuzzyworkers(self):
+        """checks that fuzzy matching in worker processes gives the same result"""
+        potsource = r"""#: file.cpp:1
+msgid "Open the file"
+msgstr ""
+
+#: file.cpp:2
+msgid "Save the files"
+msgstr ""
+
+#: file.cpp:3
+msgid "Something else"
+msgstr ""
+"""
+        posource = r"""#: file.cpp:4
+msgid "Open a file"
+msgstr "Maak 'n lêer oop"
+
+#: file.cpp:5
+msgid "Save the file"
+msgstr "Stoor die lêer"
+"""
+        newpo = self.convertpot(potsource, posource)
+        parallelpo = self.convertpot(potsource, posource, fuzzyworkers=2)
+        assert bytes(parallelpo) == bytes(newpo)
+        assert parallelpo.units[1].target == "Maak 'n lêer oop"
+        assert parallelpo.units[2].target == "Stoor die lêer"
+
     @mark.xfail(reason="Not implemented - review if this is even correct")
     def test_merging_msgid_change(self):
         """tests that if the msgid changes but the location stays the same that we merge"""
@@ -838,8 +866,10 @@ class TestPOT2POCommand(test_convert.TestConvertCommand, TestPOT2PO):
         options = test_convert.TestConvertCommand.test_help(self, capsys)
         options = self.help_check(options, "-t TEMPLATE, --template=TEMPLATE")
         options = self.help_check(options, "-P, --pot")
+        options = self.help_check(options, "--tmcache=DIR")
         options = self.help_check(options, "--tm")
         options = self.help_check(
             options, "-s MIN_SIMILARITY, --similarity=MIN_SIMILARITY"
         )
-        options = self.help_check(options, "--nofuzzymatching", last=True)
+        options = self.help_check(options, "--nofuzzymatching")
+        options = self.help_check(options, "--fuzzyworkers=N", last=True)
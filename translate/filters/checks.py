@@ -320,6 +320,10 @@ class UnitChecker:
 
     preconditions = {}
 
+    #: The number of results of helper functions like
+    #: :meth:`filtervariables` that are kept between units
+    results_cache_size = 10000
+
     def __init__(
         self,
         checkerconfig=None,
@@ -349,6 +353,7 @@ class UnitChecker:
 
         self.defaultfilters = self.getfilters(excludefilters, limitfilters)
         self.results_cache = {}
+        self._checkplan = None
 
     def getfilters(self, excludefilters=None, limitfilters=None):
         """Returns dictionary of available filters, including/excluding those
@@ -385,6 +390,7 @@ class UnitChecker:
     def setconfig(self, config):
         """Sets the accelerator list."""
         self.config = config
+        self.results_cache = {}
         self.accfilters = [
             prefilters.filteraccelerators(accelmarker)
             for accelmarker in self.config.accelmarkers
@@ -464,27 +470,30 @@ class UnitChecker:
             )
         )
 
-    def run_filters(self, unit, categorised=False):
-        """Run all the tests in this suite.
-
-        :rtype: Dictionary
-        :return: Content of the dictionary is as follows::
+    def getcheckplan(self):
+        """Returns the tests to run as (functionname, filterfunction,
+        isreported, ignoredfunctionnames) tuples, for the current language.
 
-           {'testname': { 'message': message_or_exception, 'category': failure_category } }
+        The plan is only made again when the language or the filters change.
+        Preconditions are run first, in the order they are declared.
         """
-        self.results_cache = {}
-        failures = {}
-        ignores = self.get_ignored_filters()
-        functionnames = self.defaultfilters.keys()
-        priorityfunctionnames = self.preconditions.keys()
-        otherfunctionnames = filter(
-            lambda functionname: functionname not in self.preconditions, functionnames
+        if self._checkplan is not None:
+            lang, defaultfilters, plan = self._checkplan
+            if lang is self.config.lang and defaultfilters is self.defaultfilters:
+                return plan
+
+        ordered = list(self.preconditions)
+        ordered.extend(
+            functionname
+            for functionname in self.defaultfilters
+            if functionname not in self.preconditions
         )
 
-        for functionname in list(priorityfunctionnames) + list(otherfunctionnames):
+        ignores = set(self.get_ignored_filters())
+        plan = []
+        for functionname in ordered:
             if functionname in ignores:
                 continue
-
             filterfunction = getattr(self, functionname, None)
 
             # This filterfunction may only be defined on another checker if
@@ -492,6 +501,50 @@ class UnitChecker:
             if filterfunction is None:
                 continue
 
+            plan.append(
+                (
+                    functionname,
+                    filterfunction,
+                    functionname in self.defaultfilters,
+                    self.preconditions.get(functionname, ()),
+                )
+            )
+        self._checkplan = (self.config.lang, self.defaultfilters, plan)
+        return plan
+
+    def run_filters(self, unit, categorised=False):
+        """Run all the tests in this suite.
+
+        :rtype: Dictionary
+        :return: Content of the dictionary is as follows::
+
+           {'testname': { 'message': message_or_exception, 'category': failure_category } }
+        """
+        return self.run_checkplan(self.getcheckplan(), unit, categorised)
+
+    def run_filters_batch(self, units, categorised=False):
+        """Run all the tests in this suite on each of the units.
+
+        :return: An iterator over the failures of the units, as returned by
+                 :meth:`run_filters`.
+        """
+        plan = self.getcheckplan()
+        for unit in units:
+            yield self.run_checkplan(plan, unit, categorised)
+
+    def run_checkplan(self, plan, unit, categorised=False):
+        """Run the tests of a plan from :meth:`getcheckplan` on the unit."""
+        # the results only depend on the strings, so they are kept between
+        # units that share them
+        if len(self.results_cache) > self.results_cache_size:
+            self.results_cache = {}
+        failures = {}
+        ignores = set()
+
+        for functionname, filterfunction, isreported, ignoring in plan:
+            if functionname in ignores:
+                continue
+
             filtermessage = ""
 
             try:
@@ -518,17 +571,13 @@ class UnitChecker:
                     filtermessage = pydoc.getdoc(filterfunction)
                 # We test some preconditions that aren't actually a cause for
                 # failure
-                if functionname in self.defaultfilters:
+                if isreported:
                     failures[functionname] = {
                         "message": filtermessage,
                         "category": self.categories[functionname],
                     }
 
-                if functionname in self.preconditions:
-                    for ignoredfunctionname in self.preconditions[functionname]:
-                        ignores.append(ignoredfunctionname)
-
-        self.results_cache = {}
+                ignores.update(ignoring)
 
         if not categorised:
             for name, info in failures.items():
@@ -579,7 +628,7 @@ class TranslationChecker(UnitChecker):
         else:
             return test(self.str1, self.str2)
 
-    def run_filters(self, unit, categorised=False):
+    def run_checkplan(self, plan, unit, categorised=False):
         """Do some optimisation by caching some data of the unit for the
         benefit of :meth:`~TranslationChecker.run_test`.
         """
@@ -588,7 +637,7 @@ class TranslationChecker(UnitChecker):
         self.hasplural = unit.hasplural()
         self.locations = unit.getlocations()
 
-        return super().run_filters(unit, categorised)
+        return super().run_checkplan(plan, unit, categorised)
 
 
 class TeeChecker:
@@ -671,6 +720,19 @@ class TeeChecker:
 
         return failures
 
+    def run_filters_batch(self, units, categorised=False):
+        """Run all the tests in the checker's suites on each of the units,
+        see :meth:`UnitChecker.run_filters_batch`.
+        """
+        plans = [checker.getcheckplan() for checker in self.checkers]
+        for unit in units:
+            failures = {}
+
+            for checker, plan in zip(self.checkers, plans):
+                failures.update(checker.run_checkplan(plan, unit, categorised))
+
+            yield failures
+
     def setsuggestionstore(self, store):
         """Sets the filename that a checker should use for evaluating
         suggestions.
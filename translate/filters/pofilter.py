@@ -63,19 +63,31 @@ class pocheckfilter:
 
         return "\n".join(filterdocs)
 
-    def filterunit(self, unit):
-        """Runs filters on an element."""
+    def isfiltered(self, unit):
+        """Returns whether the filters are run on an element."""
 
         if unit.isheader():
-            return []
+            return False
 
         if not self.options.includefuzzy and unit.isfuzzy():
-            return []
+            return False
 
         if not self.options.includereview and unit.isreview():
+            return False
+
+        return True
+
+    def filterunit(self, unit):
+        """Runs filters on an element."""
+
+        if not self.isfiltered(unit):
             return []
 
         failures = self.checker.run_filters(unit, categorised=True)
+        return self.correctunit(unit, failures)
+
+    def correctunit(self, unit, failures):
+        """Autocorrects the unit if it has failures and autocorrect is on."""
 
         if failures and self.options.autocorrect:
             # we can't get away with bad unquoting / requoting if we're going to change the result...
@@ -101,8 +113,11 @@ class pocheckfilter:
         newtransfile.setsourcelanguage(transfile.getsourcelanguage())
         newtransfile.settargetlanguage(transfile.gettargetlanguage())
 
-        for unit in transfile.units:
-            filter_result = self.filterunit(unit)
+        units = [unit for unit in transfile.units if self.isfiltered(unit)]
+        results = self.checker.run_filters_batch(units, categorised=True)
+
+        for unit, failures in zip(units, results):
+            filter_result = self.correctunit(unit, failures)
 
             if filter_result:
                 if filter_result != autocorrect:
@@ -2592,3 +2592,60 @@ def test_category():
     assert standard_checker.categories != {}
     assert len(standard_checker.categories.values()) == standard_categories_count
     assert "validxml" not in standard_checker.categories.keys()
+
+
+def test_checkplan():
+    """test that preconditions run first, in the order they are declared"""
+
+    class Checker(checks.StandardChecker):
+        preconditions = {
+            "blank": ("startcaps",),
+            "untranslated": ("blank", "startcaps"),
+        }
+
+    checker = Checker()
+    plan = checker.getcheckplan()
+    names = [functionname for functionname, *rest in plan]
+    assert names[:2] == ["blank", "untranslated"]
+    assert checker.getcheckplan() is plan
+    checker.config.updatetargetlanguage("fr")
+    assert checker.getcheckplan() is not plan
+
+    unit = po.pounit("Hello")
+    unit.target = ""
+    failures = checker.run_filters(unit)
+    assert "untranslated" in failures
+    assert "blank" not in failures
+
+    # compendiumconflicts doesn't hide the preconditions declared before it
+    stdchecker = checks.StandardChecker()
+    unit = po.pounit("Hello world ")
+    unit.target = "#-#-#-#-# file.po #-#-#-#-#\nHallo wêreld\n"
+    assert sorted(stdchecker.run_filters(unit)) == [
+        "compendiumconflicts",
+        "endwhitespace",
+    ]
+
+
+def test_run_filters_batch():
+    """test that checking units together gives the same results as checking
+    them one by one
+    """
+    units = []
+    for source, target in (
+        ("Save &File", "Stoor &Lêer"),
+        ("Save &File", "stoor lêer"),
+        ("%d files", "%s lêers"),
+        ("Blank", ""),
+        ("%d files", "%d lêers."),
+    ):
+        unit = po.pounit(source)
+        unit.target = target
+        units.append(unit)
+    checker = checks.TeeChecker(
+        checkerclasses=[checks.MozillaChecker, checks.StandardUnitChecker],
+        languagecode="af",
+    )
+    results = list(checker.run_filters_batch(units, categorised=True))
+    assert results == [checker.run_filters(unit, categorised=True) for unit in units]
+    assert "printf" in results[2] and "untranslated" in results[3]
@@ -61,6 +61,7 @@ TODOs and Ideas for possible features:
 
 import logging
 import re
+from functools import lru_cache
 
 from translate.lang import data
 
@@ -68,6 +69,14 @@ from translate.lang import data
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _getwordre(punctuation):
+    """Returns a regular expression matching the words of :meth:`Common.words`,
+    that is whitespace separated tokens with something else than punctuation.
+    """
+    return re.compile(r"[^\s%s]\S*" % re.escape(punctuation))
+
+
 class Common:
     """This class is the common parent class for all language classes."""
 
@@ -372,6 +381,28 @@ class Common:
         """Returns a list of words in text."""
         return [w for w in cls.word_iter(text)]
 
+    @classmethod
+    def wordcount(cls, text):
+        """Returns the number of words in text, without building the list of
+        words.
+        """
+        return len(_getwordre(cls.punctuation).findall(text))
+
+    @classmethod
+    def wordcounts(cls, texts):
+        """Returns a list with the number of words in each of the texts.
+
+        Repeated texts are only counted once.
+        """
+        counts = {}
+        result = []
+        for text in texts:
+            count = counts.get(text)
+            if count is None:
+                count = counts[text] = cls.wordcount(text)
+            result.append(count)
+        return result
+
     @classmethod
     def sentence_iter(cls, text, strip=True):
         """Returns an iterator over the sentences in text."""
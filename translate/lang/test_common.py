@@ -32,6 +32,22 @@ def test_words():
     assert words == ["Don’t", "send", "e-mail"]
 
 
+def test_wordcount():
+    """Tests that word counts agree with word segmentation."""
+    language = common.Common
+    texts = [
+        "",
+        "test sentence.",
+        "This is a weird test .",
+        "Don't send e-mail!",
+        "¿Qué? — «Bien» …",
+        "test sentence.",
+    ]
+    for text in texts:
+        assert language.wordcount(text) == len(language.words(text))
+    assert language.wordcounts(texts) == [0, 2, 5, 3, 3, 2]
+
+
 @mark.xfail(
     reason="ZWS is not considered a space in Python 2.6+. Khmer "
     "should extend words() to include \\u200b in addition to "
@@ -18,13 +18,14 @@
 
 import fnmatch
 import logging
+import multiprocessing
 import optparse
 import os.path
 import re
 import sys
 import traceback
 from collections import OrderedDict
-from io import BytesIO
+from io import BytesIO, StringIO
 
 from translate import __version__
 from translate.misc import progressbar
@@ -118,9 +119,33 @@ class StdoutWrapper:
             self.out.write(content)
 
 
+# the parser, options and tasks of a worker process, see processtasks()
+_worker = None
+
+
+def _initworker(parser, options, tasks):
+    global _worker
+    _worker = parser, options, tasks
+
+
+def _processtask(index):
+    parser, options, tasks = _worker
+    stdout = sys.stdout
+    sys.stdout = StringIO()
+    try:
+        success = parser.processtask(options, tasks[index])
+        return success, sys.stdout.getvalue()
+    finally:
+        sys.stdout = stdout
+
+
 class RecursiveOptionParser(optparse.OptionParser):
     """A specialized Option Parser for recursing through directories."""
 
+    #: Whether the files can be processed in parallel with ``--jobs``, which
+    #: needs :meth:`recursiveprocess` to process them with :meth:`processtasks`.
+    supportsjobs = True
+
     def __init__(
         self, formats, usetemplates=False, allowmissingtemplate=False, description=None
     ):
@@ -135,6 +160,8 @@ class RecursiveOptionParser(optparse.OptionParser):
         self.setmanpageoption()
         self.setprogressoptions()
         self.seterrorleveloptions()
+        if self.supportsjobs:
+            self.setjobsoptions()
         self.setformats(formats, usetemplates)
         self.passthrough = []
         self.allowmissingtemplate = allowmissingtemplate
@@ -391,6 +418,19 @@ class RecursiveOptionParser(optparse.OptionParser):
         )
         self.define_option(errorleveloption)
 
+    def setjobsoptions(self):
+        """Sets the jobs option."""
+        jobsoption = optparse.Option(
+            None,
+            "--jobs",
+            dest="jobs",
+            default=1,
+            type="int",
+            metavar="JOBS",
+            help="process JOBS files at a time in separate processes (default: 1)",
+        )
+        self.define_option(jobsoption)
+
     def getformathelp(self, formats):
         """Make a nice help string for describing formats..."""
         formats = sorted([f for f in formats if f is not None])
@@ -572,6 +612,15 @@ class RecursiveOptionParser(optparse.OptionParser):
         # this makes for more merge-friendly content in single-output-file mode.
         inputfiles.sort()
         progress_bar = ProgressBar(options.progress, inputfiles)
+        tasks = self.getprocesstasks(options, inputfiles)
+        for inputpath, success in self.processtasks(options, tasks):
+            progress_bar.report_progress(inputpath, success)
+        del progress_bar
+
+    def getprocesstasks(self, options, inputfiles):
+        """Yields the (inputpath, fileprocessor, fullinputpath, fulloutputpath,
+        fulltemplatepath) of the input files that can be processed.
+        """
         for inputpath in inputfiles:
             try:
                 templatepath = self.gettemplatename(options, inputpath)
@@ -600,24 +649,62 @@ class RecursiveOptionParser(optparse.OptionParser):
                     "Couldn't handle input file %s" % inputpath, options, sys.exc_info()
                 )
                 continue
-            try:
-                success = self.processfile(
-                    fileprocessor,
-                    options,
-                    fullinputpath,
-                    fulloutputpath,
-                    fulltemplatepath,
-                )
-            except Exception:
-                self.warning(
-                    "Error processing: input %s, output %s, template %s"
-                    % (fullinputpath, fulloutputpath, fulltemplatepath),
-                    options,
-                    sys.exc_info(),
-                )
-                success = False
-            progress_bar.report_progress(inputpath, success)
-        del progress_bar
+            yield (
+                inputpath,
+                fileprocessor,
+                fullinputpath,
+                fulloutputpath,
+                fulltemplatepath,
+            )
+
+    def isparallel(self, options):
+        """Checks if files are processed in separate processes."""
+        return getattr(options, "jobs", 1) > 1
+
+    def processtasks(self, options, tasks):
+        """Processes the files of the tasks from :meth:`getprocesstasks`, and
+        yields (inputpath, success) for them in the same order.
+
+        With ``--jobs``, the files are processed in a pool of processes. What
+        they write to stdout is collected, and written in the order of the
+        files.
+        """
+        if self.isparallel(options):
+            tasks = list(tasks)
+            if len(tasks) > 1:
+                with multiprocessing.Pool(
+                    min(options.jobs, len(tasks)), _initworker, (self, options, tasks)
+                ) as pool:
+                    results = pool.imap(_processtask, range(len(tasks)))
+                    for task, (success, output) in zip(tasks, results):
+                        if output:
+                            sys.stdout.write(output)
+                        yield task[0], success
+                return
+        for task in tasks:
+            yield task[0], self.processtask(options, task)
+
+    def processtask(self, options, task):
+        """Processes the file of a task from :meth:`getprocesstasks`, and
+        returns whether it succeeded.
+        """
+        inputpath, fileprocessor, fullinputpath, fulloutputpath, fulltemplatepath = task
+        try:
+            return self.processfile(
+                fileprocessor,
+                options,
+                fullinputpath,
+                fulloutputpath,
+                fulltemplatepath,
+            )
+        except Exception:
+            self.warning(
+                "Error processing: input %s, output %s, template %s"
+                % (fullinputpath, fulloutputpath, fulltemplatepath),
+                options,
+                sys.exc_info(),
+            )
+            return False
 
     def ensurerecursiveoutputdirexists(self, options):
         if not self.isrecursive(options.output, "output"):
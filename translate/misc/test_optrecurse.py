@@ -4,6 +4,15 @@ from tempfile import NamedTemporaryFile
 from translate.misc import optrecurse
 
 
+def upper(inputfile, outputfile, templatefile):
+    content = inputfile.read()
+    if content == b"fail\n":
+        return False
+    outputfile.write(content.upper())
+    print("converted", content.decode().strip())
+    return True
+
+
 class TestRecursiveOptionParser:
     def test_splitext(self):
         """test the ``optrecurse.splitext`` function"""
@@ -31,3 +40,27 @@ class TestRecursiveOptionParser:
 
         out = parser.openoutputfile(None, None)  # To sys.stdout
         out.write(b"binary suff")
+
+    def test_jobs(self, tmp_path, capsys):
+        """test processing files in separate processes"""
+        parser = optrecurse.RecursiveOptionParser({"txt": ("out", upper)})
+        names = ["%02d" % i for i in range(12)]
+        (tmp_path / "input").mkdir()
+        for name in names:
+            (tmp_path / "input" / (name + ".txt")).write_bytes(
+                b"text %s\n" % name.encode()
+            )
+        (tmp_path / "input" / "fail.txt").write_bytes(b"fail\n")
+        inputdir = str(tmp_path / "input")
+        for jobs in ("1", "3"):
+            outputdir = str(tmp_path / ("output" + jobs))
+            options, args = parser.parse_args(
+                ["--progress=none", "--jobs", jobs, inputdir, outputdir]
+            )
+            parser.recursiveprocess(options)
+            assert sorted(os.listdir(outputdir)) == [name + ".out" for name in names]
+            with open(os.path.join(outputdir, "03.out"), "rb") as outputfile:
+                assert outputfile.read() == b"TEXT 03\n"
+            # what is printed is collected from the processes in order
+            out, err = capsys.readouterr()
+            assert out == "".join("converted text %s\n" % name for name in names)
@@ -0,0 +1,305 @@
+#
+# Copyright 2026 Zuza Software Foundation
+#
+# This file is part of translate.
+#
+# translate is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# translate is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks for translation memory matching on synthetic data."""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from translate.search import lshtein, match
+from translate.storage import po, tmdb
+
+
+class MatchBenchmarker:
+    """class to aid in benchmarking translation memory matching"""
+
+    def __init__(self, num_units, num_queries, words_per_string, seed=0):
+        self.random = random.Random(seed)
+        self.vocabulary = [
+            "".join(
+                self.random.choice("abcdefghijklmnopqrstuvwxyz")
+                for i in range(self.random.randint(2, 9))
+            )
+            for word in range(2000)
+        ]
+        self.tmstore = self.create_tm(num_units, words_per_string)
+        sources = [unit.source for unit in self.tmstore.units if unit.source]
+        self.queries = [
+            self.mutate(self.random.choice(sources)) for query in range(num_queries)
+        ]
+
+    def sentence(self, words_per_string):
+        """creates a random sentence"""
+        return " ".join(
+            self.random.choice(self.vocabulary)
+            for i in range(self.random.randint(1, words_per_string))
+        )
+
+    def mutate(self, text):
+        """changes a few characters in text, so that only some queries have
+        exact matches
+        """
+        text = list(text)
+        for i in range(self.random.randint(0, 3)):
+            position = self.random.randrange(len(text))
+            text[position] = self.random.choice("abcdefghijklmnopqrstuvwxyz ")
+        return "".join(text)
+
+    def create_tm(self, num_units, words_per_string):
+        """creates a store with random units"""
+        store = po.pofile()
+        for i in range(num_units):
+            unit = store.addsourceunit(self.sentence(words_per_string))
+            unit.target = self.sentence(words_per_string)
+        return store
+
+    def run_matcher(self, **kwargs):
+        """builds a matcher and runs all queries against it, returns the
+        results and the times it took
+        """
+        start = time.perf_counter()
+        matcher = match.matcher(
+            self.tmstore, max_candidates=1, max_length=1000, **kwargs
+        )
+        built = time.perf_counter()
+        results = [
+            [unit.source for unit in matcher.matches(query)] for query in self.queries
+        ]
+        done = time.perf_counter()
+        return results, built - start, done - built
+
+    def check_ngram(self):
+        """compares matching with and without the n-gram index"""
+        print("%-20s %10s %10s" % ("mode", "build (s)", "match (s)"))
+        plain, build, matching = self.run_matcher()
+        print("%-20s %10.3f %10.3f" % ("scan", build, matching))
+        indexed, build, matching = self.run_matcher(use_ngram_index=True)
+        print("%-20s %10.3f %10.3f" % ("ngram index", build, matching))
+        assert plain == indexed, "n-gram index changed the results"
+
+    def check_store(self):
+        """measures the time to build the matcher candidates and the memory
+        they use
+        """
+        start = time.perf_counter()
+        matcher = match.matcher(self.tmstore, max_length=1000)
+        built = time.perf_counter()
+        count = len(matcher.candidates)
+        del matcher
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        matcher = match.matcher(self.tmstore, max_length=1000)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print("candidates:        %d" % count)
+        print("build time:        %.3fs" % (built - start))
+        print("memory per entry:  %d bytes" % (used / count))
+
+    def check_updates(self, num_updates=1000):
+        """measures adding units to and removing them from a built matcher"""
+        matcher = match.matcher(self.tmstore, max_length=1000, use_ngram_index=True)
+        updates = self.create_tm(num_updates, 10).units
+        start = time.perf_counter()
+        for unit in updates:
+            matcher.extendtm(unit)
+        added = time.perf_counter()
+        for unit in updates:
+            matcher.removetm(unit)
+        removed = time.perf_counter()
+        print("add per unit:      %.6fs" % ((added - start) / num_updates))
+        print("remove per unit:   %.6fs" % ((removed - added) / num_updates))
+
+    def check_terminology(self, num_terms=20000):
+        """compares terminology matching with and without the automaton"""
+        glossary = po.pofile()
+        for i in range(num_terms):
+            unit = glossary.addsourceunit(self.sentence(2))
+            unit.target = self.sentence(2)
+        start = time.perf_counter()
+        matcher = match.terminologymatcher(glossary)
+        built = time.perf_counter()
+        print("%-20s %10s %10s" % ("mode", "build (s)", "match (s)"))
+        results = []
+        for mode in ("automaton", "scan"):
+            if mode == "scan":
+                matcher.automaton = None
+            matching = time.perf_counter()
+            results.append(
+                [
+                    [unit.source for unit in matcher.matches(query)]
+                    for query in self.queries
+                ]
+            )
+            done = time.perf_counter()
+            print("%-20s %10.3f %10.3f" % (mode, built - start, done - matching))
+        assert results[0] == results[1], "automaton changed the results"
+
+    def check_distance(self, lengths=(10, 30, 100, 300, 1000, 3000)):
+        """compares the Levenshtein distance implementations over a range of
+        string lengths, with and without a stop value
+        """
+        functions = [
+            ("python", lshtein.python_distance),
+            ("bitparallel", lshtein.bitparallel_distance),
+        ]
+        if hasattr(lshtein, "Levenshtein"):
+            functions.append(("native", lshtein.native_distance))
+        print(
+            "%-8s %-10s " % ("length", "stopvalue")
+            + " ".join("%11s" % name for name, function in functions)
+        )
+        for length in lengths:
+            a = self.mutate(self.sentence(length)[:length].ljust(length, "x"))
+            b = self.mutate(a[length // 10 :] + a[: length // 10])
+            repeat = max(1, 3000 // length)
+            # a stop value as used by matcher for 75% similarity, and none
+            for stopvalue in (length // 4, -1):
+                timings = []
+                for name, function in functions:
+                    start = time.perf_counter()
+                    for i in range(repeat):
+                        function(a, b, stopvalue)
+                    timings.append((time.perf_counter() - start) / repeat)
+                print(
+                    "%-8d %-10d " % (length, stopvalue)
+                    + " ".join("%10.6fs" % timing for timing in timings)
+                )
+
+    def check_tmdb(self, limits=(25, 100, 400, 0)):
+        """compares the recall and latency of TMDB lookups with an FTS5 index
+        ranking the candidates with bm25(), for a range of candidate limits,
+        to the unranked lookups with an FTS3 index
+        """
+        units = [
+            {"source": unit.source, "target": unit.target, "context": ""}
+            for unit in self.tmstore.units
+            if unit.source
+        ]
+        queries = [query for query in self.queries if len(query.split()) > 3]
+        with tempfile.TemporaryDirectory() as tempdir:
+            databases = []
+            for module in ("fts3(text)", "fts5(text, tokenize='trigram')"):
+                tmdbclass = type("TMDB", (tmdb.TMDB,), {"fulltext_modules": (module,)})
+                database = tmdbclass(
+                    os.path.join(tempdir, "%s.tmdb" % module[:4]), min_similarity=60
+                )
+                database.bulk_add([(units, "en", "af")])
+                databases.append(database)
+            print("%-20s %10s %10s" % ("mode", "recall", "match (s)"))
+            runs = [(databases[0], "fts3", 0)] + [
+                (databases[1], "fts5 top %d" % limit if limit else "fts5", limit)
+                for limit in limits
+            ]
+            expected = None
+            for database, mode, limit in runs:
+                database.max_fulltext_candidates = limit
+                start = time.perf_counter()
+                results = [
+                    {
+                        (suggestion["source"], suggestion["target"])
+                        for suggestion in database.lookup_units([query], "en", "af")[0]
+                    }
+                    for query in queries
+                ]
+                matching = time.perf_counter() - start
+                if expected is None:
+                    expected = results
+                found = sum(
+                    len(result & wanted) for result, wanted in zip(results, expected)
+                )
+                wanted = sum(len(result) for result in expected) or 1
+                print("%-20s %10.3f %10.3f" % (mode, found / wanted, matching))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark translation memory matching."
+    )
+    parser.add_argument(
+        "--units",
+        type=int,
+        default=20000,
+        help="number of units in the TM (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=200,
+        help="number of strings to match (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--words",
+        type=int,
+        default=10,
+        help="maximum number of words per string (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--check-ngram",
+        dest="check_ngram",
+        action="store_true",
+        help="benchmark matching with and without the n-gram index",
+    )
+    parser.add_argument(
+        "--check-store",
+        dest="check_store",
+        action="store_true",
+        help="benchmark building the matcher candidates",
+    )
+    parser.add_argument(
+        "--check-updates",
+        dest="check_updates",
+        action="store_true",
+        help="benchmark adding units to and removing them from the TM",
+    )
+    parser.add_argument(
+        "--check-terminology",
+        dest="check_terminology",
+        action="store_true",
+        help="benchmark terminology matching with and without the automaton",
+    )
+    parser.add_argument(
+        "--check-distance",
+        dest="check_distance",
+        action="store_true",
+        help="benchmark the Levenshtein distance implementations",
+    )
+    parser.add_argument(
+        "--check-tmdb",
+        dest="check_tmdb",
+        action="store_true",
+        help="benchmark the recall and latency of ranked TMDB lookups",
+    )
+    args = parser.parse_args()
+
+    benchmarker = MatchBenchmarker(args.units, args.queries, args.words)
+    if args.check_ngram:
+        benchmarker.check_ngram()
+    if args.check_store:
+        benchmarker.check_store()
+    if args.check_updates:
+        benchmarker.check_updates()
+    if args.check_terminology:
+        benchmarker.check_terminology()
+    if args.check_distance:
+        benchmarker.check_distance()
+    if args.check_tmdb:
+        benchmarker.check_tmdb()
@@ -23,7 +23,9 @@ See http://en.wikipedia.org/wiki/Levenshtein_distance.
 
 If available, the `python-Levenshtein
 <https://pypi.python.org/pypi/python-Levenshtein>`_ will be used which will
-provide better performance as it is implemented natively.
+provide better performance as it is implemented natively. Otherwise a
+bit-parallel implementation is used that stops as soon as the distance exceeds
+the stop value.
 """
 
 import math
@@ -58,6 +60,52 @@ def python_distance(a, b, stopvalue=-1):
     return current[l1]
 
 
+def bitparallel_distance(a, b, stopvalue=-1):
+    """Same as python_distance in functionality, but using the bit-vector
+    algorithm of Myers (in the formulation by Hyyrö) to calculate a whole
+    column of the distance matrix with a few integer operations.
+
+    Works on any sequences with hashable items, like strings or arrays of
+    character codes. Once the distance can't drop to stopvalue or below
+    anymore, a lower bound of the distance is returned.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    l1 = len(a)
+    l2 = len(b)
+    if l1 == 0:
+        return l2
+    # peq maps every item of a to a bit mask of the positions it occurs at
+    peq = {}
+    bit = 1
+    for item in a:
+        peq[item] = peq.get(item, 0) | bit
+        bit <<= 1
+    mask = bit - 1
+    last = bit >> 1
+    positive = mask
+    negative = 0
+    score = l1
+    for j, item in enumerate(b, 1):
+        match = peq.get(item, 0)
+        vertical = match | negative
+        horizontal = (((match & positive) + positive) ^ positive) | match
+        hpositive = negative | ~(horizontal | positive)
+        hnegative = positive & horizontal
+        if hpositive & last:
+            score += 1
+        elif hnegative & last:
+            score -= 1
+        # Every remaining item of b can lower the distance by at most one
+        if stopvalue >= 0 and score - (l2 - j) > stopvalue:
+            return score - (l2 - j)
+        hpositive = (hpositive << 1) | 1
+        hnegative <<= 1
+        positive = (hnegative | ~(vertical | hpositive)) & mask
+        negative = hpositive & vertical & mask
+    return score
+
+
 def native_distance(a, b, stopvalue=0):
     """Same as python_distance in functionality. This uses the fast C version
     if we detected it earlier.
@@ -78,7 +126,7 @@ except ImportError:
     logging.warning(
         "Python-Levenshtein not found. Continuing with built-in (slower) fuzzy matching."
     )
-    distance = python_distance
+    distance = bitparallel_distance
 
 
 class LevenshteinComparer:
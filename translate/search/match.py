@@ -21,11 +21,15 @@ units.
 """
 
 import heapq
+import json
+import math
+import multiprocessing
 import re
+from bisect import bisect_left, bisect_right, insort
 from operator import itemgetter
 
 from translate.misc.multistring import multistring
-from translate.search import lshtein, terminology
+from translate.search import lshtein, ngram, terminology, tmcache
 from translate.storage import base, po
 
 
@@ -34,6 +38,241 @@ def sourcelen(unit):
     return len(unit.source)
 
 
+class Candidate:
+    """A translation memory entry, as materialised from a
+    :class:`CandidateStore` for the matching results.
+    """
+
+    __slots__ = ("source", "target", "notes", "fuzzy")
+
+    def __init__(self, source, target, notes="", fuzzy=False):
+        self.source = source
+        self.target = target
+        self.notes = notes
+        self.fuzzy = fuzzy
+
+    def getnotes(self, origin=None):
+        return self.notes
+
+    def isfuzzy(self):
+        return self.fuzzy
+
+
+class CandidateStore:
+    """The translation memory entries of a :class:`matcher`.
+
+    The entries are kept in parallel lists, where an entry is identified by
+    its position, and are bucketed by the length of their source text. Within
+    a bucket entries keep the order they were added in, so iterating over the
+    buckets gives the same order as a stable sort by source length.
+
+    Adding and removing an entry doesn't reorder the others. Removed entries
+    are skipped until more than half of their bucket is removed, at which
+    point the bucket is compacted. The entries themselves stay in the parallel
+    lists until the store is replaced by a :meth:`compacted` copy. Iterating
+    over the entries keeps working while entries are added or removed, but
+    updates must not be made from several threads at once.
+    """
+
+    def __init__(self):
+        self.sources = []
+        self.targets = []
+        self.notes = []
+        self.fuzzy = bytearray()
+        #: The original multistrings of plural entries, by entry
+        self.plurals = {}
+        #: The entries with a source of a given length
+        self.buckets = {}
+        #: The source lengths with a bucket, sorted
+        self.lengths = []
+        #: The entries with a given source, either a number or a list
+        self.bysource = {}
+        #: Removed entries still present in their bucket
+        self.removed = set()
+        #: The number of removed entries in every bucket
+        self.removedcount = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, source, target, notes="", fuzzy=False, plurals=None):
+        """Adds an entry and returns its number.
+
+        :param plurals: The original source and target multistrings, for
+                        entries with plurals.
+        """
+        entry = len(self.sources)
+        self.sources.append(source)
+        self.targets.append(target)
+        self.notes.append(notes)
+        self.fuzzy.append(bool(fuzzy))
+        if plurals is not None:
+            self.plurals[entry] = plurals
+        length = len(source)
+        bucket = self.buckets.get(length)
+        if bucket is None:
+            self.buckets[length] = [entry]
+            insort(self.lengths, length)
+        else:
+            bucket.append(entry)
+        entries = self.bysource.get(source)
+        if entries is None:
+            self.bysource[source] = entry
+        elif isinstance(entries, list):
+            entries.append(entry)
+        else:
+            self.bysource[source] = [entries, entry]
+        self.count += 1
+        return entry
+
+    def remove(self, entry):
+        """Removes an entry. The numbers of other entries don't change."""
+        source = self.sources[entry]
+        entries = self.bysource[source]
+        if isinstance(entries, list):
+            entries.remove(entry)
+            if len(entries) == 1:
+                self.bysource[source] = entries[0]
+        else:
+            del self.bysource[source]
+        self.count -= 1
+        self.removed.add(entry)
+        length = len(source)
+        bucket = self.buckets[length]
+        removedcount = self.removedcount.get(length, 0) + 1
+        if removedcount * 2 <= len(bucket):
+            self.removedcount[length] = removedcount
+            return
+        # Compact the bucket by replacing it, so that iterations over the old
+        # bucket aren't disturbed
+        live = []
+        for other in bucket:
+            if other in self.removed:
+                self.removed.discard(other)
+                self.plurals.pop(other, None)
+            else:
+                live.append(other)
+        self.removedcount.pop(length, None)
+        if live:
+            self.buckets[length] = live
+        else:
+            del self.lengths[bisect_left(self.lengths, length)]
+            del self.buckets[length]
+
+    @classmethod
+    def fromcolumns(cls, sources, targets, notes, fuzzy, plurals):
+        """Returns a store with the entries in the given columns, numbered by
+        their position.
+
+        :param targets: A list of targets, or another sequence supporting
+                        ``append()``, like a
+                        :class:`~translate.search.tmcache.StringColumn`. The
+                        same applies to notes.
+        :param plurals: A dictionary mapping entries to the original source
+                        and target multistrings of plural entries.
+        """
+        store = cls()
+        store.sources = sources
+        store.targets = targets
+        store.notes = notes
+        store.fuzzy = bytearray(fuzzy)
+        store.plurals = plurals
+        buckets = store.buckets
+        bysource = store.bysource
+        for entry, source in enumerate(sources):
+            bucket = buckets.get(len(source))
+            if bucket is None:
+                buckets[len(source)] = [entry]
+            else:
+                bucket.append(entry)
+            entries = bysource.get(source)
+            if entries is None:
+                bysource[source] = entry
+            elif isinstance(entries, list):
+                entries.append(entry)
+            else:
+                bysource[source] = [entries, entry]
+        store.lengths = sorted(buckets)
+        store.count = len(sources)
+        return store
+
+    def needscompaction(self):
+        """Returns whether most entries in the lists are removed ones."""
+        return len(self.sources) > 2 * self.count
+
+    def compacted(self):
+        """Returns a copy of the store without the removed entries. The
+        remaining entries keep their order, but get new numbers.
+        """
+        store = CandidateStore()
+        for entry in sorted(self.entries()):
+            store.add(
+                self.sources[entry],
+                self.targets[entry],
+                self.notes[entry],
+                self.fuzzy[entry],
+                self.plurals.get(entry),
+            )
+        return store
+
+    def withsource(self, source):
+        """Returns the entries with the given source, in the order they were
+        added.
+        """
+        entries = self.bysource.get(source)
+        if entries is None:
+            return []
+        if isinstance(entries, list):
+            return list(entries)
+        return [entries]
+
+    def entries(self, startlength=0, reverse=False):
+        """Yields the entries ordered by source length, starting from sources
+        with startlength characters (or, if reverse, at most startlength).
+        """
+        lengths = self.lengths
+        buckets = self.buckets
+        if reverse:
+            if startlength:
+                lengths = lengths[: bisect_right(lengths, startlength)]
+            lengths = reversed(lengths)
+        else:
+            lengths = lengths[bisect_left(lengths, startlength) :]
+        removed = self.removed
+        for length in lengths:
+            for entry in buckets.get(length, ()):
+                if entry not in removed:
+                    yield entry
+
+    def record(self, entry):
+        """Materialises an entry as a :class:`Candidate`, with the original
+        multistrings for plurals.
+        """
+        source, target = self.plurals.get(
+            entry, (self.sources[entry], self.targets[entry])
+        )
+        return Candidate(source, target, self.notes[entry], bool(self.fuzzy[entry]))
+
+    @property
+    def units(self):
+        """All entries as :class:`Candidate` objects, ordered by source
+        length.
+        """
+        return [self.record(entry) for entry in self.entries()]
+
+
+# The matcher used by the worker processes of matcher.matches_many(). Worker
+# processes are forked after it is set, so they share the candidates with the
+# parent process without pickling them.
+_worker_matcher = None
+
+
+def _worker_matches(text):
+    """Returns the matches for text from the matcher of this worker."""
+    return _worker_matcher.matches(text)
+
+
 def _sort_matches(matches, match_info):
     """
     This function will sort a list of matches according to the match's starting
@@ -59,20 +298,49 @@ class matcher:
         max_length=70,
         comparer=None,
         usefuzzy=False,
+        use_ngram_index=False,
     ):
         """max_candidates is the maximum number of candidates that should be
         assembled, min_similarity is the minimum similarity that must be
         attained to be included in the result, comparer is an optional Comparer
-        with similarity() function
+        with similarity() function. If use_ngram_index is set, a trigram index
+        of the candidates is used to skip the ones that can't be similar
+        enough without calculating their distance. The index makes
+        :meth:`extendtm` and :meth:`removetm` slower, see
+        :class:`~translate.search.ngram.NgramIndex`.
         """
         if comparer is None:
             comparer = lshtein.LevenshteinComparer(max_length)
         self.comparer = comparer
         self.setparameters(max_candidates, min_similarity, max_length)
         self.usefuzzy = usefuzzy
+        self.use_ngram_index = use_ngram_index
+        self.ngramindex = None
+        self.compiled = None
         self.inittm(store)
         self.addpercentage = True
 
+    @property
+    def existingunits(self):
+        """The target of the last candidate added for every source (the
+        original multistring for plurals), to skip duplicates in
+        :meth:`usable`.
+        """
+        if self._existingunits is None:
+            # Loaded candidates only decode their targets when needed
+            candidates = self.candidates
+            self._existingunits = {}
+            for entry in sorted(candidates.entries()):
+                source, target = candidates.plurals.get(
+                    entry, (candidates.sources[entry], candidates.targets[entry])
+                )
+                self._existingunits[source] = target
+        return self._existingunits
+
+    @existingunits.setter
+    def existingunits(self, existingunits):
+        self._existingunits = existingunits
+
     def usable(self, unit):
         """Returns whether this translation unit is usable for TM"""
         # TODO: We might want to consider more attributes, such as approved, reviewed, etc.
@@ -81,26 +349,27 @@ class matcher:
         if source and target and (self.usefuzzy or not unit.isfuzzy()):
             if len(source) < 2:
                 return False
-            if source in self.existingunits and self.existingunits[source] == target:
-                return False
-            else:
-                self.existingunits[source] = target
-                return True
+            # extendtm() records the units in self.existingunits
+            return not (
+                source in self.existingunits and self.existingunits[source] == target
+            )
         return False
 
     def inittm(self, stores, reverse=False):
-        """Initialises the memory for later use. We use simple base units for
-        speedup.
+        """Initialises the memory for later use. We use a compact
+        :class:`CandidateStore` for speedup.
         """
         # reverse is deprectated - just use self.sort_reverse
+        self.close()
         self.existingunits = {}
-        self.candidates = base.TranslationStore()
+        self.candidates = CandidateStore()
+        self.ngramindex = None
+        self.buildngramindex()
 
         if isinstance(stores, base.TranslationStore):
             stores = [stores]
         for store in stores:
-            self.extendtm(store.units, store=store, sort=False)
-        self.candidates.units.sort(key=sourcelen, reverse=self.sort_reverse)
+            self.extendtm(store.units, store=store)
 
     def extendtm(self, units, store=None, sort=True):
         """Extends the memory with extra unit(s).
@@ -108,34 +377,174 @@ class matcher:
         :param units: The units to add to the TM.
         :param store: Optional store from where some metadata can be retrieved
                       and associated with each unit.
-        :param sort: Optional parameter that can be set to False to supress
-                     sorting of the candidates list. This should probably
-                     only be used in :meth:`matcher.inittm`.
+        :param sort: Ignored, the candidates are always kept in order.
         """
         if isinstance(units, base.TranslationUnit):
             units = [units]
+        candidates = self.candidates
+        ngramindex = self.ngramindex
         for candidate in (unit for unit in units if self.usable(unit)):
-            simpleunit = base.TranslationUnit("")
+            source = orig_source = candidate.source
+            target = orig_target = candidate.target
+            plurals = None
             # We need to ensure that we don't pass multistrings futher, since
             # some modules (like the native Levenshtein) can't use it.
-            if isinstance(candidate.source, multistring):
-                if len(candidate.source.strings) > 1:
-                    simpleunit.orig_source = candidate.source
-                    simpleunit.orig_target = candidate.target
-                simpleunit.source = str(candidate.source)
-                simpleunit.target = str(candidate.target)
-            else:
-                simpleunit.source = candidate.source
-                simpleunit.target = candidate.target
+            if isinstance(source, multistring):
+                if len(source.strings) > 1:
+                    plurals = (source, target)
+                source = str(source)
+                target = str(target)
             # If we now only get translator comments, we don't get programmer
             # comments in TM suggestions (in Pootle, for example). If we get all
             # notes, pot2po adds all previous comments as translator comments
             # in the new po file
-            simpleunit.addnote(candidate.getnotes(origin="translator"))
-            simpleunit.fuzzy = candidate.isfuzzy()
-            self.candidates.units.append(simpleunit)
-        if sort:
-            self.candidates.units.sort(key=sourcelen, reverse=self.sort_reverse)
+            candidates.add(
+                source,
+                target,
+                candidate.getnotes(origin="translator"),
+                candidate.isfuzzy(),
+                plurals,
+            )
+            if ngramindex is not None:
+                ngramindex.add(source)
+            # Keep multistrings for comparison with later units, but share the
+            # strings with the candidates otherwise
+            if isinstance(orig_source, multistring):
+                self.existingunits[orig_source] = orig_target
+            else:
+                self.existingunits[source] = target
+
+    def removetm(self, units):
+        """Removes unit(s) from the memory. A unit is identified by its source
+        and target, if several candidates are equal the last one added is
+        removed.
+
+        :param units: The units to remove from the TM.
+        :return: The number of removed candidates.
+        """
+        if isinstance(units, base.TranslationUnit):
+            units = [units]
+        candidates = self.candidates
+        removed = 0
+        for unit in units:
+            if not (unit.source and unit.target):
+                continue
+            source = str(unit.source)
+            target = str(unit.target)
+            entries = [
+                entry
+                for entry in candidates.withsource(source)
+                if candidates.targets[entry] == target
+            ]
+            if not entries:
+                continue
+            entry = entries[-1]
+            self.existingunits.pop(
+                candidates.plurals.get(entry, (source, target))[0], None
+            )
+            candidates.remove(entry)
+            if self.ngramindex is not None:
+                self.ngramindex.remove(entry, source)
+            removed += 1
+            # Record the last remaining candidate with this source, as
+            # extendtm() would have done without the removed one
+            remaining = candidates.withsource(source)
+            if remaining:
+                last = remaining[-1]
+                lastsource, lasttarget = candidates.plurals.get(
+                    last, (candidates.sources[last], candidates.targets[last])
+                )
+                self.existingunits[lastsource] = lasttarget
+        if candidates.needscompaction():
+            # Replacing the candidates doesn't disturb a running matches()
+            self.candidates = candidates.compacted()
+            self.buildngramindex()
+        return removed
+
+    def savecache(self, path, key):
+        """Writes the candidates to a compiled translation memory file, see
+        :mod:`translate.search.tmcache`.
+
+        :param key: The key returned by :func:`~translate.search.tmcache.cachekey`
+                    for the translation memory the candidates come from.
+        """
+        candidates = self.candidates
+        entries = sorted(candidates.entries())
+        columns = {name: [] for name in tmcache.COLUMNS}
+        for entry in entries:
+            columns["source"].append(candidates.sources[entry])
+            columns["target"].append(candidates.targets[entry])
+            columns["notes"].append(candidates.notes[entry])
+            if entry in candidates.plurals:
+                source, target = candidates.plurals[entry]
+                columns["orig_source"].append(json.dumps(source.strings))
+                columns["orig_target"].append(json.dumps(target.strings))
+            else:
+                columns["orig_source"].append("")
+                columns["orig_target"].append("")
+        fuzzy = [candidates.fuzzy[entry] for entry in entries]
+        ngramindex = self.ngramindex
+        if ngramindex is not None and len(entries) != len(candidates.sources):
+            # Candidates were removed, so the entries get new numbers
+            ngramindex = ngram.NgramIndex(columns["source"])
+        tmcache.write(path, key, columns, fuzzy, ngramindex)
+
+    def loadcache(self, path, key):
+        """Replaces the candidates with the ones from a compiled translation
+        memory file written by :meth:`savecache`. The file stays open until
+        :meth:`close` is called.
+
+        :return: Whether the file was up to date with *key* and got loaded.
+        """
+        compiled = tmcache.read(path, key)
+        if compiled is None:
+            return False
+        self.close()
+        self.compiled = compiled
+        columns = compiled.columns
+        # Only the sources are decoded now, the other strings when they are
+        # used
+        plurals = {
+            entry: (
+                multistring(json.loads(columns["orig_source"][entry])),
+                multistring(json.loads(columns["orig_target"][entry])),
+            )
+            for entry in columns["orig_source"].nonempty()
+        }
+        self.candidates = CandidateStore.fromcolumns(
+            list(columns["source"]),
+            columns["target"],
+            columns["notes"],
+            compiled.fuzzy,
+            plurals,
+        )
+        self.existingunits = None
+        # The candidates keep their numbers, so the saved index still applies
+        if compiled.ngramindex is not None and self.use_ngram_index:
+            self.ngramindex = compiled.ngramindex
+        else:
+            self.buildngramindex()
+        return True
+
+    def close(self):
+        """Closes the compiled translation memory file the candidates were
+        loaded from by :meth:`loadcache`, if any. The candidates can't be used
+        afterwards.
+        """
+        if self.compiled is not None:
+            self.compiled.close()
+            self.compiled = None
+
+    def buildngramindex(self):
+        """Builds the n-gram index of the candidates, if it is enabled and
+        usable with the comparer.
+        """
+        if self.use_ngram_index and isinstance(
+            self.comparer, lshtein.LevenshteinComparer
+        ):
+            self.ngramindex = ngram.NgramIndex(self.candidates.sources)
+        else:
+            self.ngramindex = None
 
     def setparameters(self, max_candidates=10, min_similarity=75, max_length=70):
         """Sets the parameters without reinitialising the tm. If a parameter is
@@ -168,40 +577,53 @@ class matcher:
                  *True* (default) the match quality is given as a
                  percentage in the notes.
         """
-        bestcandidates = [(0.0, None)] * self.MAX_CANDIDATES
+        bestcandidates = [(0.0, -1)] * self.MAX_CANDIDATES
         # We use self.MIN_SIMILARITY, but if we already know we have max_candidates
         # that are better, we can adjust min_similarity upwards for speedup
         min_similarity = self.MIN_SIMILARITY
 
         # We want to limit our search in self.candidates, so we want to ignore
-        # all units with a source string that is too short or too long. We use
-        # a binary search to find the shortest string, from where we start our
-        # search in the candidates.
+        # all units with a source string that is too short or too long. The
+        # candidates are bucketed by length, so we start our search with the
+        # bucket of the shortest string.
 
         # minimum source string length to be considered
         startlength = self.getstartlength(min_similarity, text)
-        startindex = 0
-        endindex = len(self.candidates.units)
-        while startindex < endindex:
-            mid = (startindex + endindex) // 2
-            if sourcelen(self.candidates.units[mid]) < startlength:
-                startindex = mid + 1
-            else:
-                endindex = mid
 
         # maximum source string length to be considered
         stoplength = self.getstoplength(min_similarity, text)
         lowestscore = 0
 
-        for candidate in self.candidates.units[startindex:]:
-            cmpstring = candidate.source
+        # With an n-gram index we count the n-grams every candidate has in
+        # common with the text to rule out candidates that can't reach
+        # min_similarity. This only works while the comparer doesn't shorten
+        # the strings.
+        ngramindex = self.ngramindex
+        if ngramindex is not None:
+            textlen = len(text)
+            maxlen = self.comparer.MAX_LEN
+            common = ngramindex.common(text, startlength, stoplength)
+
+        # The candidates may be replaced or updated while matching
+        candidates = self.candidates
+        sources = candidates.sources
+        for entry in candidates.entries(math.ceil(startlength)):
+            cmpstring = sources[entry]
             if len(cmpstring) > stoplength:
                 break
+            if ngramindex is not None:
+                longest = max(textlen, len(cmpstring))
+                if longest <= maxlen:
+                    maxdistance = math.ceil((100 - min_similarity) * longest / 100)
+                    if common.get(entry, 0) < ngramindex.minimum_common(
+                        longest, maxdistance
+                    ):
+                        continue
             similarity = self.comparer.similarity(text, cmpstring, min_similarity)
             if similarity < min_similarity:
                 continue
             if similarity > lowestscore:
-                heapq.heapreplace(bestcandidates, (similarity, candidate))
+                heapq.heapreplace(bestcandidates, (similarity, entry))
                 lowestscore = bestcandidates[0][0]
                 if lowestscore >= 100:
                     break
@@ -210,31 +632,69 @@ class matcher:
                     stoplength = self.getstoplength(min_similarity, text)
 
         # Remove the empty ones:
-        bestcandidates = [item for item in bestcandidates if item[0] != 0]
+        bestcandidates = [
+            (score, candidates.record(entry))
+            for score, entry in bestcandidates
+            if score != 0
+        ]
         # Sort for use as a general list, and reverse so the best one is at index 0
         bestcandidates.sort(key=itemgetter(0), reverse=True)
         return self.buildunits(bestcandidates)
 
+    def matches_many(self, texts, workers=1):
+        """Returns the lists of possible matches for several source texts.
+
+        :param texts: The texts that will be searched for in the translation
+                      memory.
+        :param workers: The number of worker processes to distribute the
+                        matching over. The candidates are shared with the
+                        workers by forking, so more than one worker is only
+                        used on platforms supporting the fork start method.
+        :rtype: list
+        :return: a list with the result of :meth:`matches` for every text, in
+                 the order of *texts*.
+        """
+        global _worker_matcher
+
+        texts = list(texts)
+        if (
+            workers <= 1
+            or len(texts) < 2
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            return [self.matches(text) for text in texts]
+
+        _worker_matcher = self
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(min(workers, len(texts))) as pool:
+                chunksize = max(1, len(texts) // (workers * 4))
+                return pool.map(_worker_matches, texts, chunksize)
+        finally:
+            _worker_matcher = None
+
     def buildunits(self, candidates):
         """Builds a list of units conforming to base API, with the score
         in the comment.
         """
         units = []
         for score, candidate in candidates:
-            if hasattr(candidate, "orig_source"):
-                candidate.source = candidate.orig_source
-                candidate.target = candidate.orig_target
-            newunit = po.pounit(candidate.source)
-            newunit.target = candidate.target
-            newunit.markfuzzy(candidate.fuzzy)
-            candidatenotes = candidate.getnotes().strip()
-            if candidatenotes:
-                newunit.addnote(candidatenotes)
+            newunit = self.buildunit(candidate)
             if self.addpercentage:
                 newunit.addnote("%d%%" % score)
             units.append(newunit)
         return units
 
+    def buildunit(self, candidate):
+        """Builds a unit conforming to base API from a :class:`Candidate`."""
+        newunit = po.pounit(candidate.source)
+        newunit.target = candidate.target
+        newunit.markfuzzy(candidate.fuzzy)
+        candidatenotes = candidate.getnotes().strip()
+        if candidatenotes:
+            newunit.addnote(candidatenotes)
+        return newunit
+
 
 # We don't want to miss certain forms of words that only change a little
 # at the end. Now we are tying this code to English, but it should serve
@@ -277,24 +737,75 @@ class terminologymatcher(matcher):
     def inittm(self, store):
         """Normal initialisation, but convert all source strings to lower case"""
         matcher.inittm(self, store)
+        self.buildterms()
+
+    def extendtm(self, units, store=None, sort=True):
+        matcher.extendtm(self, units, store=store, sort=sort)
+        # The terms are built again once they are needed, so that a series
+        # of updates only builds them once
+        self.termsoutdated = True
+
+    def removetm(self, units):
+        removed = matcher.removetm(self, units)
+        if removed:
+            self.termsoutdated = True
+        return removed
+
+    def updateterms(self):
+        """Builds the terms again if the candidates changed since they were
+        last built.
+        """
+        if self.termsoutdated:
+            self.buildterms()
+
+    def buildterms(self):
+        """Builds the list of lower case terms from the candidates."""
+        candidates = self.candidates
+        minlength = self.getstartlength(None, None)
+        terms = []
         extras = []
-        for unit in self.candidates.units:
-            source = unit.source = context_re.sub("", unit.source).lower()
+        for entry in candidates.entries(reverse=self.sort_reverse):
+            source = context_re.sub("", candidates.sources[entry]).lower()
+            fuzzy = bool(candidates.fuzzy[entry])
+            term = Candidate(
+                source, candidates.targets[entry], candidates.notes[entry], fuzzy
+            )
+            terms.append(term)
             for ignorepattern_re, replacement in ignorepatterns_re:
                 (newterm, occurrences) = ignorepattern_re.subn(replacement, source)
                 # we'll add it as long as we only replaced one thing, but not
                 # something like "are-you-sure-you-want-to" due to (" ", "-")
-                if occurrences == 1:
-                    new_unit = type(unit).buildfromunit(unit)
-                    new_unit.source = newterm
-                    # We mark it fuzzy to indicate that it isn't pristine
-                    unit.markfuzzy()
-                    extras.append(new_unit)
-        self.candidates.units.sort(key=sourcelen, reverse=self.sort_reverse)
-        if extras:
-            # We don't sort, so that the altered forms are at the back and
-            # considered last.
-            self.extendtm(extras, sort=False)
+                if occurrences != 1:
+                    continue
+                if minlength <= len(newterm) <= self.MAX_LENGTH:
+                    extras.append(Candidate(newterm, term.target, term.notes, fuzzy))
+                # We mark it fuzzy to indicate that it isn't pristine
+                term.fuzzy = True
+        terms.sort(key=sourcelen, reverse=self.sort_reverse)
+        # We don't sort the extras, so that the altered forms are at the back
+        # and considered last.
+        self.terms = terms + extras
+        self.sortedterms = len(terms)
+        self.buildautomaton()
+        self.termsoutdated = False
+
+    def buildautomaton(self):
+        """Compiles the terms into an Aho-Corasick automaton, so that all of
+        them can be found in a single pass over the text. This is only done
+        for the default comparer, since the automaton replaces it.
+        """
+        self.automaton = None
+        self.termindexes = {}
+        if not isinstance(self.comparer, terminology.TerminologyComparer):
+            return
+        for index, term in enumerate(self.terms):
+            self.termindexes.setdefault(term.source, []).append(index)
+        self.automaton = terminology.TermAutomaton(self.termindexes)
+
+    def matches_many(self, texts, workers=1):
+        # Build the terms before they are shared with the worker processes
+        self.updateterms()
+        return matcher.matches_many(self, texts, workers)
 
     def getstartlength(self, min_similarity, text):
         # Let's number false matches by not working with terms of two
@@ -321,6 +832,7 @@ class terminologymatcher(matcher):
         if text_l < self.getstartlength(0, ""):  # parameters unused
             # impossible to return anything
             return []
+        self.updateterms()
         text = text.lower()
         comparer = self.comparer
         comparer.match_info = {}
@@ -328,29 +840,48 @@ class terminologymatcher(matcher):
         matches = []
         known = set()
 
-        # We want to limit our search in self.candidates, so we want to ignore
-        # all units with a source string that is too long. We use binary search
-        # to find the first string short enough to occur in text, from where we
-        # start our search in the candidates.
-
-        # the maximum possible length is text_l
-        startindex = 0
-        endindex = len(self.candidates.units)
-        while startindex < endindex:
-            mid = (startindex + endindex) // 2
-            if sourcelen(self.candidates.units[mid]) > text_l:
-                startindex = mid + 1
-            else:
-                endindex = mid
-
-        for cand in self.candidates.units[startindex:]:
+        if self.automaton is not None:
+            # A single pass over the text finds the first position of every
+            # term in it, which are then considered in the order of the terms.
+            positions = self.automaton.positions(text[: comparer.MAX_LEN])
+            candidates = [
+                self.terms[index]
+                for index in sorted(
+                    index for source in positions for index in self.termindexes[source]
+                )
+            ]
+        else:
+            positions = None
+            # We want to limit our search in self.terms, so we want to ignore
+            # all units with a source string that is too long. We use binary
+            # search to find the first string short enough to occur in text,
+            # from where we start our search in the terms.
+
+            # the maximum possible length is text_l. Only the sorted terms
+            # can be searched, the extras are always considered.
+            startindex = 0
+            endindex = self.sortedterms
+            while startindex < endindex:
+                mid = (startindex + endindex) // 2
+                if sourcelen(self.terms[mid]) > text_l:
+                    startindex = mid + 1
+                else:
+                    endindex = mid
+            candidates = self.terms[startindex:]
+
+        for cand in candidates:
             source = cand.source
             if (source, cand.target) in known:
                 continue
-            if comparer.similarity(text, source, self.MIN_SIMILARITY):
-                match_info[source] = {"pos": comparer.match_info[source]["pos"]}
-                matches.append(cand)
-                known.add((source, cand.target))
+            if positions is not None:
+                pos = positions[source]
+            elif comparer.similarity(text, source, self.MIN_SIMILARITY):
+                pos = comparer.match_info[source]["pos"]
+            else:
+                continue
+            match_info[source] = {"pos": pos}
+            matches.append(cand)
+            known.add((source, cand.target))
 
         final_matches = []
         lastend = 0
@@ -380,7 +911,7 @@ class terminologymatcher(matcher):
             lastend = end
         if final_matches:
             self.match_info = match_info
-        return final_matches
+        return [self.buildunit(match) for match in final_matches]
 
 
 # utility functions used by virtaal and tmserver to convert matching units in easily marshallable dictionaries
@@ -0,0 +1,147 @@
+#
+# Copyright 2026 Zuza Software Foundation
+#
+# This file is part of translate.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <http://www.gnu.org/licenses/>.
+
+"""An inverted index of character n-grams used to discard translation
+memory candidates before calculating their Levenshtein distance.
+
+The filter is based on the q-gram lemma: every edit operation destroys at
+most *n* of the n-grams of a string, so two strings with an edit distance of
+*k* have at least ``max(len(a), len(b)) - n + 1 - k * n`` n-grams in common
+(counted as multisets). A candidate sharing fewer n-grams with the text than
+that can never be within distance *k*.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+
+def ngrams(text, n=3):
+    """Returns a :class:`collections.Counter` of the n-grams in ``text``."""
+    return Counter(text[i : i + n] for i in range(len(text) - n + 1))
+
+
+class NgramIndex:
+    """An inverted index from n-grams to the strings containing them. Strings
+    are identified by the order they were added in, starting from 0.
+
+    The posting of an n-gram holds arrays of the lengths, numbers and n-gram
+    counts of the strings containing it, sorted by length, so that the strings
+    of a range of lengths can be found by bisection. Keeping them sorted makes
+    :meth:`add` and :meth:`remove` move the part of every posting after the
+    string, which is linear in the length of the postings of common n-grams.
+    Use :meth:`build` to index many strings at once.
+    """
+
+    def __init__(self, strings=(), n=3):
+        self.n = n
+        self.postings = {}
+        #: The length of every indexed string
+        self.lengths = array("I")
+        self.build(strings)
+
+    def build(self, strings):
+        """(Re)builds the index for ``strings``."""
+        strings = list(strings)
+        self.postings = {}
+        self.lengths = array("I", map(len, strings))
+        # The strings are added by length, so the postings stay sorted
+        postings = self.postings
+        n = self.n
+        for number in sorted(range(len(strings)), key=self.lengths.__getitem__):
+            string = strings[number]
+            length = len(string)
+            for gram, count in ngrams(string, n).items():
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = (array("I"), array("I"), array("I"))
+                posting[0].append(length)
+                posting[1].append(number)
+                posting[2].append(count)
+
+    def add(self, string):
+        """Adds a string to the index and returns its number. The string is
+        inserted into the posting of each of its n-grams, after the strings
+        that aren't longer.
+        """
+        number = len(self.lengths)
+        self.lengths.append(len(string))
+        self._addpostings(number, string)
+        return number
+
+    def remove(self, number, string):
+        """Removes the string added as ``number`` from the postings. Its
+        length is kept, so that the numbers of other strings don't change.
+        """
+        length = len(string)
+        postings = self.postings
+        for gram in ngrams(string, self.n):
+            lengths, numbers, counts = postings[gram]
+            # Strings of the same length are in the order they were added
+            first = bisect_left(lengths, length)
+            last = bisect_right(lengths, length, first)
+            position = bisect_left(numbers, number, first, last)
+            del lengths[position]
+            del numbers[position]
+            del counts[position]
+            if not numbers:
+                del postings[gram]
+
+    def _addpostings(self, number, string):
+        length = len(string)
+        postings = self.postings
+        for gram, count in ngrams(string, self.n).items():
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = (
+                    array("I", [length]),
+                    array("I", [number]),
+                    array("I", [count]),
+                )
+            else:
+                lengths, numbers, counts = posting
+                position = bisect_right(lengths, length)
+                lengths.insert(position, length)
+                numbers.insert(position, number)
+                counts.insert(position, count)
+
+    def common(self, text, minlength=0, maxlength=float("inf")):
+        """Returns a dictionary mapping the numbers of indexed strings to the
+        number of n-grams they share with ``text``. Only strings with a length
+        between ``minlength`` and ``maxlength`` are considered, strings without
+        any n-gram in common are left out.
+        """
+        counts = {}
+        for gram, textcount in ngrams(text, self.n).items():
+            posting = self.postings.get(gram)
+            if posting is None:
+                continue
+            lengths, numbers, gramcounts = posting
+            first = bisect_left(lengths, minlength) if minlength else 0
+            last = bisect_right(lengths, maxlength)
+            for i in range(first, last):
+                number = numbers[i]
+                counts[number] = counts.get(number, 0) + min(textcount, gramcounts[i])
+        return counts
+
+    def minimum_common(self, length, maxdistance):
+        """Returns the number of n-grams a string of ``length`` characters
+        (the longer of the two strings compared) has to share with another
+        string to possibly be within ``maxdistance`` edits of it.
+        """
+        return length - self.n + 1 - maxdistance * self.n
@@ -18,6 +18,8 @@
 
 """A class that does terminology matching"""
 
+from collections import deque
+
 
 class TerminologyComparer:
     def __init__(self, max_len=500):
@@ -43,3 +45,79 @@ class TerminologyComparer:
             self.match_info[term] = {"pos": pos}
             return 100
         return 0
+
+
+class TermAutomaton:
+    """An Aho-Corasick automaton finding the occurrences of many terms in a
+    single pass over a text.
+    """
+
+    def __init__(self, terms=()):
+        self.goto = [{}]
+        self.fail = [0]
+        #: The term ending in every state, or *None*
+        self.terminal = [None]
+        #: All the terms ending in every state, including through the
+        #: failure transitions
+        self.output = [()]
+        for term in terms:
+            self.add(term)
+        self.build()
+
+    def add(self, term):
+        """Adds a term. :meth:`build` must be called before searching again."""
+        state = 0
+        for char in term:
+            nextstate = self.goto[state].get(char)
+            if nextstate is None:
+                nextstate = len(self.goto)
+                self.goto[state][char] = nextstate
+                self.goto.append({})
+                self.fail.append(0)
+                self.terminal.append(None)
+                self.output.append(())
+            state = nextstate
+        self.terminal[state] = term
+
+    def build(self):
+        """Calculates the failure transitions and outputs of all states."""
+        goto, fail, terminal, output = self.goto, self.fail, self.terminal, self.output
+        queue = deque()
+        for state in goto[0].values():
+            fail[state] = 0
+            output[state] = () if terminal[state] is None else (terminal[state],)
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, nextstate in goto[state].items():
+                queue.append(nextstate)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[nextstate] = goto[fallback].get(char, 0)
+                output[nextstate] = output[fail[nextstate]]
+                if terminal[nextstate] is not None:
+                    output[nextstate] = (terminal[nextstate],) + output[nextstate]
+
+    def finditer(self, text):
+        """Yields a tuple of the start position and the term for every
+        occurrence of a term in ``text``, ordered by their end position.
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for term in output[state]:
+                yield end - len(term), term
+
+    def positions(self, text):
+        """Returns a dictionary mapping every term occurring in ``text`` to the
+        position of its first occurrence, like :meth:`str.find`.
+        """
+        positions = {}
+        for position, term in self.finditer(text):
+            if term not in positions:
+                positions[term] = position
+        return positions
@@ -13,6 +13,26 @@ class TestLevenshtein:
         assert lshtein.distance("words", "word") == 1
         assert lshtein.distance("word", "woord") == 1
 
+    def test_bitparallel_distance(self):
+        """Tests that the bit-parallel distance agrees with the Python one"""
+        words = ["", "a", "word", "words", "wood", "drow", "sword", "aaaa", "abab"]
+        for a in words:
+            for b in words:
+                distance = lshtein.python_distance(a, b)
+                assert lshtein.bitparallel_distance(a, b) == distance
+                assert lshtein.bitparallel_distance(list(a), list(b)) == distance
+        sentence = "The quick brown fox jumps over the lazy dog" * 5
+        assert lshtein.bitparallel_distance(sentence, sentence[::-1]) == (
+            lshtein.python_distance(sentence, sentence[::-1])
+        )
+
+    def test_bitparallel_stopvalue(self):
+        """Tests that the bit-parallel distance stops beyond stopvalue"""
+        assert lshtein.bitparallel_distance("word", "words", 1) == 1
+        assert lshtein.bitparallel_distance("word", "wood", 1) == 1
+        assert lshtein.bitparallel_distance("abcdefgh", "zyxwvuts", 2) > 2
+        assert lshtein.bitparallel_distance("a" * 100, "b" * 100, 10) > 10
+
     def test_basic_similarity(self):
         """Tests similarity correctness with a few basic values"""
         levenshtein = lshtein.LevenshteinComparer()
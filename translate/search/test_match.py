@@ -1,5 +1,5 @@
 from translate.search import match
-from translate.storage import csvl10n
+from translate.storage import base, csvl10n
 
 
 class TestMatch:
@@ -78,6 +78,105 @@ class TestMatch:
         assert len(candidates) == 1
         assert candidates[0] == "Open file"
 
+    def test_removetm(self):
+        """Test that we can remove units from the TM after creation."""
+        csvfile = self.buildcsv(
+            ["Open file", "Open file", "Open files"], ["Maak oop", "Open", "Lêers"]
+        )
+        matcher = match.matcher(csvfile, use_ngram_index=True)
+        assert len(matcher.candidates) == 3
+        assert matcher.removetm(self.buildcsv(["Open file"], ["Open"]).units) == 1
+        assert matcher.removetm(self.buildcsv(["Open file"], ["Open"]).units) == 0
+        assert [unit.target for unit in matcher.matches("Open file")] == [
+            "Maak oop",
+            "Lêers",
+        ]
+        # the remaining candidate with the source is used to find duplicates
+        assert matcher.existingunits["Open file"] == "Maak oop"
+        assert not matcher.usable(csvfile.units[0])
+        assert matcher.usable(csvfile.units[1])
+        matcher.extendtm(csvfile.units[1])
+        assert len(matcher.candidates) == 3
+        assert matcher.removetm(csvfile.units) == 3
+        assert len(matcher.candidates) == 0
+        assert matcher.matches("Open file") == []
+        assert matcher.existingunits == {}
+
+    def test_candidatestore(self):
+        """Test adding and removing entries while iterating over them"""
+        store = match.CandidateStore()
+        for source in ["aa", "bbb", "cc", "dd", "ee"]:
+            store.add(source, source.upper())
+        iterator = store.entries()
+        assert next(iterator) == 0
+        store.remove(2)
+        store.add("ff", "FF")
+        assert list(iterator) == [3, 4, 5, 1]
+        store.remove(0)
+        store.remove(3)
+        # more than half of the bucket is removed, so it is compacted
+        assert store.buckets[2] == [4, 5]
+        assert store.removed == set()
+        store.remove(1)
+        assert store.lengths == [2]
+        assert list(store.entries()) == [4, 5]
+        assert store.withsource("ee") == [4]
+        assert len(store) == 2
+        assert store.needscompaction()
+        compacted = store.compacted()
+        assert compacted.sources == ["ee", "ff"]
+        assert list(compacted.entries()) == [0, 1]
+        assert not compacted.needscompaction()
+
+    def test_removetm_compaction(self):
+        """Test that removed candidates are dropped from the matcher"""
+        sources = ["Open file", "Open files", "Close file", "Close files"]
+        csvfile = self.buildcsv(sources)
+        matcher = match.matcher(csvfile, use_ngram_index=True)
+        assert matcher.removetm(csvfile.units[:3]) == 3
+        assert matcher.candidates.sources == ["Close files"]
+        assert matcher.ngramindex.common("Open file") == {0: 3}
+        assert self.candidatestrings(matcher.matches("Close file")) == ["Close files"]
+
+    def test_ngram_index(self):
+        """Test that the n-gram index doesn't change the results"""
+        sources = [
+            "Open file",
+            "Open files",
+            "Open a file...",
+            "Close file",
+            "Save file as...",
+            "Save all files",
+            "File",
+            "Fill",
+            "A completely unrelated sentence",
+        ]
+        csvfile = self.buildcsv(sources)
+        plain = match.matcher(csvfile, max_candidates=1, max_length=20)
+        indexed = match.matcher(
+            csvfile, max_candidates=1, max_length=20, use_ngram_index=True
+        )
+        assert indexed.ngramindex is not None
+        for text in sources + ["Open file...", "Save the file", "Fil", "x"]:
+            for min_similarity in (10, 50, 75):
+                plain.setparameters(1, min_similarity, 20)
+                indexed.setparameters(1, min_similarity, 20)
+                assert self.candidatestrings(
+                    indexed.matches(text)
+                ) == self.candidatestrings(plain.matches(text))
+        indexed.extendtm(self.buildcsv(["Open file.."]).units)
+        assert self.candidatestrings(indexed.matches("Open file...")) == ["Open file.."]
+
+    def test_matches_many(self):
+        """Test matching several strings at once"""
+        csvfile = self.buildcsv(["hand", "asdf", "fdas", "haas", "pond"])
+        matcher = match.matcher(csvfile)
+        texts = ["hond", "fdsa", "asdf", "hand", "pand"]
+        expected = [self.candidatestrings(matcher.matches(text)) for text in texts]
+        for workers in (1, 2):
+            results = matcher.matches_many(texts, workers=workers)
+            assert [self.candidatestrings(units) for units in results] == expected
+
     def test_terminology(self):
         csvfile = self.buildcsv(["file", "computer", "directory"])
         matcher = match.terminologymatcher(csvfile)
@@ -128,3 +227,46 @@ class TestMatch:
         assert candidates == ["preorder"]
         candidates = self.candidatestrings(matcher.matches("You can pre order"))
         assert candidates == ["pre order"]
+
+    def test_terminology_units(self):
+        """Tests that terms are returned as units, with the altered terms
+        marking the original as fuzzy"""
+        csvfile = self.buildcsv(["pre-order", "file"])
+        matcher = match.terminologymatcher(csvfile)
+        units = matcher.matches("Order a file with pre-order or preorder")
+        assert [unit.source for unit in units] == ["file", "pre-order", "preorder"]
+        assert all(isinstance(unit, base.TranslationUnit) for unit in units)
+        assert [unit.isfuzzy() for unit in units] == [False, True, False]
+
+    def test_terminology_updates(self):
+        """Tests that terms are rebuilt once after updating the terminology"""
+        csvfile = self.buildcsv(["file", "computer"])
+        matcher = match.terminologymatcher(csvfile)
+        matcher.extendtm(self.buildcsv(["directory"]).units)
+        matcher.removetm(csvfile.units[1])
+        assert matcher.termsoutdated
+        candidates = self.candidatestrings(
+            matcher.matches("Copy the files from your computer to a directory")
+        )
+        assert not matcher.termsoutdated
+        assert candidates == ["file", "directory"]
+
+    def test_terminology_automaton(self):
+        """Tests that the automaton finds the same terms as scanning them"""
+        csvfile = self.buildcsv(
+            ["file", "files", "computer", "down time", "time", "pre-order", "order"]
+        )
+        matcher = match.terminologymatcher(csvfile)
+        texts = [
+            "Copy the files from your computer",
+            "%d minutes downtime",
+            "Order the time of your preorder",
+            "Nothing to see",
+        ]
+        expected = []
+        for text in texts:
+            expected.append(self.candidatestrings(matcher.matches(text)))
+            assert matcher.automaton is not None
+        matcher.automaton = None
+        for text, candidates in zip(texts, expected):
+            assert self.candidatestrings(matcher.matches(text)) == candidates
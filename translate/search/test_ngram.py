@@ -0,0 +1,65 @@
+from translate.search import lshtein, ngram
+
+
+class TestNgramIndex:
+    """Test the n-gram index used to prefilter candidates"""
+
+    def test_ngrams(self):
+        """Tests that n-grams are counted with their multiplicity"""
+        assert ngram.ngrams("word") == {"wor": 1, "ord": 1}
+        assert ngram.ngrams("aaaa") == {"aaa": 2}
+        assert ngram.ngrams("ab") == {}
+
+    def test_common(self):
+        """Tests counting of common n-grams"""
+        index = ngram.NgramIndex(["hand", "asdf", "hond", "aaaa"])
+        assert index.common("pond") == {2: 1}
+        assert index.common("hondo") == {2: 2}
+        assert index.common("aaa") == {3: 1}
+        assert index.common("aaaaa") == {3: 2}
+        assert index.common("hondo", minlength=5) == {}
+        assert index.common("hondo", maxlength=3) == {}
+
+    def test_add(self):
+        """Tests adding strings to an index"""
+        index = ngram.NgramIndex(["hand"])
+        assert index.add("hond") == 1
+        assert index.common("hond") == {1: 2}
+        assert list(index.lengths) == [4, 4]
+        index.add("hon")
+        index.add("hondas")
+        assert index.common("hond") == {1: 2, 2: 1, 3: 2}
+        assert index.common("hond", minlength=4, maxlength=4) == {1: 2}
+        assert list(index.postings["hon"][0]) == [3, 4, 6]
+        assert list(index.postings["hon"][1]) == [2, 1, 3]
+
+    def test_remove(self):
+        """Tests removing strings from an index"""
+        index = ngram.NgramIndex(["hand", "hond", "hondo", "hond"])
+        index.remove(1, "hond")
+        assert index.common("hond") == {2: 2, 3: 2}
+        index.remove(2, "hondo")
+        assert index.common("hondo") == {3: 2}
+        assert "ndo" not in index.postings
+        assert len(index.lengths) == 4
+
+    def test_lemma(self):
+        """Tests that the n-gram bound never excludes a close enough string"""
+        strings = [
+            "Open file",
+            "Open files",
+            "Open a file",
+            "Close file",
+            "pen fil",
+            "aaaaaaaa",
+            "aaaabaaa",
+        ]
+        index = ngram.NgramIndex(strings)
+        for text in strings:
+            common = index.common(text)
+            for position, string in enumerate(strings):
+                distance = lshtein.python_distance(text, string)
+                longest = max(len(text), len(string))
+                assert common.get(position, 0) >= index.minimum_common(
+                    longest, distance
+                )
@@ -8,3 +8,19 @@ class TestTerminology:
         """Tests basic functionality"""
         termmatcher = terminology.TerminologyComparer()
         assert termmatcher.similarity("Open the file", "file") > 75
+
+    def test_automaton(self):
+        """Tests finding all terms in a single pass"""
+        automaton = terminology.TermAutomaton(["he", "she", "his", "hers"])
+        assert list(automaton.finditer("ushers")) == [
+            (1, "she"),
+            (2, "he"),
+            (2, "hers"),
+        ]
+        assert automaton.positions("she said his hers") == {
+            "she": 0,
+            "he": 1,
+            "his": 9,
+            "hers": 13,
+        }
+        assert automaton.positions("nothing") == {}
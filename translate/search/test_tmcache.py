@@ -0,0 +1,105 @@
+import pytest
+
+from translate.misc.multistring import multistring
+from translate.search import match, tmcache
+from translate.storage import po
+
+
+class TestTMCache:
+    """Test compiled translation memory files"""
+
+    def buildpo(self):
+        """Build a store with a plural, a fuzzy and an annotated unit"""
+        store = po.pofile()
+        unit = store.addsourceunit("Open the file")
+        unit.target = "Maak die lêer oop"
+        unit.addnote("Menu item", origin="translator")
+        unit = store.addsourceunit(multistring(["%d file", "%d files"]))
+        unit.target = multistring(["%d lêer", "%d lêers"])
+        unit = store.addsourceunit("Save the file")
+        unit.target = "Stoor die lêer"
+        unit.markfuzzy()
+        return store
+
+    def test_roundtrip(self, tmp_path):
+        """Test that the columns survive writing and reading"""
+        path = str(tmp_path / "tm.tmc")
+        columns = {name: ["", "ā", "a\nb"] for name in tmcache.COLUMNS}
+        tmcache.write(path, {"a": 1}, columns, [False, True, False])
+        with tmcache.read(path, {"a": 1}) as compiled:
+            assert {
+                name: list(column) for name, column in compiled.columns.items()
+            } == columns
+            assert compiled.columns["target"][1] == "ā"
+            assert list(compiled.columns["target"].nonempty()) == [1, 2]
+            assert compiled.fuzzy == b"\x00\x01\x00"
+            assert compiled.ngramindex is None
+        with pytest.raises(ValueError):
+            compiled.columns["target"][1]
+        assert tmcache.read(path, {"a": 2}) is None
+        assert tmcache.read(str(tmp_path / "missing.tmc"), {"a": 1}) is None
+
+    def test_damaged(self, tmp_path):
+        """Test that damaged files are ignored"""
+        path = str(tmp_path / "tm.tmc")
+        columns = {name: ["abc"] for name in tmcache.COLUMNS}
+        tmcache.write(path, {}, columns, [False])
+        with open(path, "rb") as handle:
+            data = handle.read()
+        with open(path, "wb") as handle:
+            handle.write(data[:-10])
+        assert tmcache.read(path, {}) is None
+        with open(path, "wb") as handle:
+            pass
+        assert tmcache.read(path, {}) is None
+
+    def test_cachekey(self, tmp_path):
+        """Test that the key changes with the files"""
+        tmfile = tmp_path / "tm.po"
+        tmfile.write_bytes(bytes(self.buildpo()))
+        key = tmcache.cachekey([str(tmfile)], usefuzzy=False)
+        assert key == tmcache.cachekey([str(tmfile)], usefuzzy=False)
+        assert key != tmcache.cachekey([str(tmfile)], usefuzzy=True)
+        tmfile.write_bytes(bytes(self.buildpo()) + b"\n")
+        assert key != tmcache.cachekey([str(tmfile)], usefuzzy=False)
+
+    def test_matcher(self, tmp_path):
+        """Test that a matcher loaded from a compiled file gives the same
+        matches as the original one"""
+        path = str(tmp_path / "tm.tmc")
+        original = match.matcher(self.buildpo(), usefuzzy=True, use_ngram_index=True)
+        original.savecache(path, {})
+        loaded = match.matcher([], usefuzzy=True, use_ngram_index=True)
+        assert loaded.loadcache(path, {})
+        assert not loaded.loadcache(path, {"other": "key"})
+        for gram, posting in original.ngramindex.postings.items():
+            assert loaded.ngramindex.postings[gram] == posting
+        for text in ["Open a file", "%d files", "Save the files"]:
+            expected = [str(unit) for unit in original.matches(text)]
+            assert [str(unit) for unit in loaded.matches(text)] == expected
+        assert str(loaded.matches("%d file")[0].source.strings[1]) == "%d files"
+        # the loaded candidates can be extended
+        assert loaded.existingunits == original.existingunits
+        unit = self.buildpo().units[1]
+        assert not loaded.usable(unit)
+        unit.target = "Maak oop"
+        loaded.extendtm(unit)
+        assert sorted(unit.target for unit in loaded.matches("Open the file")) == [
+            "Maak die lêer oop",
+            "Maak oop",
+        ]
+        loaded.close()
+        assert loaded.compiled is None
+
+    def test_removed(self, tmp_path):
+        """Test that removed candidates aren't written"""
+        path = str(tmp_path / "tm.tmc")
+        original = match.matcher(self.buildpo(), usefuzzy=True, use_ngram_index=True)
+        original.removetm(original.matches("Open a file")[:1])
+        original.savecache(path, {})
+        loaded = match.matcher([], usefuzzy=True, use_ngram_index=True)
+        assert loaded.loadcache(path, {})
+        assert len(loaded.candidates) == len(original.candidates)
+        for text in ["Open a file", "%d files", "Save the files"]:
+            expected = [str(unit) for unit in original.matches(text)]
+            assert [str(unit) for unit in loaded.matches(text)] == expected
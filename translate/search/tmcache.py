@@ -0,0 +1,296 @@
+#
+# Copyright 2026 Zuza Software Foundation
+#
+# This file is part of translate.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <http://www.gnu.org/licenses/>.
+
+"""Compiled translation memory files, caching the candidates of a
+:class:`~translate.search.match.matcher` so that the translation memory
+doesn't have to be parsed again.
+
+A compiled file starts with a magic string and a JSON header, followed by a
+number of string columns. Every column is an array of offsets followed by the
+UTF-8 encoded strings, so that a string can be located without decoding the
+others. An optional :class:`~translate.search.ngram.NgramIndex` of the
+candidates is stored after the columns as flat arrays. The file is memory
+mapped while reading, and strings are only decoded when they are used.
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from translate.search import ngram
+
+MAGIC = b"TTKTMC\x02\n"
+
+#: The string columns stored for every candidate, in file order.
+COLUMNS = ("source", "target", "notes", "orig_source", "orig_target")
+
+_OFFSET_TYPE = "Q"
+_POSTING_TYPE = "I"
+_LENGTH = struct.Struct("<Q")
+
+
+def cachekey(tmfiles, **parameters):
+    """Returns a key identifying the current state of the translation memory
+    files, together with any parameters influencing the candidates.
+    """
+    files = []
+    for tmfile in tmfiles:
+        stat = os.stat(tmfile)
+        files.append([os.path.abspath(tmfile), stat.st_mtime_ns, stat.st_size])
+    return {"files": files, "parameters": parameters}
+
+
+def cachepath(cachedir, tmfiles):
+    """Returns the path of the compiled file for tmfiles in cachedir."""
+    name = "\0".join(os.path.abspath(tmfile) for tmfile in tmfiles)
+    return os.path.join(
+        cachedir, hashlib.sha1(name.encode("utf-8")).hexdigest() + ".tmc"
+    )
+
+
+def _writestrings(output, strings):
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = array.array(_OFFSET_TYPE, [0])
+    total = 0
+    for string in encoded:
+        total += len(string)
+        offsets.append(total)
+    output.write(offsets.tobytes())
+    output.write(b"".join(encoded))
+
+
+def _writengrams(output, ngramindex):
+    postings = ngramindex.postings
+    output.write(array.array(_POSTING_TYPE, ngramindex.lengths).tobytes())
+    offsets = array.array(_OFFSET_TYPE, [0])
+    lengths = array.array(_POSTING_TYPE)
+    indexes = array.array(_POSTING_TYPE)
+    counts = array.array(_POSTING_TYPE)
+    for gramlengths, gramindexes, gramcounts in postings.values():
+        lengths.extend(gramlengths)
+        indexes.extend(gramindexes)
+        counts.extend(gramcounts)
+        offsets.append(len(indexes))
+    _writestrings(output, postings.keys())
+    output.write(offsets.tobytes())
+    output.write(lengths.tobytes())
+    output.write(indexes.tobytes())
+    output.write(counts.tobytes())
+
+
+def write(path, key, columns, fuzzy, ngramindex=None):
+    """Writes a compiled translation memory.
+
+    :param key: The key returned by :func:`cachekey`.
+    :param columns: A dictionary mapping every name in :data:`COLUMNS` to a
+                    list of strings.
+    :param fuzzy: A list of booleans.
+    :param ngramindex: An optional :class:`~translate.search.ngram.NgramIndex`
+                       of the sources.
+    """
+    header = {"key": key, "count": len(fuzzy), "byteorder": sys.byteorder}
+    if ngramindex is not None:
+        header["ngrams"] = {"n": ngramindex.n, "count": len(ngramindex.postings)}
+    header = json.dumps(header).encode("utf-8")
+    # Write to a temporary file first, so that concurrent readers never see
+    # a partial file.
+    temppath = "%s.%d.tmp" % (path, os.getpid())
+    with open(temppath, "wb") as output:
+        output.write(MAGIC)
+        output.write(_LENGTH.pack(len(header)))
+        output.write(header)
+        output.write(bytes(bool(flag) for flag in fuzzy))
+        for name in COLUMNS:
+            _writestrings(output, columns[name])
+        if ngramindex is not None:
+            _writengrams(output, ngramindex)
+    os.replace(temppath, path)
+
+
+def read(path, key):
+    """Reads a compiled translation memory.
+
+    :return: A :class:`CompiledTM`, or *None* if there is no usable file for
+             key.
+    """
+    try:
+        handle = open(path, "rb")
+    except OSError:
+        return None
+    with handle:
+        try:
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return None
+    try:
+        compiled = CompiledTM(data, key)
+    except (ValueError, TypeError, KeyError, IndexError, struct.error):
+        # truncated or otherwise damaged file
+        data.close()
+        return None
+    if compiled.count is None:
+        compiled.close()
+        return None
+    return compiled
+
+
+class StringColumn:
+    """A column of strings in a compiled file, which are only decoded when
+    they are accessed. Strings can be appended, these are kept in memory.
+    """
+
+    def __init__(self, data, offsets, start):
+        self.data = data
+        self.offsets = offsets
+        self.start = start
+        self.count = len(offsets) - 1
+        self.appended = []
+
+    def __len__(self):
+        return self.count + len(self.appended)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index >= self.count:
+            return self.appended[index - self.count]
+        offsets = self.offsets
+        start = self.start
+        return str(
+            self.data[start + offsets[index] : start + offsets[index + 1]], "utf-8"
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, string):
+        self.appended.append(string)
+
+    def nonempty(self):
+        """Yields the indexes of the strings that aren't empty."""
+        offsets = self.offsets
+        for index in range(self.count):
+            if offsets[index] != offsets[index + 1]:
+                yield index
+        for index, string in enumerate(self.appended, self.count):
+            if string:
+                yield index
+
+
+class CompiledTM:
+    """A compiled translation memory read from a memory mapped file.
+
+    The file stays mapped while the columns are used, so it has to be closed
+    with :meth:`close`, or by using the object as a context manager.
+
+    :ivar count: The number of candidates, or *None* if the file was written
+                 for another key.
+    :ivar columns: A dictionary mapping every name in :data:`COLUMNS` to a
+                   :class:`StringColumn`.
+    :ivar fuzzy: The fuzzy flags, as bytes.
+    :ivar ngramindex: The :class:`~translate.search.ngram.NgramIndex` given to
+                      :func:`write`, or *None*.
+    """
+
+    def __init__(self, data, key):
+        self.data = data
+        self.count = None
+        self.columns = {}
+        self.fuzzy = b""
+        self.ngramindex = None
+        reader = _Reader(data)
+        if reader.read(len(MAGIC)) != MAGIC:
+            return
+        (headerlength,) = _LENGTH.unpack(reader.read(_LENGTH.size))
+        header = json.loads(reader.read(headerlength))
+        if header["key"] != key or header["byteorder"] != sys.byteorder:
+            return
+        count = header["count"]
+        self.fuzzy = reader.read(count)
+        self.columns = {name: reader.readcolumn(count) for name in COLUMNS}
+        if "ngrams" in header:
+            self.ngramindex = reader.readngrams(count, header["ngrams"])
+        self.count = count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Unmaps the file, after which the columns can't be used."""
+        self.data.close()
+
+
+class _Reader:
+    """Reads the sections of a compiled file one after the other."""
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def skip(self, size):
+        """Skips size bytes and returns the position they start at."""
+        position = self.position
+        if position + size > len(self.data):
+            raise ValueError("Truncated file")
+        self.position += size
+        return position
+
+    def read(self, size):
+        position = self.skip(size)
+        return self.data[position : position + size]
+
+    def readarray(self, typecode, count):
+        result = array.array(typecode)
+        result.frombytes(self.read(count * result.itemsize))
+        return result
+
+    def readcolumn(self, count):
+        offsets = self.readarray(_OFFSET_TYPE, count + 1)
+        return StringColumn(self.data, offsets, self.skip(offsets[count]))
+
+    def readstrings(self, count):
+        return list(self.readcolumn(count))
+
+    def readngrams(self, count, header):
+        gramcount = header["count"]
+        lengths = self.readarray(_POSTING_TYPE, count)
+        grams = self.readstrings(gramcount)
+        offsets = self.readarray(_OFFSET_TYPE, gramcount + 1)
+        gramlengths = self.readarray(_POSTING_TYPE, offsets[gramcount])
+        indexes = self.readarray(_POSTING_TYPE, offsets[gramcount])
+        counts = self.readarray(_POSTING_TYPE, offsets[gramcount])
+        ngramindex = ngram.NgramIndex(n=header["n"])
+        ngramindex.lengths = lengths
+        ngramindex.postings = {
+            gram: (
+                gramlengths[offsets[i] : offsets[i + 1]],
+                indexes[offsets[i] : offsets[i + 1]],
+                counts[offsets[i] : offsets[i + 1]],
+            )
+            for i, gram in enumerate(grams)
+        }
+        return ngramindex
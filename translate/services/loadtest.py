@@ -0,0 +1,205 @@
+#
+# Copyright 2026 Zuza Software Foundation
+#
+# This file is part of translate.
+#
+# translate is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# translate is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <http://www.gnu.org/licenses/>.
+
+"""Load test for the translation memory server, reporting the latency and
+throughput of concurrent suggestion requests against a local database.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib import parse
+from urllib.request import urlopen
+
+from cheroot.wsgi import Server
+
+from translate.lang import data
+from translate.search.benchmark import MatchBenchmarker
+from translate.services.tmserver import TMServer
+from translate.storage import tmdb
+
+
+class LoadTester:
+    """class to aid in load testing the translation memory server"""
+
+    def __init__(
+        self,
+        tmdbfile,
+        source_lang,
+        target_lang,
+        num_units,
+        num_requests,
+        words_per_string,
+        seed=0,
+    ):
+        """fills tmdbfile with num_units random units, or uses the units
+        already in it if num_units is 0
+        """
+        self.tmdbfile = tmdbfile
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        database = tmdb.TMDB(tmdbfile)
+        if num_units:
+            benchmarker = MatchBenchmarker(
+                num_units, num_requests, words_per_string, seed
+            )
+            database.add_store(benchmarker.tmstore, source_lang, target_lang)
+            self.queries = benchmarker.queries
+        else:
+            database.cursor.execute(
+                "SELECT text FROM sources WHERE lang = ?",
+                (data.normalize_code(source_lang),),
+            )
+            sources = [text for (text,) in database.cursor]
+            generator = random.Random(seed)
+            self.queries = [generator.choice(sources) for i in range(num_requests)]
+
+    def request(self, url):
+        """requests url and returns the time it took"""
+        start = time.perf_counter()
+        with urlopen(url) as response:
+            response.read()
+        return time.perf_counter() - start
+
+    def run(self, workers=1, threads=10, concurrency=20, cache_size=0):
+        """serves the database and sends all requests, with concurrency
+        requests at a time
+
+        The queries can repeat strings, so with a cache_size the latencies
+        include suggestions answered from the server's cache.
+        """
+        application = TMServer(
+            self.tmdbfile, None, workers=workers, cache_size=cache_size
+        )
+        server = Server(("localhost", 0), application.rest, numthreads=threads)
+        server.prepare()
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        baseurl = "http://localhost:%d/%s/%s/unit/" % (
+            server.bind_addr[1],
+            self.source_lang,
+            self.target_lang,
+        )
+        urls = [baseurl + parse.quote(query, safe="") for query in self.queries]
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as executor:
+                latencies = list(executor.map(self.request, urls))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.stop()
+            thread.join()
+            application.close()
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        print("requests:     %d" % len(latencies))
+        print("concurrency:  %d" % concurrency)
+        print("workers:      %d" % workers)
+        print("cache size:   %d" % cache_size)
+        print("throughput:   %.1f requests/s" % (len(latencies) / elapsed))
+        print("p50 latency:  %.1f ms" % (percentiles[49] * 1000))
+        print("p99 latency:  %.1f ms" % (percentiles[98] * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load test the translation memory server."
+    )
+    parser.add_argument(
+        "--tmdb",
+        help="database to serve, a temporary one with --units random units is "
+        "created if not given",
+    )
+    parser.add_argument(
+        "--source-lang",
+        dest="source_lang",
+        default="en",
+        help="source language of the requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--target-lang",
+        dest="target_lang",
+        default="af",
+        help="target language of the requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--units",
+        type=int,
+        default=20000,
+        help="number of random units to add to the database (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="number of suggestion requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--words",
+        type=int,
+        default=10,
+        help="maximum number of words per string (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=20,
+        help="number of requests sent at a time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of server worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=10,
+        help="number of server threads (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        type=int,
+        default=0,
+        help="number of strings the server caches the suggestions of "
+        "(default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        if args.tmdb:
+            tmdbfile = args.tmdb
+            units = args.units if not os.path.exists(tmdbfile) else 0
+        else:
+            tmdbfile = os.path.join(tempdir, "loadtest.tmdb")
+            units = args.units
+        tester = LoadTester(
+            tmdbfile,
+            args.source_lang,
+            args.target_lang,
+            units,
+            args.requests,
+            args.words,
+        )
+        tester.run(args.workers, args.threads, args.concurrency, args.cache_size)
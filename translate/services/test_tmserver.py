@@ -3,7 +3,7 @@ import os
 import shutil
 import tempfile
 import threading
-from urllib.request import urlopen
+from urllib.request import Request, urlopen
 
 from cheroot.wsgi import Server
 from pytest import mark
@@ -29,6 +29,7 @@ msgstr "Ahoj"
         return test_dir, application
 
     def cleanup(self, test_dir, application):
+        application.close()
         application.tmdb.connection.close()
         shutil.rmtree(test_dir)
 
@@ -39,9 +40,10 @@ msgstr "Ahoj"
         self.cleanup(test_dir, application)
 
     @mark.skipif(os.name == "nt", reason="can not delete non closed files")
-    def test_server(self):
+    @mark.parametrize("workers", [1, 2])
+    def test_server(self, workers):
         """Test http server"""
-        test_dir, application = self.create_server()
+        test_dir, application = self.create_server(workers=workers, cache_size=1000)
 
         # Prepare server thread
         server = Server(("localhost", 0), application.rest)
@@ -50,12 +52,29 @@ msgstr "Ahoj"
         thread = threading.Thread(target=server.serve)
         thread.start()
 
-        # Run test
-        response = urlopen(f"http://localhost:{server_port}/en/cs/unit/Hello/")
-        payload = json.loads(response.read().decode("utf-8"))
-        assert payload[0]["target"] == "Ahoj"
-
-        # Shutdown the server thread
-        server.stop()
-        thread.join()
-        self.cleanup(test_dir, application)
+        try:
+            # Run test
+            response = urlopen(f"http://localhost:{server_port}/en/cs/unit/Hello/")
+            payload = json.loads(response.read().decode("utf-8"))
+            assert payload[0]["target"] == "Ahoj"
+            request = Request(
+                f"http://localhost:{server_port}/en/cs/units",
+                data=json.dumps(["Hello", "Goodbye", "Hello!"]).encode("utf-8"),
+            )
+            payload = json.loads(urlopen(request).read().decode("utf-8"))
+            assert [[unit["target"] for unit in units] for units in payload] == [
+                ["Ahoj"],
+                [],
+                ["Ahoj"],
+            ]
+            response = urlopen(f"http://localhost:{server_port}/en/cs/unit/Hello")
+            payload = json.loads(response.read().decode("utf-8"))
+            assert payload[0]["target"] == "Ahoj"
+            response = urlopen(f"http://localhost:{server_port}/cache")
+            payload = json.loads(response.read().decode("utf-8"))
+            assert payload == {"size": 1000, "entries": 4, "hits": 1, "misses": 4}
+        finally:
+            # Shutdown the server thread
+            server.stop()
+            thread.join()
+            self.cleanup(test_dir, application)
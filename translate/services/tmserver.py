@@ -22,16 +22,46 @@ clients using JSON over HTTP.
 
 import json
 import logging
+import multiprocessing
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from urllib import parse
 
 from translate.misc import selector, wsgi
 from translate.storage import base, tmdb
 
+# The database of a worker process, see TMServer.
+_worker_tmdb = None
+
+
+def _init_worker(tmdbfile, max_candidates, min_similarity, max_length):
+    """Opens the database in a worker process."""
+    global _worker_tmdb
+    _worker_tmdb = tmdb.TMDB(tmdbfile, max_candidates, min_similarity, max_length)
+
+
+def _worker_lookup_units(unit_sources, source_langs, target_langs):
+    """Returns the suggestions for all unit_sources from the database of this
+    worker.
+    """
+    return _worker_tmdb.lookup_units(unit_sources, source_langs, target_langs)
+
 
 class TMServer:
-    """A RESTful JSON TM server."""
+    """A RESTful JSON TM server.
+
+    Requests are handled by the threads of the WSGI server. Since looking up
+    suggestions is mostly spent calculating similarities, which doesn't run
+    concurrently in threads, the lookups can be handed to a pool of worker
+    processes with *workers*. Every worker opens its own connection to the
+    database, so this needs a database file.
+
+    The suggestions for the last *cache_size* strings are cached in the
+    server process, see :class:`~translate.storage.tmdb.SuggestionCache`.
+    Only translations added through this server update the cache, so it
+    shouldn't be used while the database is also changed elsewhere.
+    """
 
     def __init__(
         self,
@@ -43,17 +73,33 @@ class TMServer:
         prefix="",
         source_lang=None,
         target_lang=None,
+        workers=1,
+        cache_size=0,
     ):
         if not isinstance(tmdbfile, str):
             import sys
 
             tmdbfile = tmdbfile.decode(sys.getfilesystemencoding())
 
-        self.tmdb = tmdb.TMDB(tmdbfile, max_candidates, min_similarity, max_length)
+        self.tmdb = tmdb.TMDB(
+            tmdbfile, max_candidates, min_similarity, max_length, cache_size
+        )
 
         if tmfiles:
             self._load_files(tmfiles, source_lang, target_lang)
 
+        self.pool = None
+        self.workers = workers
+        if workers > 1:
+            if tmdbfile == ":memory:":
+                logging.warning(
+                    "An in-memory database can't be shared with worker processes"
+                )
+            else:
+                self._start_workers(
+                    workers, tmdbfile, max_candidates, min_similarity, max_length
+                )
+
         # initialize url dispatcher
         self.rest = selector.Selector(prefix=prefix)
         self.rest.add(
@@ -64,6 +110,10 @@ class TMServer:
             DELETE=self.forget_unit,
         )
 
+        self.rest.add("/{slang}/{tlang}/units", POST=self.translate_units)
+
+        self.rest.add("/cache", GET=self.get_cache_stats)
+
         self.rest.add(
             "/{slang}/{tlang}/store/{sid:any}",
             GET=self.get_store_stats,
@@ -72,6 +122,48 @@ class TMServer:
             DELETE=self.forget_store,
         )
 
+    def _start_workers(self, workers, *initargs):
+        # The worker processes are spawned rather than forked, since SQLite
+        # connections must not be used across a fork.
+        self.pool = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=initargs,
+        )
+        # Start all the workers now instead of during the first requests
+        for future in [self.pool.submit(int) for i in range(workers)]:
+            future.result()
+
+    def close(self):
+        """Stops the worker processes, if any."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def _lookup_in_workers(self, unit_sources, source_langs, target_langs):
+        """Looks up the suggestions for unit_sources, split over the worker
+        processes.
+        """
+        chunksize = max(1, -(-len(unit_sources) // self.workers))
+        futures = [
+            self.pool.submit(
+                _worker_lookup_units,
+                unit_sources[i : i + chunksize],
+                source_langs,
+                target_langs,
+            )
+            for i in range(0, len(unit_sources), chunksize)
+        ]
+        return [suggestions for future in futures for suggestions in future.result()]
+
+    def _translate_units(self, uids, slang, tlang):
+        if self.pool is None:
+            return self.tmdb.translate_units(uids, slang, tlang)
+        return self.tmdb.translate_units(
+            uids, slang, tlang, lookup=self._lookup_in_workers
+        )
+
     def _load_files(self, tmfiles, source_lang, target_lang):
         from translate.storage import factory
 
@@ -86,7 +178,7 @@ class TMServer:
     @selector.opliant
     def translate_unit(self, environ, start_response, uid, slang, tlang):
         start_response("200 OK", [("Content-type", "text/plain")])
-        candidates = self.tmdb.translate_unit(uid, slang, tlang)
+        candidates = self._translate_units([uid], slang, tlang)[0]
         logging.debug("candidates: %s", str(candidates))
         response = json.dumps(candidates, indent=4).encode("utf-8")
         params = parse.parse_qs(environ.get("QUERY_STRING", ""))
@@ -97,6 +189,25 @@ class TMServer:
             pass
         return [response]
 
+    @selector.opliant
+    def translate_units(self, environ, start_response, slang, tlang):
+        """Return suggestions for a JSON list of source strings from POST data,
+        as a list with the suggestions of every string.
+        """
+        start_response("200 OK", [("Content-type", "text/plain")])
+        uids = json.loads(environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"])))
+        candidates = self._translate_units(uids, slang, tlang)
+        logging.debug("candidates: %s", str(candidates))
+        return [json.dumps(candidates, indent=4).encode("utf-8")]
+
+    @selector.opliant
+    def get_cache_stats(self, environ, start_response):
+        """Return the size, number of entries, hits and misses of the
+        suggestion cache.
+        """
+        start_response("200 OK", [("Content-type", "text/plain")])
+        return [json.dumps(self.tmdb.cache.stats(), indent=4).encode("utf-8")]
+
     @selector.opliant
     def add_unit(self, environ, start_response, uid, slang, tlang):
         start_response("200 OK", [("Content-type", "text/plain")])
@@ -228,6 +339,30 @@ def main():
         default=1000,
         help="Maxmimum string length",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=int,
+        default=1,
+        help="number of worker processes looking up suggestions (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threads",
+        dest="threads",
+        type=int,
+        default=10,
+        help="number of threads handling requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        type=int,
+        default=0,
+        help="number of strings to cache the suggestions of, which aren't "
+        "updated when the database is changed by other processes "
+        "(default: %(default)s)",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -255,8 +390,15 @@ def main():
         prefix="/tmserver",
         source_lang=args.source_lang,
         target_lang=args.target_lang,
+        workers=args.workers,
+        cache_size=args.cache_size,
     )
-    wsgi.launch_server(args.bind, args.port, application.rest)
+    try:
+        wsgi.launch_server(
+            args.bind, args.port, application.rest, numthreads=args.threads
+        )
+    finally:
+        application.close()
 
 
 if __name__ == "__main__":
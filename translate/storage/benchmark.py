@@ -22,9 +22,11 @@ import os
 import pstats
 import random
 import sys
+import time
 from importlib import import_module
 
 from translate.storage import factory, placeables
+from translate.tools import pocount
 
 
 class TranslateBenchmarker:
@@ -102,11 +104,74 @@ class TranslateBenchmarker:
         for dirpath, subdirs, filenames in os.walk(file_dir, topdown=False):
             for name in filenames:
                 pofilename = os.path.join(dirpath, name)
-                parsedfile = self.StoreClass(open(pofilename))
+                parsedfile = self.StoreClass(open(pofilename, "rb"))
                 count += len(parsedfile.units)
                 self.parsedfiles.append(parsedfile)
         print("counted %d units" % count)
 
+    def compare_parsers(self, file_dir=None):
+        """parses all the files in the test directory with the regular
+        expression parser and with the state machine only, and checks that
+        they give the same output
+        """
+        if file_dir is None:
+            file_dir = self.file_dir
+        inputs = []
+        for dirpath, subdirs, filenames in os.walk(file_dir, topdown=False):
+            for name in filenames:
+                with open(os.path.join(dirpath, name), "rb") as pofile:
+                    inputs.append(pofile.read())
+        outputs = []
+        default = self.StoreClass.regex_parser
+        for regex_parser in (True, False):
+            self.StoreClass.regex_parser = regex_parser
+            start = time.perf_counter()
+            parsedfiles = [self.StoreClass.parsestring(data) for data in inputs]
+            elapsed = time.perf_counter() - start
+            outputs.append([bytes(parsedfile) for parsedfile in parsedfiles])
+            print(
+                "%-15s %.3fs" % ("regex" if regex_parser else "state machine", elapsed)
+            )
+        self.StoreClass.regex_parser = default
+        assert outputs[0] == outputs[1], "the parsers gave different output"
+
+    def remove_duplicates(self, num_units=100000, duplication=0.3):
+        """times removing duplicates from a store where the given fraction of
+        the units repeat the source of another one, as converters generate
+        for large sites
+        """
+        num_sources = int(num_units * (1 - duplication))
+        sources = ["word%d sentence" % i for i in range(num_sources)]
+        sources += [random.choice(sources) for i in range(num_units - num_sources)]
+        random.shuffle(sources)
+        for duplicatestyle in ("merge", "msgctxt"):
+            store = self.StoreClass()
+            for i, source in enumerate(sources):
+                unit = store.addsourceunit(source)
+                unit.addlocation("page%d.html+body.p:%d" % (i // 100, i % 100))
+            start = time.perf_counter()
+            store.removeduplicates(duplicatestyle)
+            elapsed = time.perf_counter() - start
+            print(
+                "%-10s %d units, %d left: %.3fs"
+                % (duplicatestyle, num_units, len(store.units), elapsed)
+            )
+
+    def count_words(self):
+        """times counting the words of the units in the parsed files, first
+        with an empty and then with a filled word count cache
+        """
+        units = [unit for parsedfile in self.parsedfiles for unit in parsedfile.units]
+        pocount.wordcount.cache_clear()
+        for cache in ("empty cache", "filled cache"):
+            start = time.perf_counter()
+            counts = [pocount.wordsinunit(unit) for unit in units]
+            elapsed = time.perf_counter() - start
+            print(
+                "%-15s %d units, %d source words: %.3fs"
+                % (cache, len(units), sum(count[0] for count in counts), elapsed)
+            )
+
     def parse_placeables(self):
         """parses placeables"""
         count = 0
@@ -141,6 +206,24 @@ if __name__ == "__main__":
         action="store_true",
         help="benchmark parsing files",
     )
+    parser.add_argument(
+        "--compare-parsers",
+        dest="compare_parsers",
+        action="store_true",
+        help="compare the regular expression and state machine PO parsers",
+    )
+    parser.add_argument(
+        "--check-duplicates",
+        dest="check_duplicates",
+        action="store_true",
+        help="benchmark removing duplicates",
+    )
+    parser.add_argument(
+        "--check-wordcount",
+        dest="check_wordcount",
+        action="store_true",
+        help="benchmark counting words",
+    )
     parser.add_argument(
         "--check-placeables",
         dest="check_placeables",
@@ -151,8 +234,8 @@ if __name__ == "__main__":
 
     storetype = args.storetype
 
-    if storetype in factory.classes_str:
-        _module, _class = factory.classes_str[storetype]
+    if storetype in factory._classes_str:
+        _module, _class = factory._classes_str[storetype]
         module = import_module("translate.storage.%s" % _module)
         storeclass = getattr(module, _class)
     else:
@@ -193,6 +276,15 @@ if __name__ == "__main__":
         if args.check_parsing:
             methods.append(("parse_files", ""))
 
+        if args.compare_parsers:
+            benchmarker.compare_parsers(file_dir=args.podir)
+
+        if args.check_duplicates:
+            benchmarker.remove_duplicates()
+
+        if args.check_wordcount:
+            benchmarker.count_words()
+
         if args.check_placeables:
             methods.append(("parse_placeables", ""))
 
@@ -380,11 +380,170 @@ def parse_header(parse_state, store):
     return first_unit
 
 
+def iter_units(parse_state, store):
+    """Yields the units one at a time as they are parsed, without adding them
+    to store. The encoding defined in the header is still set on store.
+    """
+    yield from _iter_remaining_units(parse_state, parse_header(parse_state, store))
+
+
 def parse_units(parse_state, store):
+    for unit in iter_units(parse_state, store):
+        store.addunit(unit)
+
+
+# The regular expressions for the fast path in iter_units_regex(). They only
+# match entries the state machine above would parse the same way; anything
+# else, like obsolete units, previous msgids or KDE comments, is left to the
+# state machine.
+_WS = r"[^\S\n]*"
+_BLANK = r"(?:[^\S\n]*\n)*"
+# a quoted string, from the first to the last quote of the line
+_QUOTED = r'"[^\n]*"[^"\n]*\n'
+# a quoted string that isn't a KDE comment
+_QUOTED_ID = r'"(?!_:)[^\n]*"[^"\n]*\n'
+
+
+def _message(keyword, quoted):
+    return keyword + _WS + quoted + "(?:" + _BLANK + _WS + quoted + ")*"
+
+
+ENTRY_REGEX = re.compile(
+    r"{blank}(?P<entry>(?P<comments>(?:{blank}{ws}#(?![~|])[^\n]*\n)*)"
+    r"{blank}(?P<msgctxt>{msgctxt})?"
+    r"{blank}(?P<msgid>{msgid})"
+    r"{blank}(?:(?P<msgstr>{msgstr})"
+    r"|(?P<msgid_plural>{msgid_plural}){blank}(?P<msgstr_array>(?:{msgstr_n}{blank})+)))"
+    # a stray quoted line would continue the last message
+    r'(?!{blank}{ws}")'.format(
+        ws=_WS,
+        blank=_BLANK,
+        msgctxt=_message("msgctxt", _QUOTED),
+        msgid=_message("msgid", _QUOTED_ID),
+        msgstr=_message("msgstr", _QUOTED),
+        msgid_plural=_message("msgid_plural", _QUOTED_ID),
+        msgstr_n=_message(r"msgstr\[\d+\]", _QUOTED),
+    )
+)
+BLANK_REGEX = re.compile(r"\s*\Z")
+# an entry exactly as pypo.pounit writes it, with the comments in the same
+# order and no whitespace outside the quoted strings
+CANONICAL_REGEX = re.compile(
+    r"(?:#(?![.:,])[^\n]*\n)*(?:#\.[^\n]*\n)*(?:#:[^\n]*\n)*(?:#,[^\n]*\n)*"
+    r"(?:msgctxt {quoted}+)?msgid {quoted}+"
+    r"(?:msgstr {quoted}+|msgid_plural {quoted}+(?:msgstr\[(?:0|[1-9][0-9]*)\] {quoted}+)+)"
+    r"\Z".format(quoted=r'(?:"[^\n]*"\n)')
+)
+COMMENT_REGEX = re.compile(r"^[^\S\n]*(#[^\n]*\n)", re.MULTILINE)
+QUOTED_REGEX = re.compile(r'"[^\n]*"')
+MSGSTR_ARRAY_REGEX = re.compile(r'msgstr\[(\d+)\]|"[^\n]*"')
+COMMENT_ATTRIBUTES = {
+    ".": "automaticcomments",
+    ":": "sourcecomments",
+    ",": "typecomments",
+}
+
+
+def build_unit(match, UnitClass):
+    """Creates a unit from a match of :data:`ENTRY_REGEX`."""
+    unit = UnitClass()
+    for comment in COMMENT_REGEX.findall(match.group("comments")):
+        attribute = COMMENT_ATTRIBUTES.get(comment[1], "othercomments")
+        append(getattr(unit, attribute), comment)
+    msgctxt = match.group("msgctxt")
+    if msgctxt is not None:
+        unit.msgctxt = QUOTED_REGEX.findall(msgctxt)
+    unit.msgid = QUOTED_REGEX.findall(match.group("msgid"))
+    msgstr = match.group("msgstr")
+    if msgstr is not None:
+        unit.msgstr = QUOTED_REGEX.findall(msgstr)
+    else:
+        unit.msgid_plural = QUOTED_REGEX.findall(match.group("msgid_plural"))
+        msgstr_dict = {}
+        for array_match in MSGSTR_ARRAY_REGEX.finditer(match.group("msgstr_array")):
+            index = array_match.group(1)
+            if index is not None:
+                entry = msgstr_dict.setdefault(int(index), [])
+            else:
+                append(entry, array_match.group())
+        unit.msgstr = msgstr_dict
+    return unit
+
+
+def is_canonical(text, unit):
+    """Checks whether text is what the unit parsed from it writes."""
+    if not CANONICAL_REGEX.match(text) or '\n""\n""\n' in text:
+        return False
+    if unit.msgid == ['""']:
+        # only the comments of units without a msgid are written
+        return False
+    if isinstance(unit.msgstr, dict):
+        # the plural forms are written in order, and repeated ones combined
+        indexes = list(unit.msgstr)
+        return indexes == sorted(indexes) and len(indexes) == text.count("msgstr[")
+    return True
+
+
+def iter_units_regex(lines, newline, store, raw=False):
+    """Yields the same units as :func:`iter_units` for a list of lines ending
+    with newline, but scans all the entries after the header with
+    :data:`ENTRY_REGEX` instead of reading them line by line. Entries that
+    don't match are parsed by the state machine.
+
+    With raw, units keep the text they were parsed from if they would write
+    it the same way, see :meth:`~translate.storage.pypo.pounit.setraw`.
+    """
+    parse_state = ParseState(iter(lines), store.create_unit)
     unit = parse_header(parse_state, store)
+    if unit is None or parse_state.eof:
+        yield from _iter_remaining_units(parse_state, unit)
+        return
+    unit.infer_state()
+    yield unit
+    lineno = parse_state.lineno - 1
+    remaining = b"".join(lines[lineno:])
+    # the regular expressions only know about "\n" newlines
+    if newline == b"\r" or remaining.count(b"\n") != remaining.count(newline):
+        yield from _iter_remaining_units(parse_state, parse_unit(parse_state))
+        return
+    text = parse_state.decode(remaining)
+    pos = 0
+    while True:
+        match = ENTRY_REGEX.match(text, pos)
+        if match is not None:
+            unit = build_unit(match, store.create_unit)
+            unit.infer_state()
+            if raw:
+                entry = match.group("entry").rstrip() + "\n"
+                if is_canonical(entry, unit):
+                    unit.setraw(entry)
+            yield unit
+            lineno += text.count("\n", pos, match.end())
+            pos = match.end()
+            continue
+        if BLANK_REGEX.match(text, pos):
+            return
+        # parse the next unit with the state machine, and continue after it
+        parse_state = ParseState(
+            iter(lines[lineno:]), store.create_unit, parse_state.encoding
+        )
+        unit = parse_unit(parse_state)
+        if unit is None:
+            yield from _iter_remaining_units(parse_state, unit, lineno)
+            return
+        unit.infer_state()
+        yield unit
+        if parse_state.eof:
+            return
+        for i in range(parse_state.lineno - 1):
+            pos = text.index("\n", pos) + 1
+        lineno += parse_state.lineno - 1
+
+
+def _iter_remaining_units(parse_state, unit, lineno=0):
     while unit:
         unit.infer_state()
-        store.addunit(unit)
+        yield unit
         unit = parse_unit(parse_state)
     if not parse_state.eof:
-        raise ValueError(f"Syntax error on line {parse_state.lineno}")
+        raise ValueError(f"Syntax error on line {lineno + parse_state.lineno}")
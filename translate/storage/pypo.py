@@ -22,9 +22,11 @@ files (pofile).
 """
 
 import copy
+import itertools
 import logging
 import re
 import textwrap
+from contextlib import contextmanager
 
 from translate.misc import quote
 from translate.misc.multistring import multistring
@@ -43,22 +45,18 @@ po_unescape_map = {"\\r": "\r", "\\t": "\t", '\\"': '"', "\\n": "\n", "\\\\": "\
 po_escape_map = {value: key for (key, value) in po_unescape_map.items()}
 
 
-def splitlines(text):
-    """Split lines based on first newline char.
-
-    Can not use univerzal newlines as they match any newline like
-    character inside text and that breaks on files with unix newlines
-    and LF chars inside comments.
-
-    The code looks for first msgid and looks for newline used after it. This
-    should safely cover weird newlines used in comments or filenames, while
-    properly parsing po files with any newlines.
-    """
+def _strip_bom(text):
     # Strip UTF-8 BOM if present. This file would not be accepted
     # by gettext, but some editors might create it, so better handle it.
     if text[:3] == b"\xEF\xBB\xBF":
-        text = text[3:]
-    # Find first newline
+        return text[3:]
+    return text
+
+
+def _detect_newline(text):
+    """Returns the newline used after the first msgid in text, see
+    :func:`splitlines`.
+    """
     newline = b"\n"
     msgid_pos = max(0, text.find(b"msgid"))
     for i, ch in enumerate(text[msgid_pos:]):
@@ -71,10 +69,56 @@ def splitlines(text):
             else:
                 newline = b"\r"
             break
+    return newline
 
+
+def splitlines(text):
+    """Split lines based on first newline char.
+
+    Can not use univerzal newlines as they match any newline like
+    character inside text and that breaks on files with unix newlines
+    and LF chars inside comments.
+
+    The code looks for first msgid and looks for newline used after it. This
+    should safely cover weird newlines used in comments or filenames, while
+    properly parsing po files with any newlines.
+    """
+    text = _strip_bom(text)
+    newline = _detect_newline(text)
     return [x + newline for x in text.split(newline)]
 
 
+def iterlines(fileobj):
+    """Yields the same lines as :func:`splitlines` for the contents of the
+    binary file object, reading it line by line.
+
+    Only the lines up to the first msgid are read ahead to detect the
+    newline. Files with ``\\r`` newlines can't be read by line, and are read
+    completely instead.
+    """
+    head = []
+    for line in fileobj:
+        head.append(line)
+        if b"msgid" in line:
+            break
+    if not head:
+        yield b"\n"
+        return
+    head[0] = _strip_bom(head[0])
+    newline = _detect_newline(b"".join(head))
+    if newline == b"\r":
+        yield from splitlines(b"".join(head) + fileobj.read())
+        return
+    pending = b""
+    for line in itertools.chain(head, fileobj):
+        # join lines that were split on a "\n" that isn't the newline
+        pending += line
+        if pending.endswith(newline):
+            yield pending
+            pending = b""
+    yield pending + newline
+
+
 def escapeforpo(line):
     """Escapes a line for po format. assumes no \n occurs in the line.
 
@@ -195,6 +239,27 @@ def unquotefrompo(postr):
     return "".join([unescape(line[1:-1]) for line in postr])
 
 
+def _flatten(parts):
+    """Returns the lists and dictionaries of lists in parts as one tuple, so
+    that changes to them can be detected by comparing.
+    """
+    flat = []
+    for part in parts:
+        if isinstance(part, dict):
+            flat.append(dict)
+            flat.append(len(part))
+            for key, value in part.items():
+                flat.append(key)
+                flat.append(len(value))
+                flat.extend(value)
+        elif isinstance(part, list):
+            flat.append(len(part))
+            flat.extend(part)
+        else:
+            flat.append(part)
+    return tuple(flat)
+
+
 def is_null(lst):
     return lst == [] or len(lst) == 1 and lst[0] == '""'
 
@@ -236,6 +301,11 @@ class pounit(pocommon.pounit):
         self.msgid_pluralcomments = []
         self.msgid_plural = []
         self.msgstr = []
+        # decoded strings, see _decoded()
+        self._decoded_source = None
+        self._decoded_target = None
+        # the text this unit was parsed from, see setraw()
+        self._raw = None
         super().__init__(source)
 
     def _initallcomments(self, blankall=False):
@@ -284,10 +354,30 @@ class pounit(pocommon.pounit):
             msgid_plural = []
         return msgid, msgid_plural
 
+    def _decoded(self, name, key, decode):
+        """Returns the strings decode() returns, which are recalculated only
+        when key, a tuple of the quoted lines they come from, changes.
+        """
+        cached = getattr(self, name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        strings = decode()
+        setattr(self, name, (key, strings))
+        return strings
+
     @property
     def source(self):
         """Returns the unescaped msgid"""
-        return self._get_source_vars(self.msgid, self.msgid_plural)
+        # tuples are used for the cache, as the garbage collector stops
+        # tracking tuples of strings
+        strings = self._decoded(
+            "_decoded_source",
+            (tuple(self.msgid), tuple(self.msgid_plural)),
+            lambda: (unquotefrompo(self.msgid), unquotefrompo(self.msgid_plural)),
+        )
+        if self.hasplural():
+            return multistring(list(strings))
+        return strings[0]
 
     @source.setter
     def source(self, source):
@@ -315,8 +405,20 @@ class pounit(pocommon.pounit):
     def target(self):
         """Returns the unescaped msgstr"""
         if isinstance(self.msgstr, dict):
-            return multistring(list(map(unquotefrompo, self.msgstr.values())))
-        return unquotefrompo(self.msgstr)
+            return multistring(
+                list(
+                    self._decoded(
+                        "_decoded_target",
+                        tuple(
+                            (key, tuple(value)) for key, value in self.msgstr.items()
+                        ),
+                        lambda: tuple(map(unquotefrompo, self.msgstr.values())),
+                    )
+                )
+            )
+        return self._decoded(
+            "_decoded_target", tuple(self.msgstr), lambda: unquotefrompo(self.msgstr)
+        )
 
     @target.setter
     def target(self, target):
@@ -485,6 +587,7 @@ class pounit(pocommon.pounit):
                 for item in list2:
                     splitlist2.extend(item.split()[1:])
                     prefix = item.split()[0]
+                splitlist1 = set(splitlist1)
                 list1.extend(
                     [
                         f"{prefix} {item}{lineend}"
@@ -495,12 +598,14 @@ class pounit(pocommon.pounit):
             else:
                 # Normal merge, but conform to list1 newline style
                 if list1 != list2:
+                    items1 = set(list1)
                     for item in list2:
                         if lineend:
                             item = item.rstrip() + lineend
                         # avoid duplicate comment lines (this might cause some problems)
-                        if item not in list1 or len(item) < 5:
+                        if item not in items1 or len(item) < 5:
                             list1.append(item)
+                            items1.add(item)
 
         if not isinstance(otherpo, pounit):
             super().merge(otherpo, overwrite, comments)
@@ -706,8 +811,58 @@ class pounit(pocommon.pounit):
         """Convert to a string."""
         return self._getoutput()
 
+    def _getstate(self):
+        """Returns the parts of this unit that are written to a file as one
+        tuple, which is compared to find out whether the unit was changed.
+        """
+        msgstr = self.msgstr
+        if isinstance(msgstr, dict):
+            msgstr = _flatten((msgstr,))
+        # this is done for every unit that is written, so the lists are
+        # unpacked directly instead of with _flatten()
+        return (
+            self.obsolete,
+            len(self.othercomments),
+            *self.othercomments,
+            len(self.automaticcomments),
+            *self.automaticcomments,
+            len(self.sourcecomments),
+            *self.sourcecomments,
+            len(self.typecomments),
+            *self.typecomments,
+            len(self.msgidcomments),
+            *self.msgidcomments,
+            len(self.prev_msgctxt),
+            *self.prev_msgctxt,
+            len(self.prev_msgid),
+            *self.prev_msgid,
+            len(self.prev_msgid_plural),
+            *self.prev_msgid_plural,
+            len(self.msgctxt),
+            *self.msgctxt,
+            len(self.msgid),
+            *self.msgid,
+            len(self.msgid_pluralcomments),
+            *self.msgid_pluralcomments,
+            len(self.msgid_plural),
+            *self.msgid_plural,
+            len(msgstr),
+            *msgstr,
+        )
+
+    def setraw(self, text):
+        """Keeps the text this unit was parsed from, which must be what
+        :meth:`_getoutput` returns for it. It is returned instead of
+        generating the output again as long as the unit isn't changed.
+        """
+        self._raw = (text, self._getstate())
+
     def _getoutput(self):
         """return this po element as a string"""
+        if self._raw is not None:
+            if self._raw[1] == self._getstate():
+                return self._raw[0]
+            self._raw = None
 
         def add_prev_msgid_lines(lines, prefix, header, var):
             if var:
@@ -835,6 +990,12 @@ class pofile(pocommon.pofile):
     """A .po file containing various units"""
 
     UnitClass = pounit
+    #: Whether to parse with :func:`~translate.storage.poparser.iter_units_regex`
+    #: instead of only the line by line state machine.
+    regex_parser = True
+    #: Whether parsed units keep their text to write it again unless they are
+    #: changed, see :meth:`pounit.setraw`. This needs the regex_parser.
+    raw_units = False
 
     def __init__(self, inputfile=None, width=None, **kwargs):
         wrapargs = {}
@@ -854,10 +1015,19 @@ class pofile(pocommon.pofile):
             self.filename = ""
         if not isinstance(input, bytes):
             input = input.read()
-        input = iter(splitlines(input))
+        input = _strip_bom(input)
+        newline = _detect_newline(input)
+        lines = [x + newline for x in input.split(newline)]
         # clear units to get rid of automatically generated headers before parsing
         self.units = []
-        poparser.parse_units(poparser.ParseState(input, self.create_unit), self)
+        if self.regex_parser:
+            units = poparser.iter_units_regex(lines, newline, self, self.raw_units)
+        else:
+            units = poparser.iter_units(
+                poparser.ParseState(iter(lines), self.create_unit), self
+            )
+        for unit in units:
+            self.addunit(unit)
 
     def removeduplicates(self, duplicatestyle="merge"):
         """Make sure each msgid is unique ; merge comments etc from
@@ -867,38 +1037,38 @@ class pofile(pocommon.pofile):
         # about files already containing msgctxt? - test
         id_dict = {}
         uniqueunits = []
-        # TODO: this is using a list as the pos aren't hashable, but this is slow.
-        # probably not used frequently enough to worry about it, though.
-        markedpos = []
+        # the identities of the units that got their locations added, units
+        # themselves aren't hashable
+        markedpos = set()
 
         def addcomment(thepo):
             thepo.msgidcomments.append('"_: %s\\n"' % " ".join(thepo.getlocations()))
-            markedpos.append(thepo)
+            markedpos.add(id(thepo))
 
         for thepo in self.units:
-            id = thepo.getid()
+            unitid = thepo.getid()
             if thepo.isheader() and not thepo.getlocations():
                 # header msgids shouldn't be merged...
                 uniqueunits.append(thepo)
-            elif id in id_dict:
+            elif unitid in id_dict:
                 if duplicatestyle == "merge":
-                    if id:
-                        id_dict[id].merge(thepo)
+                    if unitid:
+                        id_dict[unitid].merge(thepo)
                     else:
                         addcomment(thepo)
                         uniqueunits.append(thepo)
                 elif duplicatestyle == "msgctxt":
-                    origpo = id_dict[id]
-                    if origpo not in markedpos and id:
+                    origpo = id_dict[unitid]
+                    if id(origpo) not in markedpos and unitid:
                         # if it doesn't have an id, we already added msgctxt
                         origpo.msgctxt.append(
                             '"%s"' % escapeforpo(" ".join(origpo.getlocations()))
                         )
-                        markedpos.append(thepo)
+                        markedpos.add(id(origpo))
                     thepo.msgctxt.append(
                         '"%s"' % escapeforpo(" ".join(thepo.getlocations()))
                     )
-                    if not thepo.msgctxt == id_dict[id].msgctxt:
+                    if not thepo.msgctxt == origpo.msgctxt:
                         uniqueunits.append(thepo)
                     else:
                         logger.warning(
@@ -907,33 +1077,41 @@ class pofile(pocommon.pofile):
                             thepo.source,
                         )
             else:
-                if not id:
+                if not unitid:
                     if duplicatestyle == "merge":
                         addcomment(thepo)
                     else:
                         thepo.msgctxt.append(
                             '"%s"' % escapeforpo(" ".join(thepo.getlocations()))
                         )
-                id_dict[id] = thepo
+                id_dict[unitid] = thepo
                 uniqueunits.append(thepo)
         self.units = uniqueunits
 
     def serialize(self, out):
         """Write to file"""
-        at_start = True
+        # units are joined and encoded in chunks, which is faster than one at
+        # a time without holding the whole file in memory twice
+        chunksize = 1000
         try:
-            for unit in self.units:
-                if not at_start:
-                    out.write(b"\n")
-                else:
-                    at_start = False
-                out.write(unit._getoutput().encode(self.encoding))
+            for start in range(0, len(self.units), chunksize):
+                output = "\n".join(
+                    [
+                        unit._getoutput()
+                        for unit in self.units[start : start + chunksize]
+                    ]
+                )
+                if start:
+                    output = "\n" + output
+                out.write(output.encode(self.encoding))
         except UnicodeEncodeError:
             if self.encoding == "utf-8":
                 raise
             self.updateheader(add=True, Content_Type="text/plain; charset=UTF-8")
             self.encoding = "utf-8"
+            # earlier chunks were written in the old encoding
             out.seek(0)
+            out.truncate()
             self.serialize(out)
 
     def unit_iter(self):
@@ -944,3 +1122,33 @@ class pofile(pocommon.pofile):
     def addunit(self, unit):
         unit.wrapper = self.wrapper
         super().addunit(unit)
+
+
+@contextmanager
+def keep_raw_units(enabled=True):
+    """Sets :attr:`pofile.raw_units` for the stores parsed in the ``with``
+    block, and restores the previous value afterwards.
+    """
+    previous = pofile.raw_units
+    pofile.raw_units = enabled
+    try:
+        yield
+    finally:
+        pofile.raw_units = previous
+
+
+def iterparse(fileobj, store=None):
+    """Yields the units of a PO file one at a time, without keeping the file
+    or the units in memory.
+
+    :param fileobj: A binary file object, read line by line.
+    :param store: The :class:`pofile` the units belong to, its encoding is
+                  set from the header. The units aren't added to its units.
+    """
+    if store is None:
+        store = pofile()
+    for unit in poparser.iter_units(
+        poparser.ParseState(iterlines(fileobj), store.create_unit), store
+    ):
+        unit._store = store
+        yield unit
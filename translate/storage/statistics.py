@@ -106,7 +106,7 @@ class Statistics:
 
     def wordcount(self, text):
         """Returns the number of words in the given text."""
-        return len(self.language.words(text))
+        return self.language.wordcount(text)
 
     def source_wordcount(self):
         """Returns the number of words in the source text."""
@@ -170,15 +170,24 @@ class Statistics:
 
     def countwords(self):
         """Counts the source and target words in each of the units."""
-        self.sourcewordcounts = []
-        self.targetwordcounts = []
+        sourcestrings = []
+        targetstrings = []
         for unit in self.unit_iter():
-            self.sourcewordcounts.append(
-                [self.wordcount(text) for text in getattr(unit.source, "strings", [""])]
-            )
-            self.targetwordcounts.append(
-                [self.wordcount(text) for text in getattr(unit.target, "strings", [""])]
+            sourcestrings.append(getattr(unit.source, "strings", [""]))
+            targetstrings.append(getattr(unit.target, "strings", [""]))
+        self.sourcewordcounts = self.batchwordcounts(sourcestrings)
+        self.targetwordcounts = self.batchwordcounts(targetstrings)
+
+    def batchwordcounts(self, stringlists):
+        """Returns the number of words in each string of each of the lists
+        of strings, with a single call to the word counter.
+        """
+        counts = iter(
+            self.language.wordcounts(
+                [text for strings in stringlists for text in strings]
             )
+        )
+        return [[next(counts) for text in strings] for strings in stringlists]
 
     def reclassifyunit(self, item):
         """Updates the classification of a unit in self.classification.
@@ -255,6 +255,19 @@ class TestPYPOFile(test_po.TestPOFile):
         assert str(pofile.units[0]).count("source1") == 2
         assert str(pofile.units[1]).count("source2") == 2
 
+    def test_merge_duplicates_msgctxt_repeated(self):
+        """checks that the original of many duplicates gets its location as
+        msgctxt only once
+        """
+        posource = "".join(
+            '#: source%d\nmsgid "test me"\nmsgstr ""\n\n' % i for i in range(4)
+        )
+        pofile = self.poparse(posource)
+        pofile.removeduplicates("msgctxt")
+        assert len(pofile.units) == 4
+        for i, unit in enumerate(pofile.units):
+            assert unit.msgctxt == ['"source%d"' % i]
+
     def test_merge_blanks(self):
         """checks that merging adds msgid_comments to blanks"""
         posource = (
@@ -572,3 +585,180 @@ This is just a random text file.
 """
         with raises(ValueError):
             self.poparse(posource)
+
+    def test_iterlines(self):
+        """checks that reading lines matches splitting the whole file"""
+        for posource in (
+            b"",
+            b'msgid "test me"\nmsgstr ""',
+            b'\xef\xbb\xbf# comment\r\nmsgid "a\nb"\r\nmsgstr ""\r\n',
+            b'\rmsgid "test me"\rmsgstr ""\r',
+            b"# no msgid\n# comment\n",
+        ):
+            lines = list(pypo.iterlines(BytesIO(posource)))
+            assert lines == pypo.splitlines(posource)
+
+    def test_iterparse(self):
+        """checks that units are parsed one at a time with the header
+        charset
+        """
+        posource = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=ISO-8859-1\\n"
+
+#: test.c
+msgid "Café"
+msgstr "Kafee"
+
+msgid "file"
+msgid_plural "files"
+msgstr[0] "lêer"
+msgstr[1] "lêers"
+
+#~ msgid "old"
+#~ msgstr "oud"
+""".encode(
+            "iso-8859-1"
+        )
+        store = self.StoreClass()
+        units = pypo.iterparse(BytesIO(posource), store)
+        assert next(units).isheader()
+        assert store.encoding == "ISO-8859-1"
+        units = list(units)
+        assert [str(unit) for unit in units] == [
+            str(unit) for unit in self.poparse(posource).units[1:]
+        ]
+        assert units[0].source == "Café"
+        assert units[2].isobsolete()
+        assert not any(unit in store.units for unit in units)
+
+        with raises(ValueError):
+            list(pypo.iterparse(BytesIO(b'msgid "a"\nmsgstr ""\n\nEXTRA\n')))
+
+    def test_regex_parser(self):
+        """checks that the regular expression parser gives the same units as
+        the state machine, also where it falls back to it
+        """
+        posource = b"""msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+# translator comment
+#. automatic comment
+#: test.c:1
+#, fuzzy
+msgctxt "context"
+msgid "test"
+"  continued"
+msgstr "toets" trailing
+
+  "indented continuation"
+
+#| msgid "previous"
+msgid "file"
+msgid_plural "files"
+msgstr[0] "l\xc3\xaaer"
+msgstr[1] "l\xc3\xaaers"
+
+msgid "_: KDE comment\\n"
+"source"
+msgstr "bron"
+
+msgid "unterminated
+msgstr "x"
+
+#~ msgid "obsolete"
+#~ msgstr "verouderd"
+"""
+
+        def parse(source, regex_parser):
+            store = self.StoreClass()
+            store.regex_parser = regex_parser
+            store.parse(source)
+            return [
+                (str(unit), unit.msgidcomments, unit.isfuzzy()) for unit in store.units
+            ]
+
+        for source in (posource, posource.replace(b"\n", b"\r\n")):
+            units = parse(source, True)
+            assert units == parse(source, False)
+            assert len(units) == 6
+        broken = posource[:200] + b"\nEXTRA\n"
+        with raises(ValueError) as expected:
+            parse(broken, False)
+        with raises(ValueError, match=str(expected.value)):
+            parse(broken, True)
+
+    def test_decoded_cache(self):
+        """checks that source and target follow changes to the quoted lines"""
+        unit = self.poparse('msgid "one"\nmsgid_plural "many"\nmsgstr[0] "een"\n')
+        unit = unit.units[0]
+        assert unit.source == "one"
+        assert unit.target == "een"
+        unit.msgstr[0] = ['"eén"']
+        unit.msgid_plural.append('" more"')
+        assert unit.target == "eén"
+        assert unit.source.strings == ["one", "many more"]
+        unit.target = ["een", "baie"]
+        assert unit.target.strings == ["een", "baie"]
+
+    def test_raw_units(self):
+        """checks that units keep their text only if it is written unchanged"""
+        posource = b"""msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+# comment
+#: test.c:1
+#, fuzzy
+msgctxt "context"
+msgid ""
+"test"
+msgstr "toets"
+
+#: test.c:1
+# comment
+msgid "test"
+msgstr "toets"  
+
+msgid "file"
+msgid_plural "files"
+msgstr[1] "l\xc3\xaaers"
+msgstr[0] "l\xc3\xaaer"
+
+msgid   "spaced"
+msgstr "x"
+
+msgid "empty"
+msgstr ""
+""
+""
+"""
+        store = self.StoreClass()
+        store.raw_units = True
+        store.parse(posource)
+        raw = [unit._raw is not None for unit in store.units]
+        assert raw == [False, True, False, False, False, False]
+        generated = self.StoreClass.parsestring(posource)
+        assert bytes(store) == bytes(generated)
+        unit = store.units[1]
+        unit.target = "verander"
+        assert unit._raw is not None
+        assert 'msgstr "verander"' in str(unit)
+        assert unit._raw is None
+
+    def test_keep_raw_units(self):
+        """checks that keep_raw_units restores the previous setting"""
+        posource = b"""msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+msgid "test"
+msgstr "toets"
+"""
+        with pypo.keep_raw_units():
+            assert self.StoreClass.parsestring(posource).units[1]._raw is not None
+            with pypo.keep_raw_units(False):
+                assert self.StoreClass.parsestring(posource).units[1]._raw is None
+            assert pypo.pofile.raw_units
+        assert not pypo.pofile.raw_units
@@ -0,0 +1,172 @@
+from translate.storage import po, tmdb
+
+
+class TestTMDB:
+    def build_tmdb(self, tmp_path, fulltext=True):
+        store = po.pofile()
+        for source, target in [
+            ("Open file", "Maak lêer oop"),
+            ("Open files", "Maak lêers oop"),
+            ("Open the selected files in a new window", "Maak die lêers oop"),
+            ("Close the selected files in this window", "Maak die lêers toe"),
+            ("Save", "Stoor"),
+        ]:
+            unit = store.addsourceunit(source)
+            unit.target = target
+        database = tmdb.TMDB(str(tmp_path / f"test-{fulltext}.tmdb"))
+        database.fulltext = fulltext
+        database.add_store(store, "en", "af")
+        return database
+
+    def test_translate_unit(self, tmp_path):
+        database = self.build_tmdb(tmp_path)
+        suggestions = database.translate_unit("Open file", "en", "af")
+        assert [unit["target"] for unit in suggestions] == [
+            "Maak lêer oop",
+            "Maak lêers oop",
+        ]
+        assert suggestions[0]["quality"] == 100
+        assert database.translate_unit("Nothing", "en", "af") == []
+
+    def test_translate_units(self, tmp_path):
+        for fulltext in (True, False):
+            database = self.build_tmdb(tmp_path, fulltext)
+            sources = [
+                "Open file",
+                "Open the selected files in the window",
+                "Save",
+                "Open file",
+                "Nothing",
+            ]
+            expected = [
+                database.translate_unit(source, "en", "af") for source in sources
+            ]
+            assert database.translate_units(sources, "en", "af") == expected
+            assert [len(suggestions) for suggestions in expected] == [2, 2, 1, 2, 0]
+            assert database.translate_units([], "en", "af") == []
+
+    def test_cache(self, tmp_path):
+        database = self.build_tmdb(tmp_path)
+        database.cache = tmdb.SuggestionCache(2)
+        suggestions = database.translate_unit("Open file", "en", "af")
+        assert database.translate_unit("Open file", "en", "af") == suggestions
+        database.translate_unit("Save", "en", "af")
+        assert database.cache.stats() == {
+            "size": 2,
+            "entries": 2,
+            "hits": 1,
+            "misses": 2,
+        }
+        # a translation outside the length window of the cached strings, or
+        # in another language, keeps them
+        database.add_dict(
+            {"source": "Open the files", "target": "Maak oop", "context": ""},
+            "en",
+            "af",
+        )
+        database.add_dict(
+            {"source": "Open a file", "target": "Ouvrir", "context": ""},
+            "en",
+            "fr",
+        )
+        assert len(database.cache) == 2
+        # a translation that could match removes only the affected string
+        database.add_dict(
+            {"source": "Open a file", "target": "Maak 'n lêer oop", "context": ""},
+            "en",
+            "af",
+        )
+        assert len(database.cache) == 1
+        assert len(database.translate_unit("Open file", "en", "af")) == 3
+        # the least recently used string is removed
+        database.translate_unit("Open files", "en", "af")
+        assert database.cache.get(database._cachekey("Save", "en", "af")) is None
+
+    def test_bulk_add(self, tmp_path):
+        units = [
+            {"source": "Open file", "target": "Maak lêer oop", "context": ""},
+            {"source": "Open file", "target": "Open lêer", "context": ""},
+            {"source": "Open file", "target": "Open", "context": "menu"},
+            {"source": "Save", "target": "Stoor", "context": ""},
+        ]
+        listed = tmdb.TMDB(str(tmp_path / "list.tmdb"))
+        listed.add_list(units, "en", "af")
+        bulk = tmdb.TMDB(str(tmp_path / "bulk.tmdb"), cache_size=10)
+        bulk.translate_unit("Save the selected files to a folder", "en", "af")
+        batches = [
+            (units[:2], "en", "af"),
+            (units, "en", "af"),
+            (units[:1], "fr", "af"),
+        ]
+        assert bulk.bulk_add(batches) == 7
+        assert len(bulk.cache) == 0
+        for database in (listed, bulk):
+            database.cursor.execute(
+                "SELECT s.text, s.context, s.lang, s.length, t.text, t.lang "
+                "FROM sources s JOIN targets t ON s.sid = t.sid ORDER BY t.tid"
+            )
+        rows = bulk.cursor.fetchall()
+        assert [row for row in rows if row[2] == "en"] == listed.cursor.fetchall()
+        assert len(rows) == 5
+        # the fulltext index and its triggers are restored
+        source = "Save the selected files to the folder"
+        bulk.add_dict({"source": source, "target": "Stoor", "context": ""}, "en", "af")
+        bulk.cursor.execute("SELECT COUNT(*) FROM fulltext")
+        assert bulk.cursor.fetchone() == (5,)
+        assert bulk.translate_unit("Save the selected files to a folder", "en", "af")
+
+    def test_bulk_add_pragmas(self, tmp_path):
+        database = tmdb.TMDB(str(tmp_path / "bulk.tmdb"))
+        units = [{"source": "Save", "target": "Stoor", "context": ""}]
+        pragmas = ("synchronous", "journal_mode", "temp_store", "cache_size")
+
+        def settings():
+            values = []
+            for pragma in pragmas:
+                database.cursor.execute("PRAGMA %s" % pragma)
+                values.append(database.cursor.fetchone())
+            return values
+
+        before = settings()
+        for unsafe in (False, True):
+            assert database.bulk_add([(units, "en", "af")], unsafe=unsafe) == 1
+            assert settings() == before
+
+    def test_languages(self, tmp_path):
+        database = self.build_tmdb(tmp_path)
+        database.add_dict(
+            {"source": "Open a file", "target": "Ouvrir", "context": ""}, "en", "fr"
+        )
+        suggestions = database.translate_unit("Open file", ["en", "de"], ["af", "fr"])
+        assert [unit["target"] for unit in suggestions] == [
+            "Maak lêer oop",
+            "Maak lêers oop",
+            "Ouvrir",
+        ]
+
+    def test_fulltext_modules(self, tmp_path, monkeypatch):
+        source = "Open the selected files in the window"
+        expected = self.build_tmdb(tmp_path).translate_unit(source, "en", "af")
+        assert len(expected) == 2
+        monkeypatch.setattr(tmdb.TMDB, "fulltext_modules", ("fts3(text)",))
+        (tmp_path / "fts3").mkdir()
+        database = self.build_tmdb(tmp_path / "fts3")
+        assert database.fulltext_module == "fts3"
+        assert database.translate_unit(source, "en", "af") == expected
+        # candidates fetched for a string that isn't looked up in the index
+        # are shared with the fulltext lookup
+        other = "Open it in a new window as is it ok"
+        assert database.translate_units([other, source], "en", "af") == [
+            database.translate_unit(other, "en", "af"),
+            expected,
+        ]
+        # an existing database keeps its fulltext module
+        database = tmdb.TMDB(str(tmp_path / "test-True.tmdb"))
+        assert database.fulltext_module == "fts5"
+
+    def test_max_fulltext_candidates(self, tmp_path):
+        database = self.build_tmdb(tmp_path)
+        source = "Open the selected files in the window"
+        database.max_fulltext_candidates = 1
+        suggestions = database.translate_unit(source, "en", "af")
+        assert [unit["target"] for unit in suggestions] == ["Maak die lêers oop"]
@@ -24,6 +24,8 @@ import math
 import re
 import threading
 import time
+from bisect import bisect_left
+from collections import OrderedDict
 from sqlite3 import dbapi2
 
 from translate.lang import data
@@ -41,14 +43,127 @@ class LanguageError(Exception):
         return str(self.value)
 
 
+class SuggestionCache:
+    """A bounded, thread-safe cache of the suggestions for the most recently
+    used strings.
+
+    Every entry remembers the languages and the range of source lengths its
+    suggestions were selected from, so that adding translations only removes
+    the entries they could have changed.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the suggestions cached for key, or *None*."""
+        if self.size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return [dict(suggestion) for suggestion in entry[-1]]
+
+    def put(self, key, source_langs, target_langs, minlen, maxlen, suggestions):
+        """Caches the suggestions for key, which were selected from sources
+        in source_langs with a length between minlen and maxlen.
+        """
+        if self.size <= 0:
+            return
+        entry = (
+            set(source_langs.split(",")),
+            set(target_langs.split(",")),
+            minlen,
+            maxlen,
+            [dict(suggestion) for suggestion in suggestions],
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, changes):
+        """Removes the entries that added translations could change.
+
+        :param changes: (source language, target language, source length)
+                        tuples of the added translations.
+        """
+        lengths = {}
+        for source_lang, target_lang, length in changes:
+            lengths.setdefault((source_lang, target_lang), []).append(length)
+        for changed in lengths.values():
+            changed.sort()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                source_langs, target_langs, minlen, maxlen = entry[:4]
+                for (source_lang, target_lang), changed in lengths.items():
+                    if source_lang in source_langs and target_lang in target_langs:
+                        index = bisect_left(changed, minlen)
+                        if index < len(changed) and changed[index] <= maxlen:
+                            del self._entries[key]
+                            break
+
+    def clear(self):
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns a dictionary with the size, number of entries, hits and
+        misses of the cache.
+        """
+        return {
+            "size": self.size,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
 class TMDB:
     _tm_dbs = {}
-
-    def __init__(self, db_file, max_candidates=3, min_similarity=75, max_length=1000):
+    #: The fulltext indexing modules to create a new fulltext table with, in
+    #: order of preference.
+    fulltext_modules = ("fts5(text, tokenize='trigram')", "fts5(text)", "fts3(text)")
+
+    def __init__(
+        self,
+        db_file,
+        max_candidates=3,
+        min_similarity=75,
+        max_length=1000,
+        cache_size=0,
+        max_fulltext_candidates=100,
+    ):
+        """cache_size is the number of strings to keep the suggestions of in
+        :attr:`cache`. Translations added through this instance update the
+        cache, so it shouldn't be used while the database is also changed
+        elsewhere.
+
+        With an FTS5 fulltext index, only the max_fulltext_candidates sources
+        ranked best by ``bm25()`` are compared to long strings, or all of
+        them if it is 0.
+        """
 
         self.max_candidates = max_candidates
         self.min_similarity = min_similarity
         self.max_length = max_length
+        self.max_fulltext_candidates = max_fulltext_candidates
+        self.cache = SuggestionCache(cache_size)
+        # added translations that aren't committed yet, see SuggestionCache
+        self._changes = set()
 
         if not isinstance(db_file, str):
             db_file = str(db_file)  # don't know which encoding
@@ -61,6 +176,7 @@ class TMDB:
         # FIXME: do we want to do any checks before we initialize the DB?
         self.init_database()
         self.fulltext = False
+        self.fulltext_module = None
         self.init_fulltext()
 
         self.comparer = LevenshteinComparer(self.max_length)
@@ -116,48 +232,58 @@ CREATE UNIQUE INDEX IF NOT EXISTS targets_uniq_idx ON targets (sid, text, lang);
             raise
 
     def init_fulltext(self):
-        """detects if fts3 fulltext indexing module exists, initializes fulltext table if it does"""
+        """detects the best available fulltext indexing module, initializes
+        the fulltext table if there is one
+
+        The modules in :attr:`fulltext_modules` are tried in order. A
+        database that already has a fulltext table keeps using its module.
+        """
 
-        # HACKISH: no better way to detect fts3 support except trying to
-        # construct a dummy table?!
         try:
-            script = """
-DROP TABLE IF EXISTS test_for_fts3;
-CREATE VIRTUAL TABLE test_for_fts3 USING fts3;
-DROP TABLE test_for_fts3;
+            self.cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'fulltext'")
+            row = self.cursor.fetchone()
+            if row:
+                logging.debug("fulltext table already exists")
+                module = "fts5" if "fts5" in row[0].lower() else "fts3"
+            else:
+                for module in self.fulltext_modules:
+                    # HACKISH: no better way to detect module support except
+                    # trying to construct a dummy table?!
+                    script = (
+                        """
+DROP TABLE IF EXISTS test_for_fts;
+CREATE VIRTUAL TABLE test_for_fts USING %s;
+DROP TABLE test_for_fts;
 """
-            self.cursor.executescript(script)
-            logging.debug("fts3 supported")
-            # for some reason CREATE VIRTUAL TABLE doesn't support IF NOT
-            # EXISTS syntax check if fulltext index table exists manually
-            self.cursor.execute(
-                "SELECT name FROM sqlite_master WHERE name = 'fulltext'"
-            )
-            if not self.cursor.fetchone():
+                        % module
+                    )
+                    try:
+                        self.cursor.executescript(script)
+                        break
+                    except dbapi2.OperationalError as e:
+                        logging.debug("%s not supported: %s", module, e)
+                else:
+                    raise dbapi2.OperationalError("no fulltext module supported")
                 # create fulltext index table, and index all strings in sources
-                script = """
-CREATE VIRTUAL TABLE fulltext USING fts3(text);
-"""
-                logging.debug("fulltext table not exists, creating")
-                self.cursor.executescript(script)
+                logging.debug("fulltext table not exists, creating with %s", module)
+                self.cursor.execute("CREATE VIRTUAL TABLE fulltext USING %s" % module)
                 logging.debug("created fulltext table")
-            else:
-                logging.debug("fulltext table already exists")
+            self.fulltext_module = module.split("(")[0]
 
             # create triggers that would sync sources table with fulltext index
             script = """
 INSERT INTO fulltext (rowid, text) SELECT sid, text FROM sources WHERE sid NOT IN (SELECT rowid FROM fulltext);
 CREATE TRIGGER IF NOT EXISTS sources_insert_trig AFTER INSERT ON sources FOR EACH ROW
 BEGIN
-    INSERT INTO fulltext (docid, text) VALUES (NEW.sid, NEW.text);
+    INSERT INTO fulltext (rowid, text) VALUES (NEW.sid, NEW.text);
 END;
 CREATE TRIGGER IF NOT EXISTS sources_update_trig AFTER UPDATE OF text ON sources FOR EACH ROW
 BEGIN
-    UPDATE fulltext SET text = NEW.text WHERE docid = NEW.sid;
+    UPDATE fulltext SET text = NEW.text WHERE rowid = NEW.sid;
 END;
 CREATE TRIGGER IF NOT EXISTS sources_delete_trig AFTER DELETE ON sources FOR EACH ROW
 BEGIN
-    DELETE FROM fulltext WHERE docid = OLD.sid;
+    DELETE FROM fulltext WHERE rowid = OLD.sid;
 END;
 """
             self.cursor.executescript(script)
@@ -167,7 +293,8 @@ END;
 
         except dbapi2.OperationalError as e:
             self.fulltext = False
-            logging.debug("failed to initialize fts3 support: " + str(e))
+            self.fulltext_module = None
+            logging.debug("failed to initialize fulltext support: " + str(e))
             script = """
 DROP TRIGGER IF EXISTS sources_insert_trig;
 DROP TRIGGER IF EXISTS sources_update_trig;
@@ -180,7 +307,7 @@ DROP TRIGGER IF EXISTS sources_delete_trig;
         performance
         """
         if self.fulltext:
-            query = """SELECT COUNT(*) FROM sources s JOIN fulltext f ON s.sid = f.docid JOIN targets t on s.sid = t.sid"""
+            query = """SELECT COUNT(*) FROM sources s JOIN fulltext f ON s.sid = f.rowid JOIN targets t on s.sid = t.sid"""
         else:
             query = """SELECT COUNT(*) FROM sources s JOIN targets t on s.sid = t.sid"""
         self.cursor.execute(query)
@@ -236,12 +363,13 @@ DROP TRIGGER IF EXISTS sources_delete_trig;
                     "INSERT INTO targets (sid, text, lang, time) VALUES (?, ?, ?, ?)",
                     (sid, unit["target"], target_lang, int(time.time())),
                 )
+                self._changes.add((source_lang, target_lang, len(unit["source"])))
             except dbapi2.IntegrityError:
                 # target string already exists in db, do nothing
                 pass
 
             if commit:
-                self.connection.commit()
+                self.commit()
         except Exception:
             if commit:
                 self.connection.rollback()
@@ -255,7 +383,7 @@ DROP TRIGGER IF EXISTS sources_delete_trig;
                 self.add_unit(unit, source_lang, target_lang, commit=False)
                 count += 1
         if commit:
-            self.connection.commit()
+            self.commit()
         return count
 
     def add_list(self, units, source_lang, target_lang, commit=True):
@@ -267,11 +395,111 @@ DROP TRIGGER IF EXISTS sources_delete_trig;
             self.add_dict(unit, source_lang, target_lang, commit=False)
             count += 1
         if commit:
+            self.commit()
+        return count
+
+    def bulk_add(self, batches, unsafe=False):
+        """insert batches of units represented as dictionaries into the
+        database, which is much faster than :meth:`add_list` for many units
+
+        The units are staged in a temporary table and inserted with a few
+        set based queries per batch. The fulltext index is only updated at the
+        end.
+
+        :param batches: An iterable of (units, source_lang, target_lang)
+                        tuples.
+        :param unsafe: Whether to keep the journal in memory and not sync
+                       the database to disk during the load, which is faster,
+                       but the database might get corrupted if the load is
+                       interrupted by a crash. Only use this for a new
+                       database.
+        :return: The number of units.
+        """
+        count = 0
+        self.connection.commit()
+        cursor = self.cursor
+        pragmas = {}
+        settings = {"temp_store": "MEMORY", "cache_size": "-65536"}
+        if unsafe:
+            settings.update(synchronous="OFF", journal_mode="MEMORY")
+        for pragma, value in settings.items():
+            cursor.execute("PRAGMA %s" % pragma)
+            (pragmas[pragma],) = cursor.fetchone()
+            cursor.execute("PRAGMA %s = %s" % (pragma, value))
+        if self.fulltext:
+            cursor.executescript(
+                """
+DROP TRIGGER IF EXISTS sources_insert_trig;
+DROP TRIGGER IF EXISTS sources_update_trig;
+DROP TRIGGER IF EXISTS sources_delete_trig;
+"""
+            )
+        cursor.execute(
+            """CREATE TEMP TABLE IF NOT EXISTS staging (
+       text VARCHAR NOT NULL,
+       context VARCHAR DEFAULT NULL,
+       target VARCHAR NOT NULL
+)"""
+        )
+        try:
+            for units, source_lang, target_lang in batches:
+                source_lang = data.normalize_code(source_lang)
+                target_lang = data.normalize_code(target_lang)
+                cursor.executemany(
+                    "INSERT INTO staging (text, context, target) VALUES (?, ?, ?)",
+                    (
+                        (unit["source"], unit["context"], unit["target"])
+                        for unit in units
+                    ),
+                )
+                count += cursor.rowcount
+                cursor.execute(
+                    """INSERT OR IGNORE INTO sources (text, context, lang, length)
+                    SELECT DISTINCT text, context, ?, length(text) FROM staging""",
+                    (source_lang,),
+                )
+                cursor.execute(
+                    """INSERT OR IGNORE INTO targets (sid, text, lang, time)
+                    SELECT s.sid, st.target, ?, ? FROM staging st JOIN sources s
+                    ON s.text = st.text AND s.context IS st.context AND s.lang = ?
+                    ORDER BY st.rowid""",
+                    (target_lang, int(time.time()), source_lang),
+                )
+                cursor.execute("DELETE FROM staging")
             self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.execute("DROP TABLE IF EXISTS temp.staging")
+            if self.fulltext:
+                # index the new sources and restore the triggers
+                self.init_fulltext()
+            for pragma, value in pragmas.items():
+                cursor.execute("PRAGMA %s = %s" % (pragma, value))
+            self.cache.clear()
         return count
 
+    def commit(self):
+        """commits the added units, and removes the suggestions they change
+        from the cache
+        """
+        self.connection.commit()
+        if self._changes:
+            changes, self._changes = self._changes, set()
+            self.cache.invalidate(changes)
+
     def translate_unit(self, unit_source, source_langs, target_langs):
         """return TM suggestions for unit_source"""
+        return self.translate_units([unit_source], source_langs, target_langs)[0]
+
+    def translate_units(self, unit_sources, source_langs, target_langs, lookup=None):
+        """return TM suggestions for every string in unit_sources
+
+        The suggestions are taken from :attr:`cache` where possible, the
+        others are looked up with :meth:`lookup_units`, or the optional lookup
+        function taking the same arguments.
+        """
         if isinstance(source_langs, list):
             source_langs = [data.normalize_code(lang) for lang in source_langs]
             source_langs = ",".join(source_langs)
@@ -283,48 +511,276 @@ DROP TRIGGER IF EXISTS sources_delete_trig;
         else:
             target_langs = data.normalize_code(target_langs)
 
-        minlen = min_levenshtein_length(len(unit_source), self.min_similarity)
-        maxlen = max_levenshtein_length(
-            len(unit_source), self.min_similarity, self.max_length
+        suggestions = {}
+        missing = []
+        for unit_source in dict.fromkeys(unit_sources):
+            cached = self.cache.get(
+                self._cachekey(unit_source, source_langs, target_langs)
+            )
+            if cached is None:
+                missing.append(unit_source)
+            else:
+                suggestions[unit_source] = cached
+        if missing:
+            if lookup is None:
+                lookup = self.lookup_units
+            found = lookup(missing, source_langs, target_langs)
+            for unit_source, results in zip(missing, found):
+                suggestions[unit_source] = results
+                self.cache.put(
+                    self._cachekey(unit_source, source_langs, target_langs),
+                    source_langs,
+                    target_langs,
+                    min_levenshtein_length(len(unit_source), self.min_similarity),
+                    max_levenshtein_length(
+                        len(unit_source), self.min_similarity, self.max_length
+                    ),
+                    results,
+                )
+        return [suggestions[unit_source] for unit_source in unit_sources]
+
+    def _cachekey(self, unit_source, source_langs, target_langs):
+        return (
+            unit_source,
+            source_langs,
+            target_langs,
+            self.min_similarity,
+            self.max_candidates,
+            self.max_length,
         )
 
-        # split source into words, remove punctuation and special
-        # chars, keep words that are at least 3 chars long
-        unit_words = STRIP_REGEXP.sub(" ", unit_source).split()
-        unit_words = list(filter(lambda word: len(word) > 2, unit_words))
-
-        if self.fulltext and len(unit_words) > 3:
-            logging.debug("fulltext matching")
-            query = """SELECT s.text, t.text, s.context, s.lang, t.lang FROM sources s JOIN targets t ON s.sid = t.sid JOIN fulltext f ON s.sid = f.docid
-                       WHERE s.lang IN (?) AND t.lang IN (?) AND s.length BETWEEN ? AND ?
-                       AND fulltext MATCH ?"""
-            search_str = " OR ".join(unit_words)
-            self.cursor.execute(
-                query, (source_langs, target_langs, minlen, maxlen, search_str)
+    def lookup_units(self, unit_sources, source_langs, target_langs):
+        """return TM suggestions for every string in unit_sources, without
+        using the cache. The languages are comma separated normalized codes.
+
+        The candidates are fetched from the database once for all the strings:
+        strings that aren't looked up in the fulltext index and have
+        overlapping length windows share a single query. Strings looked up in
+        the fulltext index get a query of their own, which with an FTS5 index
+        only returns the best ranked candidates.
+        """
+        unique_sources = list(dict.fromkeys(unit_sources))
+        source_langs = source_langs.split(",")
+        target_langs = target_langs.split(",")
+        windows = {}
+        words = {}
+        for unit_source in unique_sources:
+            windows[unit_source] = (
+                min_levenshtein_length(len(unit_source), self.min_similarity),
+                max_levenshtein_length(
+                    len(unit_source), self.min_similarity, self.max_length
+                ),
             )
-        else:
-            logging.debug("nonfulltext matching")
-            query = """SELECT s.text, t.text, s.context, s.lang, t.lang FROM sources s JOIN targets t ON s.sid = t.sid
-            WHERE s.lang IN (?) AND t.lang IN (?)
-            AND s.length >= ? AND s.length <= ?"""
-            self.cursor.execute(query, (source_langs, target_langs, minlen, maxlen))
-
-        results = []
-        for row in self.cursor:
-            quality = self.comparer.similarity(unit_source, row[0], self.min_similarity)
-            if quality >= self.min_similarity:
-                results.append(
-                    {
-                        "source": row[0],
-                        "target": row[1],
-                        "context": row[2],
-                        "quality": quality,
-                    }
+            # split source into words, remove punctuation and special
+            # chars, keep words that are at least 3 chars long
+            unit_words = STRIP_REGEXP.sub(" ", unit_source).split()
+            unit_words = list(filter(lambda word: len(word) > 2, unit_words))
+            if self.fulltext and len(unit_words) > 3:
+                words[unit_source] = unit_words
+        candidates, lengths = self._fetch_candidates(
+            [
+                window
+                for unit_source, window in windows.items()
+                if unit_source not in words
+            ],
+            source_langs,
+            target_langs,
+        )
+
+        suggestions = {}
+        for unit_source in unique_sources:
+            minlen, maxlen = windows[unit_source]
+            if unit_source in words:
+                if self.fulltext_module == "fts5":
+                    logging.debug("ranked fulltext matching")
+                    sids = self._rank_candidates(
+                        words[unit_source], minlen, maxlen, source_langs, target_langs
+                    )
+                else:
+                    logging.debug("fulltext matching")
+                    sids = self._match_candidates(
+                        words[unit_source],
+                        minlen,
+                        maxlen,
+                        source_langs,
+                        target_langs,
+                        candidates,
+                    )
+                self._fetch_sids(
+                    [sid for sid in sids if sid not in candidates],
+                    source_langs,
+                    target_langs,
+                    candidates,
+                )
+                sids = sorted(
+                    sid
+                    for sid in sids
+                    if sid in candidates and minlen <= candidates[sid][2] <= maxlen
                 )
-        results.sort(key=lambda match: match["quality"], reverse=True)
-        results = results[: self.max_candidates]
-        logging.debug("results: %s", str(results))
-        return results
+            else:
+                logging.debug("nonfulltext matching")
+                sids = [
+                    sid
+                    for length in range(minlen, maxlen + 1)
+                    for sid in lengths.get(length, ())
+                ]
+
+            results = []
+            for sid in sids:
+                text, context, length, targets = candidates[sid]
+                quality = self.comparer.similarity(
+                    unit_source, text, self.min_similarity
+                )
+                if quality >= self.min_similarity:
+                    for target in targets:
+                        results.append(
+                            {
+                                "source": text,
+                                "target": target,
+                                "context": context,
+                                "quality": quality,
+                            }
+                        )
+            results.sort(key=lambda match: match["quality"], reverse=True)
+            results = results[: self.max_candidates]
+            logging.debug("results: %s", str(results))
+            suggestions[unit_source] = results
+        return [suggestions[unit_source] for unit_source in unit_sources]
+
+    def _rank_candidates(self, words, minlen, maxlen, source_langs, target_langs):
+        """Returns the sids of the sources in the length window containing
+        any of words, ranked by ``bm25()`` and limited to
+        :attr:`max_fulltext_candidates`.
+        """
+        query = """SELECT s.sid FROM fulltext JOIN sources s ON s.sid = fulltext.rowid
+        WHERE fulltext MATCH ? AND s.lang IN (%s)
+        AND s.length >= ? AND s.length <= ?
+        AND EXISTS (SELECT 1 FROM targets t WHERE t.sid = s.sid AND t.lang IN (%s))
+        ORDER BY bm25(fulltext)""" % (
+            _placeholders(source_langs),
+            _placeholders(target_langs),
+        )
+        params = [
+            self._match_expression(words),
+            *source_langs,
+            minlen,
+            maxlen,
+            *target_langs,
+        ]
+        if self.max_fulltext_candidates > 0:
+            query += " LIMIT ?"
+            params.append(self.max_fulltext_candidates)
+        self.cursor.execute(query, params)
+        return [sid for (sid,) in self.cursor]
+
+    @staticmethod
+    def _match_expression(words):
+        """Returns a fulltext query matching any of words."""
+        # quote the words as strings, so they aren't parsed as operators
+        return " OR ".join(
+            '"%s"' % word.replace('"', '""') for word in dict.fromkeys(words)
+        )
+
+    def _match_candidates(
+        self, words, minlen, maxlen, source_langs, target_langs, candidates
+    ):
+        """Adds the candidates in the length window containing any of words
+        to the candidates returned by :meth:`_fetch_candidates`.
+
+        :return: The sids of the matching candidates.
+        """
+        # CROSS JOIN keeps the fulltext table first, as the query planner
+        # might otherwise match every source in the window separately
+        query = """SELECT s.sid, s.text, s.context, s.length, t.text
+        FROM fulltext CROSS JOIN sources s ON s.sid = fulltext.rowid
+        JOIN targets t ON s.sid = t.sid
+        WHERE fulltext MATCH ? AND s.lang IN (%s) AND t.lang IN (%s)
+        AND s.length >= ? AND s.length <= ?""" % (
+            _placeholders(source_langs),
+            _placeholders(target_langs),
+        )
+        self.cursor.execute(
+            query,
+            (
+                self._match_expression(words),
+                *source_langs,
+                *target_langs,
+                minlen,
+                maxlen,
+            ),
+        )
+        # whether the targets of a sid are added, as the ones fetched before
+        # are complete already
+        added = {}
+        for sid, text, context, length, target in self.cursor:
+            if sid not in added:
+                added[sid] = sid not in candidates
+                if added[sid]:
+                    candidates[sid] = (text, context, length, [target])
+            elif added[sid]:
+                candidates[sid][3].append(target)
+        return list(added)
+
+    def _fetch_candidates(self, windows, source_langs, target_langs):
+        """Fetches the candidates with a length in any of the windows, with
+        one query for every group of overlapping windows.
+
+        :return: A dictionary mapping the sid of every candidate to a tuple
+                 of its text, context, length and list of targets, and a
+                 dictionary mapping lengths to the sids with that length.
+        """
+        ranges = []
+        for minlen, maxlen in sorted(windows):
+            if ranges and minlen <= ranges[-1][1] + 1:
+                ranges[-1][1] = max(ranges[-1][1], maxlen)
+            else:
+                ranges.append([minlen, maxlen])
+
+        candidates = {}
+        lengths = {}
+        if not ranges:
+            return candidates, lengths
+        query = """SELECT s.sid, s.text, s.context, s.length, t.text FROM sources s JOIN targets t ON s.sid = t.sid
+        WHERE s.lang IN (%s) AND t.lang IN (%s)
+        AND s.length >= ? AND s.length <= ?""" % (
+            _placeholders(source_langs),
+            _placeholders(target_langs),
+        )
+        for minlen, maxlen in ranges:
+            self.cursor.execute(query, (*source_langs, *target_langs, minlen, maxlen))
+            for sid, text, context, length, target in self.cursor:
+                candidate = candidates.get(sid)
+                if candidate is None:
+                    candidates[sid] = (text, context, length, [target])
+                    lengths.setdefault(length, []).append(sid)
+                else:
+                    candidate[3].append(target)
+        return candidates, lengths
+
+    def _fetch_sids(self, sids, source_langs, target_langs, candidates):
+        """Adds the candidates with the given sids to the candidates returned
+        by :meth:`_fetch_candidates`.
+        """
+        for start in range(0, len(sids), 500):
+            chunk = sids[start : start + 500]
+            query = """SELECT s.sid, s.text, s.context, s.length, t.text FROM sources s JOIN targets t ON s.sid = t.sid
+            WHERE s.sid IN (%s) AND s.lang IN (%s) AND t.lang IN (%s)""" % (
+                _placeholders(chunk),
+                _placeholders(source_langs),
+                _placeholders(target_langs),
+            )
+            self.cursor.execute(query, (*chunk, *source_langs, *target_langs))
+            for sid, text, context, length, target in self.cursor:
+                candidate = candidates.get(sid)
+                if candidate is None:
+                    candidates[sid] = (text, context, length, [target])
+                else:
+                    candidate[3].append(target)
+
+
+def _placeholders(values):
+    """Returns the parameter placeholders for an ``IN`` list of values."""
+    return ", ".join("?" * len(values))
 
 
 def min_levenshtein_length(length, min_similarity):
@@ -19,20 +19,71 @@
 """Import units from translations files into tmdb."""
 
 import logging
+import multiprocessing
 import os
 from argparse import ArgumentParser
 
-from translate.storage import factory, tmdb
+from translate.storage import factory, pypo, tmdb
 
 
 logger = logging.getLogger(__name__)
 
 
+def iterunits(filename):
+    """Yields the units of a file, reading PO files one unit at a time."""
+    if factory.getclass(filename) is pypo.pofile:
+        with open(filename, "rb") as fileobj:
+            yield from pypo.iterparse(fileobj)
+    else:
+        yield from factory.getobject(filename).units
+
+
+def parsefile(filename, source_lang, target_lang):
+    """Returns the translated units of a file as (units, source_lang,
+    target_lang) batches for :meth:`~translate.storage.tmdb.TMDB.bulk_add`,
+    or *None* if the file can't be parsed.
+    """
+    batches = {}
+    try:
+        for unit in iterunits(filename):
+            if unit.istranslatable() and unit.istranslated():
+                # units might know their languages, like in add_unit()
+                languages = (
+                    unit.getsourcelanguage() or source_lang,
+                    unit.gettargetlanguage() or target_lang,
+                )
+                if not all(languages):
+                    logger.error("cannot process %s: undefined language", filename)
+                    return None
+                batches.setdefault(languages, []).append(
+                    {
+                        "source": str(unit.source),
+                        "target": str(unit.target),
+                        "context": unit.getcontext(),
+                    }
+                )
+    except Exception as e:
+        logger.error(str(e))
+        return None
+    return [(units, slang, tlang) for (slang, tlang), units in batches.items()]
+
+
+def _parsefile(arguments):
+    return parsefile(*arguments)
+
+
 class Builder:
-    def __init__(self, tmdbfile, source_lang, target_lang, filenames):
+    def __init__(self, tmdbfile, source_lang, target_lang, filenames, jobs=1):
+        """Imports the units of all filenames, parsing jobs files at a time in
+        separate processes.
+        """
+        # A new database can be loaded without syncing it, as nothing is lost
+        # if that fails
+        unsafe = not os.path.exists(tmdbfile)
         self.tmdb = tmdb.TMDB(tmdbfile)
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.filenames = []
 
         for filename in filenames:
             if not os.path.exists(filename):
@@ -42,20 +93,31 @@ class Builder:
                 self.handledir(filename)
             else:
                 self.handlefile(filename)
-        self.tmdb.connection.commit()
+        self.tmdb.bulk_add(self.parsefiles(jobs), unsafe=unsafe)
+
+    def parsefiles(self, jobs=1):
+        """Yields the batches of units of all files, in the order of the
+        files.
+        """
+        arguments = [
+            (filename, self.source_lang, self.target_lang)
+            for filename in self.filenames
+        ]
+        if jobs > 1 and len(arguments) > 1:
+            with multiprocessing.Pool(jobs) as pool:
+                yield from self._addedbatches(pool.imap(_parsefile, arguments))
+        else:
+            yield from self._addedbatches(map(_parsefile, arguments))
+
+    def _addedbatches(self, results):
+        for filename, batches in zip(self.filenames, results):
+            if batches is None:
+                continue
+            yield from batches
+            print("File added:", filename)
 
     def handlefile(self, filename):
-        try:
-            store = factory.getobject(filename)
-        except Exception as e:
-            logger.error(str(e))
-            return
-        # do something useful with the store and db
-        try:
-            self.tmdb.add_store(store, self.source_lang, self.target_lang, commit=False)
-        except Exception as e:
-            print(e)
-        print("File added:", filename)
+        self.filenames.append(filename)
 
     def handlefiles(self, dirname, filenames):
         for filename in filenames:
@@ -96,12 +158,20 @@ def main():
         help="target language of translation files",
         required=True,
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="number of processes parsing input files (default: %(default)s)",
+    )
     parser.add_argument("files", metavar="input files", nargs="+")
     args = parser.parse_args()
 
     logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
 
-    Builder(args.tmdb_file, args.source_lang, args.target_lang, args.files)
+    Builder(args.tmdb_file, args.source_lang, args.target_lang, args.files, args.jobs)
 
 
 if __name__ == "__main__":
@@ -24,13 +24,19 @@ See: http://docs.translatehouse.org/projects/translate-toolkit/en/latest/command
 for examples and usage instructions.
 """
 
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
 import re
+import sqlite3
 import sys
 from argparse import ArgumentParser
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from functools import lru_cache
 
+from translate import __version__
 from translate.lang.common import Common
 from translate.misc.multistring import multistring
 from translate.storage import factory
@@ -113,37 +119,45 @@ class ConsoleColor:
         return cls.COLOR_DEFAULT if ConsoleColor.color_mode else ""
 
 
+@lru_cache(maxsize=65536)
 def wordcount(string):
     # TODO: po class should understand KDE style plurals ##
     # string = kdepluralre.sub("", string) #Restore this if you really need support for old kdeplurals
-    string = brtagre.sub("\n", string)
-    string = xmltagre.sub("", string)
-    string = numberre.sub(" ", string)
+    if "<" in string:
+        string = brtagre.sub("\n", string)
+        string = xmltagre.sub("", string)
+    if "." in string:
+        string = numberre.sub(" ", string)
     # TODO: This should still use the correct language to count in the target
     # language
-    return len(Common.words(string))
+    return Common.wordcount(string)
+
+
+def wordcounts(strings):
+    """Returns a list with the number of words in each of the strings.
+
+    The counts are cached, as the same strings are very common across units
+    and files.
+    """
+    return [wordcount(string) for string in strings]
 
 
 def wordsinunit(unit):
     """Counts the words in the unit's source and target, taking plurals into
     account. The target words are only counted if the unit is translated.
     """
-    (sourcewords, targetwords) = (0, 0)
     if isinstance(unit.source, multistring):
         sourcestrings = unit.source.strings
     else:
         sourcestrings = [unit.source or ""]
-    for s in sourcestrings:
-        sourcewords += wordcount(s)
+    sourcewords = sum(wordcounts(sourcestrings))
     if not unit.istranslated():
-        return sourcewords, targetwords
+        return sourcewords, 0
     if isinstance(unit.target, multistring):
         targetstrings = unit.target.strings
     else:
         targetstrings = [unit.target or ""]
-    for s in targetstrings:
-        targetwords += wordcount(s)
-    return sourcewords, targetwords
+    return sourcewords, sum(wordcounts(targetstrings))
 
 
 def calcstats(filename):
@@ -195,6 +209,114 @@ def calcstats(filename):
     return stats
 
 
+#: The key of a file to store in the :class:`StatsCache`, with the hash and
+#: statistics of the file that are in the cache, or None
+StatsKey = namedtuple("StatsKey", "path size mtime digest stats")
+
+
+def _hash_file(filename):
+    """Returns the SHA-256 hash of the content of filename."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StatsCache:
+    """Stores the :func:`calcstats` results of files in an SQLite database.
+
+    Entries are keyed by the absolute path of the file and are valid as long
+    as its size and modification time are unchanged. If only the modification
+    time differs, the content hash decides whether the entry can still be used,
+    so that touched or checked out files are not parsed again.
+
+    The database is written in write-ahead log mode and changes are committed
+    in batches, so that several pocount runs can share it.
+    """
+
+    #: Number of stored entries after which they are committed
+    batchsize = 100
+
+    def __init__(self, filename, timeout=10):
+        dirname = os.path.dirname(filename)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.connection = sqlite3.connect(filename, timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.pending = 0
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS stats (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime INTEGER,
+            hash TEXT,
+            version TEXT,
+            stats TEXT)"""
+        )
+        self.connection.commit()
+
+    def lookup(self, filename):
+        """Look up the cached statistics of filename, without reading it.
+
+        :return: the statistics if the size and modification time of the file
+                 are unchanged, or else None, and the :class:`StatsKey` to
+                 :meth:`store` them with
+        """
+        path = os.path.abspath(filename)
+        filestat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT size, mtime, hash, stats FROM stats WHERE path=? AND version=?",
+            (path, __version__.sver),
+        ).fetchone()
+        if row and row[:2] == (filestat.st_size, filestat.st_mtime_ns):
+            return json.loads(row[3]), None
+        key = StatsKey(path, filestat.st_size, filestat.st_mtime_ns, None, None)
+        if row:
+            key = key._replace(digest=row[2], stats=json.loads(row[3]))
+        return None, key
+
+    def store(self, key, digest, stats):
+        """Store the statistics of a file with the content hash digest, under
+        the key from :meth:`lookup`.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key.path,
+                key.size,
+                key.mtime,
+                digest,
+                __version__.sver,
+                json.dumps(stats),
+            ),
+        )
+        self.pending += 1
+        if self.pending >= self.batchsize:
+            self.connection.commit()
+            self.pending = 0
+
+    def calcstats(self, filename):
+        """Return the statistics of filename, calculating them only when the
+        cached ones are missing or out of date.
+        """
+        stats, key = self.lookup(filename)
+        if stats is None:
+            digest = _hash_file(filename)
+            if digest == key.digest:
+                stats = key.stats
+            else:
+                stats = calcstats(filename)
+            if stats:
+                self.store(key, digest, stats)
+        return stats
+
+    def close(self):
+        """Save the cached statistics and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+
 def file_extended_totals(units, wordcounts):
     """
     Provide extended statuses (used by XLIFF)
@@ -415,14 +537,42 @@ def untranslatedmessages(units):
     ]
 
 
+def _countfile(task):
+    """Counts a file for :class:`summarizer`, which is only hashed if it is
+    to be stored in the cache, and not counted if the hash is the cached one.
+
+    :return: the statistics, or None if the cached ones still apply, the hash
+             of the file or None, and an error message or None
+    """
+    filename, key = task
+    try:
+        digest = None
+        if key is not None:
+            digest = _hash_file(filename)
+            if digest == key.digest:
+                return None, digest, None
+        return calcstats(filename), digest, None
+    except Exception:  # This happens if we have a broken file.
+        return {}, None, str(sys.exc_info()[1])
+
+
 class summarizer:
-    def __init__(self, filenames, style=default_style, incomplete_only=False):
+    def __init__(
+        self,
+        filenames,
+        style=default_style,
+        incomplete_only=False,
+        cache=None,
+        jobs=1,
+    ):
         self.totals = {}
         self.filecount = 0
         self.longestfilename = 0
         self.style = style
         self.incomplete_only = incomplete_only
         self.complete_count = 0
+        self.cache = cache
+        self.jobs = jobs
 
         if self.style == style_csv:
             print(
@@ -435,14 +585,7 @@ Review Messages, Review Source Words"""
             for filename in filenames:  # find longest filename
                 if len(filename) > self.longestfilename:
                     self.longestfilename = len(filename)
-        for filename in filenames:
-            if not os.path.exists(filename):
-                logger.error("cannot process %s: does not exist", filename)
-                continue
-            elif os.path.isdir(filename):
-                self.handledir(filename)
-            else:
-                self.handlefile(filename)
+        self.handlefiles(self.iterfiles(filenames))
         if self.filecount > 1 and (self.style == style_full):
             if self.incomplete_only:
                 summarize("TOTAL (incomplete only):", self.totals, incomplete_only=True)
@@ -459,15 +602,99 @@ Review Messages, Review Source Words"""
         """Update self.totals with the statistics in stats."""
         for key in stats.keys():
             if key == "extended":
-                # FIXME: calculate extended totals
+                extended = self.totals.setdefault("extended", {})
+                for state, e_stats in stats[key].items():
+                    e_totals = extended.setdefault(state, defaultdict(int))
+                    for e_key, value in e_stats.items():
+                        e_totals[e_key] += value
                 continue
             if key not in self.totals:
                 self.totals[key] = 0
             self.totals[key] += stats[key]
 
-    def handlefile(self, filename):
+    def iterfiles(self, filenames):
+        """Yields the files to count in filenames, recursing into directories."""
+        for filename in filenames:
+            if not os.path.exists(filename):
+                logger.error("cannot process %s: does not exist", filename)
+                continue
+            elif os.path.isdir(filename):
+                yield from self.iterdir(filename)
+            else:
+                yield filename
+
+    def iterdir(self, dirname):
+        """Yields the files in dirname and its subdirectories."""
+        path, name = os.path.split(dirname)
+        if name in ["CVS", ".svn", "_darcs", ".git", ".hg", ".bzr"]:
+            return
+        with os.scandir(dirname) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield from self.iterdir(entry.path)
+                else:
+                    yield entry.path
+
+    def lookupfile(self, filename):
+        """Returns the cached statistics of filename, or None, and the key to
+        store the calculated ones in the cache.
+        """
+        if self.cache is None:
+            return None, None
+        try:
+            return self.cache.lookup(filename)
+        except OSError:
+            return None, None
+        except sqlite3.Error as e:
+            self.disablecache(e)
+            return None, None
+
+    def storefile(self, key, digest, stats):
+        """Stores the statistics of a file in the cache, if it is used."""
+        if self.cache is None:
+            return
+        try:
+            self.cache.store(key, digest, stats)
+        except sqlite3.Error as e:
+            self.disablecache(e)
+
+    def disablecache(self, error):
+        """Counts the remaining files without the cache after it failed."""
+        logger.warning("cannot use statistics cache: %s", error)
+        self.cache = None
+
+    def handlefiles(self, filenames):
+        """Counts the files and summarizes them in the given order.
+
+        The files missing from the cache are hashed and counted in a pool of
+        processes if more than one job was requested.
+        """
+        lookups = [(filename, self.lookupfile(filename)) for filename in filenames]
+        pending = [
+            (filename, key) for filename, (stats, key) in lookups if stats is None
+        ]
+        if self.jobs > 1 and len(pending) > 1:
+            with multiprocessing.Pool(min(self.jobs, len(pending))) as pool:
+                self.summarizefiles(lookups, pool.imap(_countfile, pending))
+        else:
+            self.summarizefiles(lookups, map(_countfile, pending))
+
+    def summarizefiles(self, lookups, results):
+        for filename, (stats, key) in lookups:
+            if stats is None:
+                stats, digest, error = next(results)
+                if error is not None:
+                    logger.error(error)
+                    continue
+                if stats is None:
+                    # only the modification time changed
+                    stats = key.stats
+                if stats and key is not None:
+                    self.storefile(key, digest, stats)
+            self.handlefile(filename, stats)
+
+    def handlefile(self, filename, stats):
         try:
-            stats = calcstats(filename)
             self.updatetotals(stats)
             self.complete_count += summarize(
                 filename, stats, self.style, self.longestfilename, self.incomplete_only
@@ -476,21 +703,6 @@ Review Messages, Review Source Words"""
         except Exception:  # This happens if we have a broken file.
             logger.error(sys.exc_info()[1])
 
-    def handlefiles(self, dirname, filenames):
-        for filename in filenames:
-            pathname = os.path.join(dirname, filename)
-            if os.path.isdir(pathname):
-                self.handledir(pathname)
-            else:
-                self.handlefile(pathname)
-
-    def handledir(self, dirname):
-        path, name = os.path.split(dirname)
-        if name in ["CVS", ".svn", "_darcs", ".git", ".hg", ".bzr"]:
-            return
-        entries = os.listdir(dirname)
-        self.handlefiles(dirname, entries)
-
 
 def main():
     parser = ArgumentParser()
@@ -501,6 +713,18 @@ def main():
         dest="incomplete_only",
         help="skip 100%% translated files.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="JOBS",
+        help="count JOBS files at a time in separate processes (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="keep the statistics of unchanged files in the database PATH",
+    )
     output_group = parser.add_argument_group("Output format")
     megroup = output_group.add_mutually_exclusive_group()
     megroup.add_argument(
@@ -550,7 +774,20 @@ def main():
     logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
     ConsoleColor.color_mode = not args.no_color
 
-    summarizer(args.files, args.style, args.incomplete_only)
+    cache = None
+    if args.cache:
+        try:
+            cache = StatsCache(args.cache)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("cannot use statistics cache %s: %s", args.cache, e)
+    try:
+        summarizer(args.files, args.style, args.incomplete_only, cache, args.jobs)
+    finally:
+        if cache is not None:
+            try:
+                cache.close()
+            except sqlite3.Error as e:
+                logger.warning("cannot save statistics cache %s: %s", args.cache, e)
 
 
 if __name__ == "__main__":
@@ -27,7 +27,10 @@ for examples and usage instructions.
 """
 
 import locale
+import os
 import re
+import sqlite3
+import unicodedata
 
 from translate.lang import data
 from translate.misc import optrecurse
@@ -141,6 +144,78 @@ def find_matches(unit, part, strings, re_search):
     return matches
 
 
+#: The number of characters following escapes that stand for a character code
+_escape_arguments = {"x": 2, "u": 4, "U": 8}
+_repeat_re = re.compile(r"\{\d*(?:,\d*)?\}")
+
+
+def requiredliteral(pattern):
+    """Return the longest literal text that every match of the regular
+    expression pattern contains, or an empty string if that is not known.
+
+    The pattern is scanned for runs of plain characters and escaped
+    punctuation outside of groups and character classes. Anything else ends
+    a run, and a quantifier other than ``+`` also removes the character it
+    repeats from it. An alternative outside of groups means that there is no
+    such text.
+    """
+    try:
+        if re.compile(pattern).flags & (re.IGNORECASE | re.VERBOSE):
+            return ""
+    except re.error:
+        return ""
+    runs = [""]
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        if char == "\\":
+            escaped = pattern[i]
+            i += 1
+            if depth == 0 and not escaped.isalnum():
+                runs[-1] += escaped
+                continue
+            # skip the rest of a character code or group reference
+            if escaped in _escape_arguments:
+                i += _escape_arguments[escaped]
+            elif escaped == "N" and pattern.startswith("{", i):
+                i = pattern.index("}", i) + 1
+            elif escaped.isdigit():
+                while i < len(pattern) and pattern[i].isdigit():
+                    i += 1
+        elif char == "[":
+            # skip the character class, where a leading "]" is literal
+            if pattern.startswith("^", i):
+                i += 1
+            if pattern.startswith("]", i):
+                i += 1
+            while pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth:
+            continue
+        elif char == "|":
+            return ""
+        elif char in "*?":
+            runs[-1] = runs[-1][:-1]
+        elif char == "{":
+            # a "{" that doesn't start a repeat only ends the run
+            repeat = _repeat_re.match(pattern, i - 1)
+            if repeat:
+                runs[-1] = runs[-1][:-1]
+                i = repeat.end()
+        elif char not in "+.^$":
+            runs[-1] += char
+            continue
+        runs.append("")
+    return max(runs, key=len)
+
+
 class GrepFilter:
     def __init__(
         self,
@@ -182,23 +257,50 @@ class GrepFilter:
         self.keeptranslations = keeptranslations
         self.accelchar = accelchar
         self.max_matches = max_matches
-
-    def matches(self, teststr):
-        if teststr is None:
-            return False
-        teststr = data.normalize(teststr)
-        if self.ignorecase:
-            teststr = teststr.lower()
-        if self.accelchar:
-            teststr = re.sub(self.accelchar + self.accelchar, "#", teststr)
-            teststr = re.sub(self.accelchar, "", teststr)
+        self.re_search = None
+        self.matcher = self.compilematcher()
+
+    def compilematcher(self):
+        """Builds the function that :meth:`matches` uses, which normalizes,
+        lowers and removes accelerators from a string and searches it, in one
+        pass prepared for the options of this filter.
+        """
+        searchstring = self.searchstring
+        ignorecase = self.ignorecase
+        invertmatch = self.invertmatch
+        accelchar = self.accelchar
+        escapedaccel = accelchar * 2 if accelchar else None
         if self.useregexp:
-            found = self.searchpattern.search(teststr)
+            search = self.searchpattern.search
+            # A cheap check for text that every match has rules out most
+            # strings before running the regular expression
+            literal = requiredliteral(searchstring)
         else:
-            found = teststr.find(self.searchstring) != -1
-        if self.invertmatch:
-            found = not found
-        return found
+            search = None
+        normalize = unicodedata.normalize
+
+        def matcher(teststr):
+            if teststr is None:
+                return False
+            teststr = normalize("NFC", teststr)
+            if ignorecase:
+                teststr = teststr.lower()
+            if accelchar and accelchar in teststr:
+                teststr = teststr.replace(escapedaccel, "#").replace(accelchar, "")
+            if search is None:
+                found = searchstring in teststr
+            elif literal and literal not in teststr:
+                found = None
+            else:
+                found = search(teststr)
+            if invertmatch:
+                found = not found
+            return found
+
+        return matcher
+
+    def matches(self, teststr):
+        return self.matcher(teststr)
 
     def filterunit(self, unit):
         """runs filters on an element"""
@@ -208,40 +310,47 @@ class GrepFilter:
         if self.keeptranslations and unit.target:
             return True
 
+        matches = self.matcher
         if self.search_source:
-            if isinstance(unit.source, multistring):
-                strings = unit.source.strings
+            source = unit.source
+            if isinstance(source, multistring):
+                strings = source.strings
             else:
-                strings = [unit.source]
+                strings = [source]
             for string in strings:
-                if self.matches(string):
+                if matches(string):
                     return True
 
         if self.search_target:
-            if isinstance(unit.target, multistring):
-                strings = unit.target.strings
+            target = unit.target
+            if isinstance(target, multistring):
+                strings = target.strings
             else:
-                strings = [unit.target]
+                strings = [target]
             for string in strings:
-                if self.matches(string):
+                if matches(string):
                     return True
 
         if self.search_notes:
-            if self.matches(unit.getnotes()):
+            if matches(unit.getnotes()):
                 return True
         if self.search_locations:
-            if self.matches(" ".join(unit.getlocations())):
+            if matches(" ".join(unit.getlocations())):
                 return True
         return False
 
+    def filterunits(self, units):
+        """Returns the units that pass the filter."""
+        filterunit = self.filterunit
+        return [unit for unit in units if filterunit(unit)]
+
     def filterfile(self, thefile):
         """runs filters on a translation file object"""
         thenewfile = type(thefile)()
         thenewfile.setsourcelanguage(thefile.sourcelanguage)
         thenewfile.settargetlanguage(thefile.targetlanguage)
-        for unit in thefile.units:
-            if self.filterunit(unit):
-                thenewfile.addunit(unit)
+        for unit in self.filterunits(thefile.units):
+            thenewfile.addunit(unit)
 
         if isinstance(thenewfile, poheader):
             thenewfile.updateheader(add=True, **thefile.parseheader())
@@ -251,14 +360,15 @@ class GrepFilter:
         if not self.searchstring:
             return [], []
 
-        searchstring = self.searchstring
-        flags = re.LOCALE | re.MULTILINE | re.UNICODE
-
-        if self.ignorecase:
-            flags |= re.IGNORECASE
-        if not self.useregexp:
-            searchstring = re.escape(searchstring)
-        self.re_search = re.compile("(%s)" % (searchstring), flags)
+        if self.re_search is None:
+            searchstring = self.searchstring
+            # re.LOCALE can not be used with str patterns
+            flags = re.MULTILINE | re.UNICODE
+            if self.ignorecase:
+                flags |= re.IGNORECASE
+            if not self.useregexp:
+                searchstring = re.escape(searchstring)
+            self.re_search = re.compile("(%s)" % (searchstring), flags)
 
         matches = []
         indexes = []
@@ -301,6 +411,138 @@ class GrepFilter:
         return matches, indexes
 
 
+_accelerators = str.maketrans("", "", "&_~")
+
+
+def foldtext(text):
+    """Returns text as it is stored in a :class:`GrepIndex`: normalized, case
+    folded and without accelerator characters.
+    """
+    return data.normalize(text).casefold().translate(_accelerators)
+
+
+class GrepIndex:
+    """A persistent index of the text in translation files, to find the files
+    where a :class:`GrepFilter` could match without parsing all of them.
+
+    The source, target, notes and locations of each file are stored with
+    :func:`foldtext` in an SQLite database, in a trigram table if the
+    SQLite version supports it. A file is indexed again when its size or
+    modification time changes.
+    """
+
+    parts = ("source", "target", "notes", "locations")
+
+    def __init__(self, dirname):
+        os.makedirs(dirname, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(dirname, "pogrep.db"))
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE,
+            size INTEGER,
+            mtime INTEGER)"""
+        )
+        try:
+            self.connection.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS texts
+                USING fts5(text, tokenize='trigram case_sensitive 1')"""
+            )
+        except sqlite3.OperationalError:
+            # Without FTS5 trigrams all the texts are searched
+            self.connection.execute("CREATE TABLE IF NOT EXISTS texts (text TEXT)")
+
+    @staticmethod
+    def getunitparts(unit):
+        """Returns the strings that :meth:`GrepFilter.filterunit` matches in
+        each of the :attr:`parts` of unit.
+        """
+        if isinstance(unit.source, multistring):
+            sources = unit.source.strings
+        else:
+            sources = [unit.source]
+        if isinstance(unit.target, multistring):
+            targets = unit.target.strings
+        else:
+            targets = [unit.target]
+        return sources, targets, [unit.getnotes()], [" ".join(unit.getlocations())]
+
+    def update(self, filename):
+        """Indexes filename if it changed since it was last indexed."""
+        path = os.path.abspath(filename)
+        filestat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT id, size, mtime FROM files WHERE path=?", (path,)
+        ).fetchone()
+        if row and row[1:] == (filestat.st_size, filestat.st_mtime_ns):
+            return
+        store = factory.getobject(path)
+        texts = [[] for part in self.parts]
+        for unit in store.units:
+            for parttexts, strings in zip(texts, self.getunitparts(unit)):
+                parttexts.extend(foldtext(string) for string in strings if string)
+        if row:
+            fileid = row[0]
+            self.connection.execute(
+                "UPDATE files SET size=?, mtime=? WHERE id=?",
+                (filestat.st_size, filestat.st_mtime_ns, fileid),
+            )
+        else:
+            fileid = self.connection.execute(
+                "INSERT INTO files (path, size, mtime) VALUES (?, ?, ?)",
+                (path, filestat.st_size, filestat.st_mtime_ns),
+            ).lastrowid
+        rowid = fileid * len(self.parts)
+        self.connection.execute(
+            "DELETE FROM texts WHERE rowid BETWEEN ? AND ?",
+            (rowid, rowid + len(self.parts) - 1),
+        )
+        self.connection.executemany(
+            "INSERT INTO texts (rowid, text) VALUES (?, ?)",
+            [(rowid + n, "\n".join(parttexts)) for n, parttexts in enumerate(texts)],
+        )
+
+    def getcandidates(self, checkfilter):
+        """Returns the paths of the indexed files where checkfilter could
+        match, or None if the index can not tell for this filter.
+
+        Folding the text can only join more strings together, so every file
+        with a match is a candidate, and the candidates are checked with the
+        filter itself.
+        """
+        if checkfilter.useregexp or checkfilter.invertmatch:
+            return None
+        if checkfilter.keeptranslations:
+            return None
+        searchstring = foldtext(checkfilter.searchstring)
+        # Escaped accelerators are replaced with "#" before matching
+        if not searchstring or (checkfilter.accelchar and "#" in searchstring):
+            return None
+        partnumbers = [
+            str(n)
+            for n, part in enumerate(self.parts)
+            if getattr(checkfilter, "search_" + part)
+        ]
+        if len(searchstring) >= 3 and not any(c in searchstring for c in "*?["):
+            # The trigram table can answer GLOB without reading all the texts
+            condition, parameter = "texts.text GLOB ?", "*%s*" % searchstring
+        else:
+            condition, parameter = "instr(texts.text, ?) > 0", searchstring
+        rows = self.connection.execute(
+            """SELECT DISTINCT files.path FROM texts
+            JOIN files ON files.id = texts.rowid / %d
+            WHERE texts.rowid %% %d IN (%s) AND %s"""
+            % (len(self.parts), len(self.parts), ", ".join(partnumbers), condition),
+            (parameter,),
+        )
+        return {row[0] for row in rows}
+
+    def close(self):
+        """Saves the index and closes the database."""
+        self.connection.commit()
+        self.connection.close()
+
+
 class GrepOptionParser(optrecurse.RecursiveOptionParser):
     """a specialized Option Parser for the grep tool..."""
 
@@ -357,6 +599,46 @@ class GrepOptionParser(optrecurse.RecursiveOptionParser):
         )
         self.recursiveprocess(options)
 
+    def processtasks(self, options, tasks):
+        """Processes the tasks, skipping the input files where the index from
+        ``--index`` shows that the search can not match.
+        """
+        if not options.indexdir:
+            yield from super().processtasks(options, tasks)
+            return
+        index = GrepIndex(options.indexdir)
+        indexed = set()
+        try:
+            tasks = list(tasks)
+            for task in tasks:
+                fullinputpath = task[2]
+                if fullinputpath and os.path.isfile(fullinputpath):
+                    try:
+                        index.update(fullinputpath)
+                    except Exception:
+                        # Files that can not be indexed are searched anyway
+                        continue
+                    indexed.add(os.path.abspath(fullinputpath))
+            index.connection.commit()
+            candidates = index.getcandidates(options.checkfilter)
+        finally:
+            index.close()
+        if candidates is None:
+            yield from super().processtasks(options, tasks)
+            return
+        searchtasks = []
+        for task in tasks:
+            inputpath, fileprocessor, fullinputpath, fulloutputpath = task[:4]
+            if fullinputpath and os.path.abspath(fullinputpath) in indexed:
+                if os.path.abspath(fullinputpath) not in candidates:
+                    # There are no matches, so there is no output either
+                    if fulloutputpath and os.path.isfile(fulloutputpath):
+                        os.unlink(fulloutputpath)
+                    yield inputpath, False
+                    continue
+            searchtasks.append(task)
+        yield from super().processtasks(options, searchtasks)
+
 
 def rungrep(inputfile, outputfile, templatefile, checkfilter):
     """reads in inputfile, filters using checkfilter, writes to outputfile"""
@@ -441,6 +723,14 @@ def cmdlineparser():
         default=False,
         help="always extract units with translations",
     )
+    parser.add_option(
+        "",
+        "--index",
+        dest="indexdir",
+        default=None,
+        metavar="DIR",
+        help="keep an index of the input files in DIR, to only search the files that could match",
+    )
     parser.set_usage()
     parser.passthrough.append("checkfilter")
     parser.description = __doc__
@@ -27,7 +27,7 @@ for examples and usage instructions.
 
 import logging
 
-from translate.storage import factory
+from translate.storage import factory, pypo
 from translate.storage.poheader import poheader
 
 
@@ -161,7 +161,9 @@ def main():
     parser.passthrough.append("mergefuzzy")
     parser.add_option(mergecommentsoption)
     parser.passthrough.append("mergecomments")
-    parser.run()
+    # most units are written back unchanged, so keep their parsed text
+    with pypo.keep_raw_units():
+        parser.run()
 
 
 if __name__ == "__main__":
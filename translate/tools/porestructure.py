@@ -34,6 +34,8 @@ from translate.storage import po
 class SplitOptionParser(optrecurse.RecursiveOptionParser):
     """a specialized Option Parser for posplit"""
 
+    supportsjobs = False
+
     def parse_args(self, args=None, values=None):
         """parses the command line options, handling implicit input/output args"""
         (options, args) = optrecurse.RecursiveOptionParser.parse_args(
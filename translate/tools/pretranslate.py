@@ -23,32 +23,62 @@ See: http://docs.translatehouse.org/projects/translate-toolkit/en/latest/command
 for examples and usage instructions.
 """
 
-from translate.search import match
-from translate.storage import factory
+import os
+
+from translate.search import match, tmcache
+from translate.storage import factory, pypo
 
 
 # We don't want to reinitialise the TM each time, so let's store it here.
 tmmatcher = None
 
 
-def memory(tmfiles, max_candidates=1, min_similarity=75, max_length=1000):
-    """Returns the TM store to use. Only initialises on first call."""
+def memory(
+    tmfiles, max_candidates=1, min_similarity=75, max_length=1000, tmcachedir=None
+):
+    """Returns the TM store to use. Only initialises on first call.
+
+    If *tmcachedir* is given, the matcher candidates are kept there in a
+    compiled form (see :mod:`translate.search.tmcache`), so that unchanged
+    TM files don't have to be parsed again.
+    """
     global tmmatcher
     # Only initialise first time
     if tmmatcher is None:
-        if isinstance(tmfiles, list):
-            tmstore = [factory.getobject(tmfile) for tmfile in tmfiles]
-        else:
-            tmstore = factory.getobject(tmfiles)
+        if not isinstance(tmfiles, list):
+            tmfiles = [tmfiles]
         tmmatcher = match.matcher(
-            tmstore,
+            [],
             max_candidates=max_candidates,
             min_similarity=min_similarity,
             max_length=max_length,
+            use_ngram_index=True,
         )
+        cachepath = cachekey = None
+        if tmcachedir is not None and all(
+            isinstance(tmfile, str) for tmfile in tmfiles
+        ):
+            cachepath = tmcache.cachepath(tmcachedir, tmfiles)
+            cachekey = tmcache.cachekey(tmfiles, usefuzzy=tmmatcher.usefuzzy)
+            if tmmatcher.loadcache(cachepath, cachekey):
+                return tmmatcher
+        tmmatcher.inittm([factory.getobject(tmfile) for tmfile in tmfiles])
+        if cachepath is not None:
+            os.makedirs(tmcachedir, exist_ok=True)
+            tmmatcher.savecache(cachepath, cachekey)
     return tmmatcher
 
 
+def closememory():
+    """Closes the TM store returned by :func:`memory`, so that it is
+    initialised again on the next call.
+    """
+    global tmmatcher
+    if tmmatcher is not None:
+        tmmatcher.close()
+        tmmatcher = None
+
+
 def pretranslate_file(
     input_file,
     output_file,
@@ -56,6 +86,8 @@ def pretranslate_file(
     tm=None,
     min_similarity=75,
     fuzzymatching=True,
+    fuzzyworkers=1,
+    tmcachedir=None,
 ):
     """Pretranslate any factory supported file with old translations and
     translation memory.
@@ -66,7 +98,13 @@ def pretranslate_file(
         template_store = factory.getobject(template_file)
 
     output = pretranslate_store(
-        input_store, template_store, tm, min_similarity, fuzzymatching
+        input_store,
+        template_store,
+        tm,
+        min_similarity,
+        fuzzymatching,
+        fuzzyworkers,
+        tmcachedir,
     )
     output.serialize(output_file)
     return 1
@@ -117,8 +155,60 @@ def match_fuzzy(input_unit, matchers):
             return fuzzycandidates[0]
 
 
+def match_fuzzy_many(input_units, matchers, workers=1):
+    """Return the fuzzy matches for several units from a queue of matchers.
+
+    :param input_units: Units to find fuzzy matches for.
+    :param matchers: List of fuzzy :class:`~translate.search.match.matcher`
+        objects, tried in order.
+    :param workers: Number of worker processes every matcher can use.
+    :return: A dictionary mapping the source texts to their best match. Source
+        texts without a match are left out.
+    """
+    fuzzy_matches = {}
+    sources = list(dict.fromkeys(input_unit.source for input_unit in input_units))
+    for matcher in matchers:
+        if not sources:
+            break
+        remaining = []
+        for source, fuzzycandidates in zip(
+            sources, matcher.matches_many(sources, workers=workers)
+        ):
+            if fuzzycandidates:
+                fuzzy_matches[source] = fuzzycandidates[0]
+            else:
+                remaining.append(source)
+        sources = remaining
+    return fuzzy_matches
+
+
+def match_template(input_unit, template_store, merge_on="id"):
+    """Returns a matching unit from a template, based on :param:`merge_on`."""
+    if template_store:
+        # :param:`merge_on` supports `location` and `id` for now
+        if merge_on == "location":
+            return match_template_location(input_unit, template_store)
+        return match_template_id(input_unit, template_store)
+
+
+def needs_fuzzy_match(input_unit, template_store, merge_on="id"):
+    """Returns whether :func:`pretranslate_unit` will need a fuzzy match for
+    input_unit.
+    """
+    matching_unit = match_template(input_unit, template_store, merge_on)
+    if matching_unit and matching_unit.gettargetlen() > 0:
+        return False
+    matching_unit = match_source(input_unit, template_store)
+    return not matching_unit or not matching_unit.gettargetlen()
+
+
 def pretranslate_unit(
-    input_unit, template_store, matchers=None, mark_reused=False, merge_on="id"
+    input_unit,
+    template_store,
+    matchers=None,
+    mark_reused=False,
+    merge_on="id",
+    fuzzy_matches=None,
 ):
     """Pretranslate a unit or return unchanged if no translation was found.
 
@@ -128,16 +218,11 @@ def pretranslate_unit(
         objects.
     :param mark_reused: Whether to mark old translations as reused or not.
     :param merge_on: Where will the merge matching happen on.
+    :param fuzzy_matches: Optional fuzzy matches computed beforehand by
+        :func:`match_fuzzy_many`, used instead of querying the matchers.
     """
-    matching_unit = None
-
     # Do template matching
-    if template_store:
-        # :param:`merge_on` supports `location` and `id` for now
-        if merge_on == "location":
-            matching_unit = match_template_location(input_unit, template_store)
-        else:
-            matching_unit = match_template_id(input_unit, template_store)
+    matching_unit = match_template(input_unit, template_store, merge_on)
 
     if matching_unit and matching_unit.gettargetlen() > 0:
         input_unit.merge(matching_unit, authoritative=True)
@@ -147,7 +232,10 @@ def pretranslate_unit(
 
         if not matching_unit or not matching_unit.gettargetlen():
             # do fuzzy matching
-            matching_unit = match_fuzzy(input_unit, matchers)
+            if fuzzy_matches is not None:
+                matching_unit = fuzzy_matches.get(input_unit.source)
+            else:
+                matching_unit = match_fuzzy(input_unit, matchers)
 
         if matching_unit and matching_unit.gettargetlen() > 0:
             # FIXME: should we dispatch here instead of this crude attr check
@@ -170,7 +258,13 @@ def pretranslate_unit(
 
 
 def pretranslate_store(
-    input_store, template_store, tm=None, min_similarity=75, fuzzymatching=True
+    input_store,
+    template_store,
+    tm=None,
+    min_similarity=75,
+    fuzzymatching=True,
+    fuzzyworkers=1,
+    tmcachedir=None,
 ):
     """Do the actual pretranslation of a whole store."""
     # preperation
@@ -192,6 +286,7 @@ def pretranslate_store(
                 min_similarity=min_similarity,
                 max_length=3000,
                 usefuzzy=True,
+                use_ngram_index=True,
             )
             matcher.addpercentage = False
             matchers.append(matcher)
@@ -201,16 +296,40 @@ def pretranslate_store(
     if tm and fuzzymatching:
         # FIXME: max_length hardcoded
         matcher = memory(
-            tm, max_candidates=1, min_similarity=min_similarity, max_length=1000
+            tm,
+            max_candidates=1,
+            min_similarity=min_similarity,
+            max_length=1000,
+            tmcachedir=tmcachedir,
         )
         matcher.addpercentage = False
         matchers.append(matcher)
 
+    # Do the fuzzy matching of all units at once if we can spread it
+    fuzzy_matches = None
+    if matchers and fuzzyworkers > 1:
+        fuzzy_matches = match_fuzzy_many(
+            (
+                input_unit
+                for input_unit in input_store.units
+                if input_unit.istranslatable()
+                and needs_fuzzy_match(
+                    input_unit, template_store, merge_on=input_store.merge_on
+                )
+            ),
+            matchers,
+            workers=fuzzyworkers,
+        )
+
     # Main loop
     for input_unit in input_store.units:
         if input_unit.istranslatable():
             input_unit = pretranslate_unit(
-                input_unit, template_store, matchers, merge_on=input_store.merge_on
+                input_unit,
+                template_store,
+                matchers,
+                merge_on=input_store.merge_on,
+                fuzzy_matches=fuzzy_matches,
             )
 
     return input_store
@@ -240,6 +359,17 @@ def main(argv=None):
         help="The file to use as translation memory when fuzzy matching",
     )
     parser.passthrough.append("tm")
+    parser.passthroughfiles.append("tm")
+    parser.add_option(
+        "",
+        "--tmcache",
+        dest="tmcachedir",
+        default=None,
+        metavar="DIR",
+        help="Keep compiled translation memory files in DIR, to avoid parsing "
+        "unchanged TM files again",
+    )
+    parser.passthrough.append("tmcachedir")
     defaultsimilarity = 75
     parser.add_option(
         "-s",
@@ -258,7 +388,21 @@ def main(argv=None):
         help="Disable fuzzy matching",
     )
     parser.passthrough.append("fuzzymatching")
-    parser.run(argv)
+    parser.add_option(
+        "--fuzzyworkers",
+        dest="fuzzyworkers",
+        default=1,
+        type="int",
+        metavar="N",
+        help="Use N processes for fuzzy matching (default: 1)",
+    )
+    parser.passthrough.append("fuzzyworkers")
+    # most units are written back unchanged, so keep their parsed text
+    try:
+        with pypo.keep_raw_units():
+            parser.run(argv)
+    finally:
+        closememory()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+from translate.storage import tmdb
+from translate.tools import build_tmdb
+
+
+class TestBuildTMDB:
+    def write_files(self, tmp_path):
+        (tmp_path / "po").mkdir()
+        (tmp_path / "po" / "one.po").write_text(
+            'msgid "Open file"\nmsgstr "Maak lêer oop"\n\n'
+            'msgid "Untranslated"\nmsgstr ""\n',
+            encoding="utf-8",
+        )
+        (tmp_path / "po" / "two.po").write_text(
+            'msgid "Open file"\nmsgstr "Maak lêer oop"\n\n'
+            'msgctxt "menu"\nmsgid "Save"\nmsgstr "Stoor"\n',
+            encoding="utf-8",
+        )
+        (tmp_path / "po" / "broken.po").write_text('msgid "Open', encoding="utf-8")
+
+    def test_build(self, tmp_path):
+        self.write_files(tmp_path)
+        for jobs in (1, 2):
+            tmdbfile = str(tmp_path / ("tm%d.db" % jobs))
+            build_tmdb.Builder(
+                tmdbfile,
+                "en",
+                "af",
+                [str(tmp_path / "po"), str(tmp_path / "missing.po")],
+                jobs,
+            )
+            database = tmdb.TMDB(tmdbfile)
+            database.cursor.execute(
+                "SELECT s.text, s.context, t.text FROM sources s "
+                "JOIN targets t ON s.sid = t.sid ORDER BY s.text"
+            )
+            assert database.cursor.fetchall() == [
+                ("Open file", "", "Maak lêer oop"),
+                ("Save", "menu", "Stoor"),
+            ]
+            assert database.translate_unit("Open files", "en", "af")
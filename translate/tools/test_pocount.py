@@ -6,6 +6,48 @@ from translate.storage import po
 from translate.tools import pocount
 
 
+# Word counts given by pocount for a range of markup, punctuation and scripts,
+# which any optimisation of the word counter has to keep.
+GOLDEN_WORDCOUNTS = [
+    ("", 0),
+    (" ", 0),
+    ("One", 1),
+    ("One two", 2),
+    ("One. Two", 2),
+    ("One.Two", 2),
+    ("1.5 litres", 2),
+    ("version 2.0.1", 2),
+    ("e.g. this", 1),
+    ("A word<br>Another word", 4),
+    ("A word<br />Another<BR/>word", 3),
+    ("<p>A word</p>\n<p>Another word</p>", 4),
+    ("<no label>", 2),
+    ('<a href="http://example.com/">Click here</a> to continue.', 4),
+    ("<a title='x <br> y'>link</a>", 3),
+    ('<ph id="1"/>Open <g id="2">file</g>', 2),
+    ("Don't send e-mail!", 3),
+    ("Don’t send e-mail!", 3),
+    ("Multiple   spaces\tand\ttabs\nand newlines", 6),
+    ("%s of %d files", 4),
+    ("%(count)s items in {folder}", 4),
+    ("&Open... &File", 2),
+    ("¿Qué tal? ¡Bien!", 3),
+    ("— – - ...", 2),
+    ("«Bonjour» dit-il", 2),
+    ("これは日本語のテキストです。", 1),
+    ("中文 文本，测试。", 2),
+    ("Привет, мир!", 2),
+    ("مرحبا بالعالم؟", 2),
+    ("नमस्ते दुनिया।", 2),
+    ("a\xa0b c", 3),
+    ("3 < 4 > 2", 3),
+    ("x.y.z a.b", 1),
+    ("Price: £5.00 or €6,50", 4),
+    ("${var} and $HOME", 3),
+    ("[link](http://a.b/c) **bold**", 3),
+]
+
+
 class TestCount:
     def count(self, source, expectedsource, target=None, expectedtarget=None):
         """simple helper to check the respective word counts"""
@@ -25,6 +67,16 @@ class TestCount:
             )
             assert wordstarget == expectedtarget
 
+    @mark.parametrize("string, expected", GOLDEN_WORDCOUNTS)
+    def test_golden(self, string, expected):
+        assert pocount.wordcount(string) == expected
+
+    def test_wordcounts(self):
+        strings = [string for string, expected in GOLDEN_WORDCOUNTS]
+        expected = [expected for string, expected in GOLDEN_WORDCOUNTS]
+        assert pocount.wordcounts(strings) == expected
+        assert pocount.wordcounts(strings + strings) == expected + expected
+
     def test_simple_count_zero(self):
         """no content"""
         self.count("", 0)
@@ -161,3 +213,80 @@ msgstr ""
         pofile = BytesIO(self.inputdata)
         stats = pocount.calcstats(pofile)
         assert stats["totalsourcewords"] == 6
+
+    def test_cache(self, tmpdir, monkeypatch):
+        pofile = tmpdir.join("test.po")
+        pofile.write_binary(self.inputdata)
+        cache = pocount.StatsCache(str(tmpdir.join("cache.db")))
+        stats = cache.calcstats(str(pofile))
+        assert stats == pocount.calcstats(str(pofile))
+        # Unchanged and touched files are answered from the cache
+        monkeypatch.setattr(pocount, "calcstats", None)
+        assert cache.calcstats(str(pofile)) == stats
+        pofile.setmtime(pofile.mtime() + 10)
+        assert cache.calcstats(str(pofile)) == stats
+        cache.close()
+        cache = pocount.StatsCache(str(tmpdir.join("cache.db")))
+        assert cache.calcstats(str(pofile)) == stats
+        # Changed files are counted again
+        monkeypatch.undo()
+        pofile.write_binary(self.inputdata.replace(b'msgstr ""', b'msgstr "x"', 1))
+        stats = cache.calcstats(str(pofile))
+        assert stats["translated"] == 2
+        assert stats["untranslated"] == 0
+        cache.close()
+
+    def test_cache_shared(self, tmpdir):
+        """Tests that two caches can write to the same database"""
+        pofile = tmpdir.join("test.po")
+        pofile.write_binary(self.inputdata)
+        first = pocount.StatsCache(str(tmpdir.join("cache.db")), timeout=0)
+        second = pocount.StatsCache(str(tmpdir.join("cache.db")), timeout=0)
+        first.batchsize = second.batchsize = 1
+        stats = first.calcstats(str(pofile))
+        assert second.calcstats(str(pofile)) == stats
+        pofile.write_binary(self.inputdata.replace(b'msgstr ""', b'msgstr "x"', 1))
+        assert second.calcstats(str(pofile))["translated"] == 2
+        first.close()
+        second.close()
+
+    def test_cache_error(self, tmpdir, capsys):
+        """Tests that files are counted without a cache that fails"""
+        pofile = tmpdir.join("test.po")
+        pofile.write_binary(self.inputdata)
+        cache = pocount.StatsCache(str(tmpdir.join("cache.db")))
+        cache.connection.close()
+        counted = pocount.summarizer([str(pofile)], pocount.style_csv, cache=cache)
+        assert counted.cache is None
+        assert counted.filecount == 1
+        assert counted.totals["translated"] == 1
+
+    def test_cache_summarizer(self, tmpdir, capsys, monkeypatch):
+        """Tests that touched files are hashed and taken from the cache"""
+        podir = tmpdir.join("po")
+        for name in ("a.po", "b.po"):
+            podir.join(name).write_binary(self.inputdata, ensure=True)
+        cache = pocount.StatsCache(str(tmpdir.join("cache.db")))
+        counted = pocount.summarizer([str(podir)], pocount.style_csv, cache=cache)
+        output = capsys.readouterr().out
+        podir.join("a.po").setmtime(podir.join("a.po").mtime() + 10)
+        monkeypatch.setattr(pocount, "calcstats", None)
+        for jobs in (1, 2):
+            recounted = pocount.summarizer(
+                [str(podir)], pocount.style_csv, cache=cache, jobs=jobs
+            )
+            assert capsys.readouterr().out == output
+            assert recounted.totals == counted.totals
+        cache.close()
+
+    def test_jobs(self, tmpdir, capsys):
+        for name in ("a.po", "b.po", "sub/c.po"):
+            tmpdir.join(name).write_binary(self.inputdata, ensure=True)
+        serial = pocount.summarizer([str(tmpdir)], pocount.style_csv)
+        serialout = capsys.readouterr().out
+        parallel = pocount.summarizer([str(tmpdir)], pocount.style_csv, jobs=2)
+        assert capsys.readouterr().out == serialout
+        assert parallel.filecount == serial.filecount == 3
+        assert parallel.totals == serial.totals
+        assert parallel.totals["translated"] == 3
+        assert parallel.totals["extended"]["empty"]["units"] == 3
@@ -1,3 +1,4 @@
+import os
 from io import BytesIO
 
 from translate.storage import po, xliff
@@ -141,6 +142,65 @@ class TestPOGrep:
                     poresult = self.pogrep(source, search_letter)
                     assert poresult.index(source.encode("utf-8")) >= 0
 
+    def test_requiredliteral(self):
+        """check the text that regular expression matches must contain"""
+        assert pogrep.requiredliteral("software") == "software"
+        assert pogrep.requiredliteral(r"soft\w+ware") == "soft"
+        assert pogrep.requiredliteral("hard(ware)?") == "hard"
+        assert pogrep.requiredliteral("software|hardware") == ""
+        assert pogrep.requiredliteral("(?i)software") == ""
+        assert pogrep.requiredliteral("(?x)soft ware") == ""
+        assert pogrep.requiredliteral("(soft|hard)wares") == "wares"
+        assert pogrep.requiredliteral("soft(ware|ness)") == "soft"
+        assert pogrep.requiredliteral("colou?rs") == "colo"
+        assert pogrep.requiredliteral("so+ftware") == "ftware"
+        assert pogrep.requiredliteral("sof*tware") == "tware"
+        assert pogrep.requiredliteral("sof{1,2}tware") == "tware"
+        assert pogrep.requiredliteral(r"file\.txt") == "file.txt"
+        assert pogrep.requiredliteral(r"[]x]file\x41ab") == "file"
+        assert pogrep.requiredliteral("^soft.ware$") == "soft"
+        assert pogrep.requiredliteral("(") == ""
+
+    def test_getmatches(self):
+        """check the positions of the matches in units"""
+        pofile = self.poparse('msgid "Open file"\nmsgstr "Open the File"\n')
+        grepfilter = pogrep.GrepFilter("file", None, ignorecase=True)
+        matches, indexes = grepfilter.getmatches(pofile.units)
+        assert indexes == [0]
+        assert [(m.part, m.start, m.end) for m in matches] == [
+            ("target", 9, 13),
+            ("source", 5, 9),
+        ]
+
+    def test_index(self, tmpdir):
+        """check that the index finds the files where a search could match"""
+        tmpdir.join("a.po").write('#: a.c\nmsgid "&Open file"\nmsgstr "Öffnen"\n')
+        tmpdir.join("b.po").write('#: b.c\nmsgid "Save"\nmsgstr "_Speichern"\n')
+        options, args = pogrep.cmdlineparser().parse_args(["xxx.po"])
+        index = pogrep.GrepIndex(str(tmpdir.join("index")))
+        for name in ("a.po", "b.po"):
+            index.update(str(tmpdir.join(name)))
+
+        def candidates(searchstring, *args):
+            grepfilter = pogrep.GrepFilter(searchstring, *args)
+            paths = index.getcandidates(grepfilter)
+            return paths if paths is None else {os.path.basename(p) for p in paths}
+
+        assert candidates("Open", None) == {"a.po"}
+        assert candidates("öffnen", None) == {"a.po"}
+        assert candidates("Speichern", None, False, False, False, False, "_") == {
+            "b.po"
+        }
+        assert candidates("Speichern", ["source"]) == set()
+        assert candidates("b.c", ["locations"]) == {"b.po"}
+        assert candidates("Open", None, False, True) is None
+        assert candidates("Open", None, False, False, True) is None
+        tmpdir.join("b.po").write('#: b.c\nmsgid "Open"\nmsgstr ""\n')
+        index.update(str(tmpdir.join("b.po")))
+        assert candidates("Open", None) == {"a.po", "b.po"}
+        assert candidates("Speichern", None) == set()
+        index.close()
+
 
 class TestXLiffGrep:
     xliff_skeleton = """<?xml version="1.0" ?>
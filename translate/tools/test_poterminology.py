@@ -24,3 +24,8 @@ class TestPOTerminology:
 
         filtered_terms = extractor.filter_terms(terms)
         assert filtered_terms[0][0] > filtered_terms[-1][0]
+
+    def test_no_jobs(self):
+        """Test that the files aren't offered to be processed in parallel."""
+        parser = poterminology.TerminologyOptionParser({"po": ("po", None)})
+        assert not parser.has_option("--jobs")
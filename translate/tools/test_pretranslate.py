@@ -361,6 +361,27 @@ msgstr "36em"
         # Layout might have changed, so we won't compare the serialised
         # versions
 
+    def test_memory_tmcache(self, tmp_path, monkeypatch):
+        """Test that the TM is compiled once and then loaded from the cache"""
+        tmfile = tmp_path / "tm.po"
+        tmfile.write_bytes(b'msgid "Open the file"\nmsgstr "Maak die leer oop"\n')
+        cachedir = str(tmp_path / "cache")
+        monkeypatch.setattr(pretranslate, "tmmatcher", None)
+        matcher = pretranslate.memory(str(tmfile), tmcachedir=cachedir)
+        assert matcher.matches("Open a file")[0].target == "Maak die leer oop"
+
+        def getobject(*args, **kwargs):
+            raise AssertionError("TM parsed again")
+
+        monkeypatch.setattr(pretranslate, "tmmatcher", None)
+        monkeypatch.setattr(pretranslate.factory, "getobject", getobject)
+        matcher = pretranslate.memory(str(tmfile), tmcachedir=cachedir)
+        assert matcher.matches("Open a file")[0].target == "Maak die leer oop"
+        assert matcher.compiled is not None
+        pretranslate.closememory()
+        assert matcher.compiled is None
+        assert pretranslate.tmmatcher is None
+
 
 class TestPretranslateCommand(test_convert.TestConvertCommand, TestPretranslate):
     """Tests running actual pretranslate commands on files"""
@@ -371,8 +392,21 @@ class TestPretranslateCommand(test_convert.TestConvertCommand, TestPretranslate)
         """tests getting help"""
         options = test_convert.TestConvertCommand.test_help(self, capsys)
         options = self.help_check(options, "-t TEMPLATE, --template=TEMPLATE")
+        options = self.help_check(options, "--tmcache=DIR")
         options = self.help_check(options, "--tm")
         options = self.help_check(
             options, "-s MIN_SIMILARITY, --similarity=MIN_SIMILARITY"
         )
-        options = self.help_check(options, "--nofuzzymatching", last=True)
+        options = self.help_check(options, "--nofuzzymatching")
+        options = self.help_check(options, "--fuzzyworkers=N", last=True)
+
+    def test_skip_unchanged_tm(self):
+        """tests that files are converted again when the TM changes"""
+        self.create_testfile("pin/a.po", 'msgid "Hello one"\nmsgstr ""\n')
+        self.create_testfile("tm.po", 'msgid "Hello one"\nmsgstr "Hallo een"\n')
+        options = {"skip-unchanged": True, "tm": "tm.po", "template": "pin"}
+        self.run_command("pin", "pout", **options)
+        assert b'msgstr "Hallo een"' in self.read_testfile("pout/a.po")
+        self.create_testfile("tm.po", 'msgid "Hello one"\nmsgstr "Hallo 1"\n')
+        self.run_command("pin", "pout", **options)
+        assert b'msgstr "Hallo 1"' in self.read_testfile("pout/a.po")